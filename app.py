@@ -1,39 +1,196 @@
-from flask import Flask, render_template, request
-from scraper_all import scrape_dan_klasifikasi
+import threading
+
+from flask import Flask, Response, jsonify, redirect, render_template, request, url_for
+from article_store import ArticleStore
+from jobs import JobQueue, QueueFull, sse_stream
+from metrics import configure_logging, log_event, render_prometheus, timed
+from model_registry import warm_up_async
+from portals import PORTALS
 import pandas as pd
 
 app = Flask(__name__)
+SEARCH_PAGE_SIZE = 20
+# jumlah artikel per tabel di halaman utama (dibaca dari arsip yang diisi scheduler.py)
+INDEX_PAGE_SIZE = 100
+# batas parameter angka dari request (nilai di luar batas dijepit, bukan error)
+MAX_SEARCH_PAGE = 500
+MAX_ARTICLES_LIMIT = 200
+
+# Worker thread, koneksi arsip dan warm-up model dibuat saat pertama dibutuhkan, bukan saat
+# import: mengimpor app.py (test, tool, worker WSGI sebelum fork) tidak menyalakan apa pun
+_services = {}
+_services_lock = threading.Lock()
+
+
+def _service(name, factory):
+    """Objek bersama per proses, dibuat sekali oleh `factory` saat pertama diminta."""
+    service = _services.get(name)
+    if service is None:
+        with _services_lock:
+            service = _services.get(name)
+            if service is None:
+                service = _services[name] = factory()
+    return service
+
+
+def job_queue():
+    # Scraping berjalan di worker background (lihat jobs.py); request web langsung kembali
+    return _service("job_queue", JobQueue)
+
+
+def store():
+    # Arsip artikel + indeks full-text untuk /search (lihat article_store.py, search_index.py)
+    return _service("store", ArticleStore)
+
+
+def _start():
+    # event terstruktur (fetch, stage, job, ...) sebagai JSON per baris di stderr
+    configure_logging()
+    # Model klasifikasi di-load + warm-up di background, tidak menunggu job pertama
+    warm_up_async()
+    return True
+
+
+@app.before_request
+def _start_once():
+    _service("started", _start)
+
+
+def _clamp(value, low, high=None):
+    value = max(value, low)
+    return value if high is None else min(value, high)
+
+
+def _to_int(value, default):
+    # untuk body JSON/form yang bukan MultiDict.get(type=int); nilai tidak valid -> default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _stored(start_date, end_date):
+    """Artikel yang sudah diklasifikasi di arsip untuk rentang tanggal ini (tanpa scraping)."""
+    with timed("store_query") as timer:
+        result = {
+            "start_date": start_date, "end_date": end_date,
+            "all": list(store().query(start_date, end_date, limit=INDEX_PAGE_SIZE)),
+            "ekonomi": list(store().query(start_date, end_date, label=1, limit=INDEX_PAGE_SIZE)),
+            "total": store().count(start_date, end_date),
+            "total_ekonomi": store().count(start_date, end_date, label=1),
+        }
+    result["took_ms"] = timer.seconds * 1000
+    return result
+
+
+def _form_params():
+    return {
+        "start_date": request.form.get("start_date"),
+        "end_date": request.form.get("end_date"),
+        "max_articles": _clamp(request.form.get("max_articles", default=5, type=int), 1, MAX_ARTICLES_LIMIT),
+        "profile": bool(request.form.get("profile")),
+    }
+
 
 @app.route("/", methods=["GET", "POST"])
 def index():
-    hasil_all = None
-    hasil_ekonomi = None
-
     if request.method == "POST":
-        start_date = request.form.get("start_date")
-        end_date = request.form.get("end_date")
-        max_articles = int(request.form.get("max_articles") or 5)
+        params = _form_params()
+        log_event("request", route="index", **params)
+        try:
+            job = job_queue().submit(**params)
+        except QueueFull as e:
+            return render_template("index.html", job=None, error=str(e)), 503
+        log_event("job_submitted", id=job.id, status=job.status, requesters=job.requesters)
+        return redirect(url_for("index", job=job.id))
+
+    job = None
+    job_id = request.args.get("job")
+    if job_id:
+        job = job_queue().get(job_id)
+        if job is None:
+            return render_template("index.html", job=None, error="Job tidak ditemukan (mungkin sudah kedaluwarsa)."), 404
+    # tanpa job: tampilkan langsung hasil yang sudah tersimpan; scraping hanya lewat "Scrape sekarang"
+    stored = None if job else _stored(request.args.get("start_date") or None, request.args.get("end_date") or None)
+    with timed("render"):
+        return render_template("index.html", job=job, error=None, stored=stored,
+                               hasil_all=job.hasil_all if job else None,
+                               hasil_ekonomi=job.hasil_ekonomi if job else None)
+
+
+@app.route("/jobs", methods=["POST"])
+def submit_job():
+    """Submit job scraping; mengembalikan id job tanpa menunggu hasil."""
+    data = request.get_json(silent=True) or request.form
+    try:
+        max_articles = _clamp(_to_int(data.get("max_articles") or 5, 5), 1, MAX_ARTICLES_LIMIT)
+        job = job_queue().submit(data.get("start_date"), data.get("end_date"), max_articles,
+                               profile=str(data.get("profile") or "").lower() in ("1", "true", "on"))
+    except QueueFull as e:
+        return jsonify({"error": str(e)}), 503
+    return jsonify({"job_id": job.id, "status": job.status,
+                    "events": url_for("job_events", job_id=job.id),
+                    "poll": url_for("job_status", job_id=job.id)}), 202
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    """Polling: status, progress per portal dan (kalau selesai) hasilnya."""
+    job = job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "job tidak ditemukan"}), 404
+    data = job.snapshot(include_results=job.status == "done")
+    data["partial"] = job.partial[_clamp(request.args.get("since", default=0, type=int), 0):]
+    return jsonify(data)
+
+
+@app.route("/jobs/<job_id>/events")
+def job_events(job_id):
+    """Server-Sent Events: artikel per portal, tahap proses dan status akhir job."""
+    job = job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "job tidak ditemukan"}), 404
+    # Last-Event-ID (reconnect otomatis) atau ?since= (halaman yang sudah menampilkan sebagian event)
+    last_id = request.headers.get("Last-Event-ID", default=None, type=int)
+    if last_id is not None and last_id >= 0:
+        since = last_id + 1
+    else:
+        since = _clamp(request.args.get("since", default=0, type=int), 0)
+    return Response(sse_stream(job, since), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
-        # Menampilkan pesan status di konsol
-        print(f"Menerima permintaan: start_date={start_date}, end_date={end_date}, max_articles={max_articles}")
-        print("Memulai proses scraping dan klasifikasi...")
 
-        df_all, df_ekonomi = scrape_dan_klasifikasi(start_date, end_date, max_articles)
+@app.route("/search")
+def search():
+    """Cari artikel di arsip (full-text, bm25) dengan filter portal, rentang tanggal dan label."""
+    q = (request.args.get("q") or "").strip()
+    label = request.args.get("label")
+    filters = {
+        "start_date": request.args.get("start_date") or None,
+        "end_date": request.args.get("end_date") or None,
+        "portal": request.args.get("portal") or None,
+        "label": int(label) if label in ("0", "1") else None,
+    }
+    page = _clamp(request.args.get("page", default=1, type=int), 1, MAX_SEARCH_PAGE)
+    with timed("search") as timer:
+        total, hasil = store().search(q, limit=SEARCH_PAGE_SIZE, offset=(page - 1) * SEARCH_PAGE_SIZE,
+                                      **filters) if q else (0, [])
+    took_ms = timer.seconds * 1000
+    if request.args.get("format") == "json":
+        return jsonify({"q": q, "total": total, "page": page, "took_ms": round(took_ms, 2),
+                        "results": [dict(r, tanggal=str(r["tanggal"] or "")) for r in hasil]})
+    with timed("render"):
+        return render_template("search.html", q=q, hasil=hasil, total=total, page=page, took_ms=took_ms,
+                               page_size=SEARCH_PAGE_SIZE, filters=filters,
+                               query_args={k: v for k, v in request.args.items() if k != "page"},
+                               portals=[p["name"] for p in PORTALS.values()])
 
-        if not df_all.empty:
-            hasil_all = df_all.to_dict(orient="records")
-            # Pastikan kolom 'isi' tidak terlalu panjang untuk ditampilkan
-            for item in hasil_all:
-                item['isi'] = (item['isi'][:200] + '...') if len(item['isi']) > 200 else item['isi']
 
-        if not df_ekonomi.empty:
-            hasil_ekonomi = df_ekonomi.to_dict(orient="records")
-            for item in hasil_ekonomi:
-                item['isi'] = (item['isi'][:200] + '...') if len(item['isi']) > 200 else item['isi']
-        
-        print("Proses selesai. Mengirim hasil ke template.")
+@app.route("/metrics")
+def metrics():
+    """Metrik dalam format teks Prometheus (latensi per portal/tahap, byte, retry, cache)."""
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
 
-    return render_template("index.html", hasil_all=hasil_all, hasil_ekonomi=hasil_ekonomi)
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True, threaded=True)
@@ -0,0 +1,176 @@
+# article_cache.py
+# Cache artikel di disk (SQLite) dengan kunci url_canon.page_key (URL kanonik yang tetap
+# membedakan ?page=N, jadi halaman listing tidak saling menimpa): HTML mentah,
+# record hasil ekstraksi (judul/tanggal/isi) dan validator ETag/Last-Modified.
+# Entri lama dibuang berdasarkan umur (TTL) dan total ukuran.
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date
+
+from url_canon import page_key
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "article_cache.sqlite")
+# record yang lebih muda dari ini dipakai langsung tanpa request sama sekali
+CACHE_FRESH_SECONDS = 24 * 3600
+# entri yang tidak diperbarui selama ini dihapus saat evict()
+CACHE_MAX_AGE_SECONDS = 30 * 24 * 3600
+CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    html BLOB,
+    html_hash TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    record TEXT,
+    record_hash TEXT,
+    record_at REAL,
+    fetched_at REAL NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_pages_fetched_at ON pages(fetched_at);
+"""
+# versi 2: kunci page_key (sebelumnya canonical_url, yang menggabungkan ?page=N)
+_SCHEMA_VERSION = 2
+
+
+def html_hash(html):
+    return hashlib.sha1(html.encode("utf-8", "replace")).hexdigest()
+
+
+def _encode_record(record):
+    return json.dumps(record, default=lambda v: v.isoformat() if isinstance(v, date) else str(v))
+
+
+def _decode_record(raw):
+    record = json.loads(raw)
+    if record.get("tanggal"):
+        record["tanggal"] = date.fromisoformat(record["tanggal"][:10])
+    return record
+
+
+class ArticleCache:
+    """Cache SQLite yang aman dipakai dari banyak thread (satu koneksi per thread)."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, fresh_seconds=CACHE_FRESH_SECONDS,
+                 max_age_seconds=CACHE_MAX_AGE_SECONDS, max_bytes=CACHE_MAX_BYTES):
+        self.path = path
+        self.fresh_seconds = fresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+            # baris lama bisa berisi HTML halaman listing lain; validator-nya jangan dipakai
+            conn.execute("UPDATE pages SET etag = NULL, last_modified = NULL")
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _row(self, url):
+        return self._conn().execute("SELECT * FROM pages WHERE url = ?", (page_key(url),)).fetchone()
+
+    # --- level HTTP ---
+    def validators(self, url):
+        """(html, etag, last_modified) untuk conditional request, atau None."""
+        row = self._row(url)
+        if row is None or row["html"] is None or not (row["etag"] or row["last_modified"]):
+            return None
+        return zlib.decompress(row["html"]).decode("utf-8"), row["etag"], row["last_modified"]
+
+    def put_page(self, url, html, etag=None, last_modified=None):
+        blob = zlib.compress(html.encode("utf-8", "replace"))
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO pages (url, html, html_hash, etag, last_modified, fetched_at, size) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET html=excluded.html, html_hash=excluded.html_hash, "
+            "etag=excluded.etag, last_modified=excluded.last_modified, "
+            "fetched_at=excluded.fetched_at, size=excluded.size + COALESCE(LENGTH(pages.record), 0)",
+            (page_key(url), blob, html_hash(html), etag, last_modified, time.time(), len(blob)))
+        conn.commit()
+
+    def touch(self, url):
+        """Tandai entri masih valid (misal setelah 304 Not Modified)."""
+        conn = self._conn()
+        now = time.time()
+        conn.execute("UPDATE pages SET fetched_at = ?, record_at = CASE WHEN record IS NULL THEN NULL ELSE ? END "
+                     "WHERE url = ?", (now, now, page_key(url)))
+        conn.commit()
+
+    # --- level artikel ---
+    def fresh_record(self, url):
+        """Record yang diekstrak kurang dari `fresh_seconds` lalu, atau None."""
+        row = self._row(url)
+        if row is not None and row["record"] and time.time() - (row["record_at"] or 0) < self.fresh_seconds:
+            self.hits += 1
+            return _decode_record(row["record"])
+        return None
+
+    def record_for_html(self, url, html):
+        """Record lama kalau HTML-nya sama persis dengan yang pernah diekstrak."""
+        row = self._row(url)
+        if row is not None and row["record"] and row["record_hash"] == html_hash(html):
+            self.hits += 1
+            return _decode_record(row["record"])
+        self.misses += 1
+        return None
+
+    def put_record(self, url, record, html):
+        raw = _encode_record(record)
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO pages (url, record, record_hash, record_at, fetched_at, size) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET record=excluded.record, record_hash=excluded.record_hash, "
+            "record_at=excluded.record_at, fetched_at=excluded.fetched_at, "
+            "size=COALESCE(LENGTH(pages.html), 0) + LENGTH(excluded.record)",
+            (page_key(url), raw, html_hash(html), time.time(), time.time(), len(raw)))
+        conn.commit()
+
+    # --- pemeliharaan ---
+    def evict(self):
+        """Hapus entri kedaluwarsa, lalu yang paling lama sampai total ukuran <= max_bytes."""
+        conn = self._conn()
+        removed = conn.execute("DELETE FROM pages WHERE fetched_at < ?",
+                               (time.time() - self.max_age_seconds,)).rowcount
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            for row in conn.execute("SELECT url, size FROM pages ORDER BY fetched_at").fetchall():
+                if excess <= 0:
+                    break
+                conn.execute("DELETE FROM pages WHERE url = ?", (row["url"],))
+                excess -= row["size"]
+                removed += 1
+        conn.commit()
+        return removed
+
+    def stats(self):
+        count, size = self._conn().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        total = self.hits + self.misses
+        return {"entries": count, "bytes": size, "hits": self.hits, "misses": self.misses,
+                "hit_ratio": (self.hits / total) if total else 0.0}
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,225 @@
+# article_store.py
+# Penyimpanan artikel permanen (SQLite, mode WAL) menggantikan dump Excel per
+# run: skema tetap, upsert berdasarkan link kanonik (run berikutnya menambah,
+# bukan menimpa), dan query dengan filter tanggal/label/portal yang memakai
+# index. Excel hanya dibuat sesuai permintaan lewat export_excel(). Judul/isi
+# juga diindeks full-text (search_index.py) di transaksi yang sama dengan upsert.
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+
+import search_index
+from url_canon import canonical_url
+
+DEFAULT_STORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "articles.sqlite")
+# jumlah parameter per statement SQL (batas variabel SQLite lama 999)
+_SQL_BATCH = 500
+COLUMNS = ("portal", "link", "judul", "tanggal", "isi", "label", "score", "fetched_at", "cluster", "duplicate_of")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    link_key TEXT NOT NULL UNIQUE,
+    portal TEXT,
+    link TEXT NOT NULL,
+    judul TEXT,
+    tanggal TEXT,
+    isi TEXT,
+    label INTEGER,
+    score REAL,
+    fetched_at REAL NOT NULL,
+    cluster INTEGER,
+    duplicate_of TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_articles_tanggal ON articles(tanggal);
+CREATE INDEX IF NOT EXISTS idx_articles_label_tanggal ON articles(label, tanggal);
+CREATE INDEX IF NOT EXISTS idx_articles_portal_tanggal ON articles(portal, tanggal);
+"""
+
+_UPSERT = (
+    "INSERT INTO articles (link_key, portal, link, judul, tanggal, isi, label, score, fetched_at, cluster, duplicate_of) "
+    "VALUES (:link_key, :portal, :link, :judul, :tanggal, :isi, :label, :score, :fetched_at, :cluster, :duplicate_of) "
+    "ON CONFLICT(link_key) DO UPDATE SET portal=excluded.portal, link=excluded.link, judul=excluded.judul, "
+    "tanggal=excluded.tanggal, isi=excluded.isi, label=excluded.label, score=excluded.score, "
+    "fetched_at=excluded.fetched_at, cluster=COALESCE(excluded.cluster, articles.cluster), "
+    "duplicate_of=excluded.duplicate_of"
+)
+
+
+def _iso(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+def _row(record, now):
+    label = record.get("label")
+    score = record.get("score")
+    return {
+        "link_key": canonical_url(record["link"]),
+        "portal": record.get("portal"),
+        "link": record["link"],
+        "judul": record.get("judul"),
+        "tanggal": _iso(record.get("tanggal")),
+        "isi": record.get("isi"),
+        "label": None if label is None else int(label),
+        "score": None if score is None else float(score),
+        "fetched_at": record.get("fetched_at") or now,
+        "cluster": record.get("cluster"),
+        "duplicate_of": record.get("duplicate_of"),
+    }
+
+
+def _record(row):
+    record = {c: row[c] for c in COLUMNS}
+    if record["tanggal"]:
+        record["tanggal"] = date.fromisoformat(record["tanggal"])
+    return record
+
+
+class ArticleStore:
+    """Store SQLite yang aman dipakai dari banyak thread (satu koneksi per thread)."""
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(_SCHEMA)
+        if search_index.create(conn):
+            self._reindex(conn, conn.execute("SELECT id, judul, isi FROM articles"))
+        conn.commit()
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def upsert_many(self, records):
+        """Tambah/perbarui record (kunci: link kanonik). Mengembalikan jumlah baris."""
+        now = time.time()
+        rows = [_row(r, now) for r in records if r.get("link")]
+        if rows:
+            conn = self._conn()
+            conn.executemany(_UPSERT, rows)
+            keys = [r["link_key"] for r in rows]
+            for i in range(0, len(keys), _SQL_BATCH):
+                chunk = keys[i:i + _SQL_BATCH]
+                self._reindex(conn, conn.execute(
+                    f"SELECT id, judul, isi FROM articles WHERE link_key IN ({','.join('?' * len(chunk))})", chunk))
+            conn.commit()
+        return len(rows)
+
+    @staticmethod
+    def _reindex(conn, cursor):
+        while True:
+            rows = cursor.fetchmany(_SQL_BATCH)
+            if not rows:
+                break
+            search_index.index_rows(conn, rows)
+
+    def upsert(self, record):
+        return self.upsert_many([record])
+
+    @staticmethod
+    def _filters(start_date=None, end_date=None, label=None, portal=None, table="", duplicates=False):
+        # salinan sindikasi (near_dup.py: duplicate_of terisi) disembunyikan kecuali diminta
+        clauses, params = ([] if duplicates else [f"{table}duplicate_of IS NULL"]), []
+        if start_date:
+            clauses.append(f"{table}tanggal >= ?")
+            params.append(_iso(start_date))
+        if end_date:
+            clauses.append(f"{table}tanggal <= ?")
+            params.append(_iso(end_date))
+        if label is not None:
+            clauses.append(f"{table}label = ?")
+            params.append(int(label))
+        if portal:
+            clauses.append(f"{table}portal = ?")
+            params.append(portal)
+        return " AND ".join(clauses), params
+
+    @classmethod
+    def _where(cls, start_date=None, end_date=None, label=None, portal=None, duplicates=False):
+        clauses, params = cls._filters(start_date, end_date, label, portal, duplicates=duplicates)
+        return (" WHERE " + clauses) if clauses else "", params
+
+    def query(self, start_date=None, end_date=None, label=None, portal=None, limit=None, offset=0,
+              duplicates=False):
+        """
+        Generator record (terbaru dulu); filter diterjemahkan ke WHERE yang memakai
+        index. duplicates=True ikut mengembalikan salinan near-duplicate.
+        """
+        where, params = self._where(start_date, end_date, label, portal, duplicates)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM articles{where} ORDER BY tanggal DESC, fetched_at DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [int(limit), int(offset)]
+        for row in self._conn().execute(sql, params):
+            yield _record(row)
+
+    def count(self, start_date=None, end_date=None, label=None, portal=None, duplicates=False):
+        where, params = self._where(start_date, end_date, label, portal, duplicates)
+        return self._conn().execute(f"SELECT COUNT(*) FROM articles{where}", params).fetchone()[0]
+
+    def search(self, query, start_date=None, end_date=None, label=None, portal=None,
+               limit=search_index.SEARCH_LIMIT, offset=0):
+        """
+        Cari full-text (bm25) dengan filter yang sama seperti query(); mengembalikan
+        (total, record) dengan tambahan "rank", "snippet" dan "judul_html" (HTML, kata cocok di-<mark>).
+        """
+        where, params = self._filters(start_date, end_date, label, portal, table="a.")
+        total, rows = search_index.search(self._conn(), query, where, params, limit, offset)
+        results = []
+        for row, snippet, judul_html in rows:
+            record = _record(row)
+            record.update(rank=row["rank"], snippet=snippet, judul_html=judul_html)
+            results.append(record)
+        return total, results
+
+    def export_excel(self, path, start_date=None, end_date=None, label=None, portal=None):
+        """Ekspor hasil query ke .xlsx (ditulis streaming); mengembalikan jumlah baris."""
+        from pipeline import ExcelSink
+
+        sink = ExcelSink(path, columns=COLUMNS[:7])
+        try:
+            for record in self.query(start_date, end_date, label, portal):
+                sink(record)
+        finally:
+            sink.close()
+        return sink.rows
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def save_records(records, portal_key, output_file=None, path=DEFAULT_STORE_PATH):
+    """
+    Dipakai parse_*(simpan=True): record portal `portal_key` di-upsert ke store,
+    lalu (kalau `output_file` diberikan) semua artikel portal itu diekspor ke Excel.
+    """
+    from portals import PORTALS
+
+    name = PORTALS[portal_key]["name"] if portal_key in PORTALS else portal_key
+    store = ArticleStore(path)
+    try:
+        n = store.upsert_many(dict(r, portal=name) for r in records)
+        print(f"{n} artikel {name} disimpan ke {path}")
+        if output_file:
+            store.export_excel(output_file, portal=name)
+    finally:
+        store.close()
+    return n
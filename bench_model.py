@@ -0,0 +1,81 @@
+# bench_model.py
+# Benchmark jalur inferensi: pipeline asli (TF-IDF + CalibratedClassifierCV)
+# vs fast model .npz (fast_model.py). Melaporkan kecocokan label, selisih
+# probabilitas, docs/detik keduanya, dan akurasi terhadap label CSV kalau ada.
+#
+#   python bench_model.py model_berita_svm2.pkl data.csv [kolom_teks] [kolom_label]
+import os
+import sys
+import tempfile
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from fast_model import MAX_PROBA_DIFF, MIN_AGREEMENT, FastLinearModel, distil, fast_model_path
+
+
+def _rate(fn, texts, repeat=3):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(texts)
+        best = min(best, time.perf_counter() - t0)
+    return len(texts) / best, out
+
+
+def run(pkl_path, csv_path, text_col="isi", label_col="label"):
+    df = pd.read_csv(csv_path)
+    # baris tanpa label juga dibuang supaya irisan label sejajar dengan teks yang dievaluasi
+    df = df.dropna(subset=[text_col, label_col] if label_col in df.columns else [text_col])
+    texts = df[text_col].astype(str).tolist()
+    pipeline = joblib.load(pkl_path)
+
+    fast_path = fast_model_path(pkl_path)
+    tmp_dir = None
+    if os.path.exists(fast_path):
+        fast = FastLinearModel.load(fast_path)
+        evaluated = texts
+        print(f"Fast model: {fast_path}")
+    else:
+        # dibuat di folder sementara, bukan di samping .pkl: ekspor yang dipakai produksi hanya
+        # lewat train_model.py / fast_model.py yang memeriksa MIN_AGREEMENT / MAX_PROBA_DIFF.
+        # Ambang disetel di separuh data, kecocokan diukur di separuh lainnya.
+        half = len(texts) // 2
+        tmp_dir = tempfile.mkdtemp(prefix="bench_model_")
+        fast_path = os.path.join(tmp_dir, os.path.basename(fast_path))
+        fast = distil(pipeline, fast_path, texts[:half])
+        evaluated = texts[half:]
+        print(f"Fast model sementara: {fast_path} (ambang disetel pada {half} dokumen, tidak disimpan)")
+    print(f"Ukuran: pkl {os.path.getsize(pkl_path) / 1024:.0f} KB, npz {os.path.getsize(fast_path) / 1024:.0f} KB")
+    if tmp_dir is not None:
+        os.remove(fast_path)
+        os.rmdir(tmp_dir)
+
+    rate_orig, labels_orig = _rate(pipeline.predict, evaluated)
+    rate_fast, labels_fast = _rate(fast.predict, evaluated)
+    agree = float(np.mean(np.asarray(labels_orig) == np.asarray(labels_fast)))
+    print(f"Dokumen dievaluasi : {len(evaluated)}")
+    print(f"Kecocokan label    : {agree * 100:.2f}% ({int(round((1 - agree) * len(evaluated)))} berbeda)")
+    if hasattr(pipeline, "predict_proba"):
+        diff = np.abs(pipeline.predict_proba(evaluated)[:, 1] - fast.predict_proba(evaluated)[:, 1])
+        print(f"Selisih P(ekonomi) : rata-rata {diff.mean():.4f}, maks {diff.max():.4f}")
+        lolos = agree >= MIN_AGREEMENT and diff.max() <= MAX_PROBA_DIFF
+        print(f"Gate ekspor        : {'lolos' if lolos else 'TIDAK lolos'} "
+              f"(min {MIN_AGREEMENT:.2%} label sama, selisih maks {MAX_PROBA_DIFF})")
+    print(f"Pipeline asli      : {rate_orig:,.0f} docs/detik")
+    print(f"Fast model         : {rate_fast:,.0f} docs/detik ({rate_fast / rate_orig:.1f}x)")
+
+    if label_col in df.columns:
+        truth = df[label_col].astype(int).to_numpy()[len(texts) - len(evaluated):]
+        print(f"Akurasi asli/fast  : {np.mean(np.asarray(labels_orig) == truth):.4f} / "
+              f"{np.mean(np.asarray(labels_fast) == truth):.4f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print("Usage: python bench_model.py model.pkl data.csv [kolom_teks] [kolom_label]")
+    else:
+        run(*sys.argv[1:5])
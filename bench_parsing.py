@@ -0,0 +1,81 @@
+# bench_parsing.py
+# Micro-benchmark parsing HTML: membandingkan backend BeautifulSoup (lxml,
+# html.parser, html5lib kalau terpasang) dengan dan tanpa parsing sebagian,
+# memakai halaman yang disimpan di fixtures/<portal>/listing_*.html dan
+# fixtures/<portal>/article_*.html.
+#
+#   python bench_parsing.py [fixtures_dir] [repeat]
+import glob
+import os
+import sys
+import time
+
+import html_parsing
+from portals import PORTALS, load_portal
+
+
+def _available_backends():
+    backends = []
+    for name, module in (("lxml", "lxml"), ("html.parser", None), ("html5lib", "html5lib")):
+        if module is None:
+            backends.append(name)
+            continue
+        try:
+            __import__(module)
+            backends.append(name)
+        except ImportError:
+            pass
+    return backends
+
+
+def _load_pages(folder, pattern):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(folder, pattern))):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    return pages
+
+
+def _time_it(fn, pages, repeat):
+    t0 = time.perf_counter()
+    out = None
+    for _ in range(repeat):
+        out = [fn(html) for html in pages]
+    elapsed = time.perf_counter() - t0
+    return elapsed / (repeat * len(pages)) * 1000, out
+
+
+def run(fixtures_dir="fixtures", repeat=5):
+    backends = _available_backends()
+    print(f"Backend tersedia: {', '.join(backends)}")
+    print(f"{'portal':<14}{'halaman':<9}{'backend':<13}{'partial':<9}{'ms/hal':>9}{'vs baseline':>13}")
+    for key in PORTALS:
+        folder = os.path.join(fixtures_dir, key)
+        module = load_portal(key)
+        kinds = {
+            "listing": (_load_pages(folder, "listing_*.html"), module.parse_listing),
+            "article": (_load_pages(folder, "article_*.html"),
+                        lambda html: module.parse_article(html, "judul", "https://example.invalid/")),
+        }
+        for kind, (pages, fn) in kinds.items():
+            if not pages:
+                continue
+            # baseline = perilaku lama: html.parser, DOM penuh
+            configs = [("html.parser", False)] + [(b, partial) for b in backends for partial in (False, True)
+                                                 if (b, partial) != ("html.parser", False)]
+            baseline = reference = None
+            for backend, partial in configs:
+                html_parsing.set_backend(backend)
+                html_parsing.set_partial_parsing(partial)
+                ms, out = _time_it(fn, pages, repeat)
+                if baseline is None:
+                    baseline, reference = ms, out
+                same = "" if out == reference else "  (hasil berbeda!)"
+                print(f"{key:<14}{kind:<9}{backend:<13}{str(partial):<9}{ms:>9.2f}{baseline / ms:>12.1f}x{same}")
+    html_parsing.set_backend(html_parsing.DEFAULT_BACKEND)
+    html_parsing.set_partial_parsing(True)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(args[0] if args else "fixtures", int(args[1]) if len(args) > 1 else 5)
@@ -0,0 +1,72 @@
+# bench_prefilter.py
+# Mengukur dampak prefilter leksikon (prefilter.py) pada data berlabel yang
+# tidak dipakai training: berapa panggilan model yang dilewati, berapa artikel
+# ekonomi yang ikut terbuang di gerbang (tanpa model pun bisa diukur), waktu
+# total, dan precision/recall/F1 kelas ekonomi dibanding model saja, untuk
+# beberapa kombinasi PREFILTER_MIN_TERMS / PREFILTER_MIN_BROAD_TERMS.
+#
+#   python bench_prefilter.py held_out.csv [model.pkl|model.npz] [kolom_teks] [kolom_label]
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_registry import DEFAULT_MODEL_PATH, get_model, preferred_model_path
+from prefilter import PrefilterCascade
+
+
+def _prf(pred, truth):
+    pred, truth = np.asarray(pred) == 1, np.asarray(truth) == 1
+    tp = int(np.sum(pred & truth))
+    precision = tp / max(int(pred.sum()), 1)
+    recall = tp / max(int(truth.sum()), 1)
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+# (min_terms, min_broad_terms): (1, 1) = perilaku lama (istilah umum dihitung sama)
+CONFIGS = ((1, 1), (1, 2), (1, 3), (2, 2), (2, None))
+
+
+def run(csv_path, model_path=None, text_col="isi", label_col="label"):
+    df = pd.read_csv(csv_path).dropna(subset=[text_col, label_col])
+    texts = df[text_col].astype(str).tolist()
+    truth = df[label_col].astype(int).to_numpy()
+    model = get_model(model_path or preferred_model_path(DEFAULT_MODEL_PATH))
+    print(f"{len(texts)} artikel, {int(np.sum(truth == 1))} berlabel ekonomi")
+
+    # gerbang saja (tanpa model): berapa yang dilewati, dan berapa artikel ekonomi yang ikut terbuang
+    print(f"{'gerbang':<26}{'dilewati':>10}{'recall gerbang':>16}")
+    for min_terms, min_broad in CONFIGS:
+        cascade = PrefilterCascade(None, min_terms=min_terms, min_broad_terms=min_broad)
+        passed = np.array([cascade.passes(t) for t in texts])
+        gate_recall = float(np.mean(passed[truth == 1])) if np.any(truth == 1) else 0.0
+        print(f"{f'min_terms={min_terms} broad={min_broad}':<26}{(1 - passed.mean()) * 100:>9.1f}%{gate_recall:>16.4f}")
+    if model is None:
+        print("Model tidak tersedia; hanya gerbang yang diukur.")
+        return
+
+    t0 = time.perf_counter()
+    base = model.predict(texts)
+    base_time = time.perf_counter() - t0
+    p, r, f = _prf(base, truth)
+    print(f"{'konfigurasi':<26}{'dilewati':>10}{'detik':>9}{'precision':>11}{'recall':>9}{'f1':>8}")
+    print(f"{'model saja':<26}{'0.0%':>10}{base_time:>9.2f}{p:>11.4f}{r:>9.4f}{f:>8.4f}")
+    for min_terms, min_broad in CONFIGS:
+        cascade = PrefilterCascade(model, min_terms=min_terms, min_broad_terms=min_broad)
+        t0 = time.perf_counter()
+        labels, _ = cascade.score_batch(texts)
+        elapsed = time.perf_counter() - t0
+        s = cascade.summary()
+        p, r, f = _prf(labels, truth)
+        lost = int(np.sum((np.asarray(labels) != 1) & (np.asarray(base) == 1)))
+        print(f"{f'min_terms={min_terms} broad={min_broad}':<26}{s['skipped_ratio'] * 100:>9.1f}%{elapsed:>9.2f}"
+              f"{p:>11.4f}{r:>9.4f}{f:>8.4f}  (ragu {s['ragu']}, positif model yang hilang {lost})")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python bench_prefilter.py held_out.csv [model.pkl|model.npz] [kolom_teks] [kolom_label]")
+    else:
+        run(*sys.argv[1:5])
@@ -0,0 +1,105 @@
+# bench_preprocess.py
+# docs/detik preprocessing teks: implementasi lama (re.sub tanpa kompilasi
+# per dokumen) vs clean_text_simple sekarang, dan normalisasi per token
+# (slang + stopword + stemming) dengan cache LRU dingin vs hangat, serta
+# transform multi-proses. Teks diambil dari CSV, atau dari article_store
+# kalau CSV tidak diberikan.
+#
+#   python bench_preprocess.py [data.csv] [kolom_teks]
+import re
+import sys
+import time
+
+from search_index import stem
+from text_preprocessor import TextPreprocessor, normalize_token, token_normalizer
+
+
+def _clean_text_lama(s):
+    # salinan implementasi sebelum dioptimasi, sebagai pembanding
+    if s is None:
+        return ""
+    s = str(s)
+    s = s.lower()
+    s = re.sub(r"\s+", " ", s)
+    s = s.strip()
+    return s
+
+
+def _normalize_tanpa_cache(texts):
+    # normalisasi per token yang sama, tapi setiap token di-stem ulang (tanpa LRU)
+    out = []
+    for text in texts:
+        tokens = []
+        for token in re.findall(r"(?u)\b\w\w+\b", str(text).lower()):
+            token = normalize_token(token, stemming=False)
+            if token and " " not in token:
+                token = stem.__wrapped__(token)
+            if token:
+                tokens.append(token)
+        out.append(" ".join(tokens))
+    return out
+
+
+def _rate(fn, texts, repeat=3, before=None):
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        t0 = time.perf_counter()
+        out = fn(texts)
+        best = min(best, time.perf_counter() - t0)
+    return len(texts) / best, out
+
+
+def _load_texts(csv_path=None, text_col="isi"):
+    if csv_path:
+        import pandas as pd
+        return pd.read_csv(csv_path).dropna(subset=[text_col])[text_col].astype(str).tolist()
+    from article_store import ArticleStore
+    store = ArticleStore()
+    try:
+        return [r["isi"] for r in store.query() if r.get("isi")]
+    finally:
+        store.close()
+
+
+def run(csv_path=None, text_col="isi"):
+    texts = _load_texts(csv_path, text_col)
+    if not texts:
+        print("Tidak ada teks; berikan CSV atau isi article_store dulu (python main.py)")
+        return
+    print(f"Dokumen: {len(texts)}, rata-rata {sum(map(len, texts)) / len(texts):,.0f} karakter")
+
+    rate_old, out_old = _rate(lambda xs: [_clean_text_lama(x) for x in xs], texts)
+    rate_new, out_new = _rate(TextPreprocessor().transform, texts)
+    print(f"clean lama              : {rate_old:,.0f} docs/detik")
+    print(f"clean sekarang          : {rate_new:,.0f} docs/detik ({rate_new / rate_old:.1f}x, "
+          f"hasil {'identik' if out_old == out_new else 'BERBEDA'})")
+
+    norm = TextPreprocessor(slang=True, stopwords=True, stemming=True)
+    rate_plain, out_plain = _rate(_normalize_tanpa_cache, texts)
+
+    def cold():
+        token_normalizer.cache_clear()
+        stem.cache_clear()
+
+    rate_cold, _ = _rate(norm.transform, texts, before=cold)
+    rate_warm, out_warm = _rate(norm.transform, texts)
+    info = token_normalizer(True, True, True).cache_info()
+    print(f"normalisasi tanpa cache : {rate_plain:,.0f} docs/detik")
+    print(f"normalisasi, cache dingin: {rate_cold:,.0f} docs/detik ({rate_cold / rate_plain:.1f}x)")
+    print(f"normalisasi, cache hangat: {rate_warm:,.0f} docs/detik ({rate_warm / rate_plain:.1f}x; "
+          f"{info.currsize:,} token unik di cache, hasil {'identik' if out_plain == out_warm else 'BERBEDA'})")
+
+    parallel = TextPreprocessor(slang=True, stopwords=True, stemming=True, n_jobs=-1)
+    # korpus diperbesar supaya melewati MIN_PARALLEL_DOCS (skenario training)
+    big = texts * max(1, 20000 // len(texts))
+    rate_serial, _ = _rate(norm.transform, big, repeat=1)
+    rate_parallel, _ = _rate(parallel.transform, big, repeat=1)
+    print(f"normalisasi {len(big)} dok : 1 proses {rate_serial:,.0f}, multi-proses {rate_parallel:,.0f} docs/detik "
+          f"({rate_parallel / rate_serial:.1f}x)")
+
+
+if __name__ == "__main__":
+    run(*sys.argv[1:3])
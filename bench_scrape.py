@@ -0,0 +1,135 @@
+# bench_scrape.py
+# Benchmark offline parser dan scrape_dan_klasifikasi end-to-end memakai
+# fixture hasil `python replay.py record` yang disajikan replay.FixtureServer
+# (dengan latensi buatan opsional). Tiap skenario jalan di proses baru supaya
+# peak RSS-nya tidak tercampur. Dilaporkan: artikel/detik, latensi per
+# artikel p50/p95 (dari request halaman artikel sampai record-nya keluar dari
+# generator parser / pipeline) dan peak RSS; hasil ditambahkan ke bench_results.jsonl dan dibandingkan
+# dengan run sebelumnya.
+#
+#   python bench_scrape.py [latency_detik] [fixtures_dir]
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from portals import PORTALS, load_iter
+from replay import FIXTURES_DIR, FixtureServer, ReplayFetcherSet, load_manifests
+
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results.jsonl")
+
+
+def _percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _peak_rss_mb():
+    # ru_maxrss: KB di Linux, byte di macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _summary(name, latencies, seconds):
+    return {
+        "name": name, "articles": len(latencies), "seconds": round(seconds, 4),
+        "articles_per_sec": round(len(latencies) / seconds, 2) if seconds else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.5) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 2),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+    }
+
+
+def _latency(fetchers, link):
+    started = fetchers.requested.get(link)
+    return time.perf_counter() - started if started is not None else None
+
+
+def _bench_parser(key, base_url, max_articles, max_pages):
+    iter_fn = load_iter(key)  # impor modul parser tidak ikut diukur
+    fetchers = ReplayFetcherSet(base_url)
+    latencies = []
+    t0 = time.perf_counter()
+    try:
+        for record in iter_fn(fetcher=fetchers.for_portal(key), max_articles=max_articles, max_pages=max_pages):
+            latencies.append(_latency(fetchers, record["link"]))
+    finally:
+        fetchers.close()
+    return _summary(f"parser:{key}", [x for x in latencies if x is not None], time.perf_counter() - t0)
+
+
+def _bench_end_to_end(base_url, portals, max_articles, max_pages):
+    from scraper_all import scrape_dan_klasifikasi
+
+    fetchers = ReplayFetcherSet(base_url)
+    latencies = []
+
+    def progress(event):
+        if event.get("type") == "article":
+            latencies.append(_latency(fetchers, event["link"]))
+
+    t0 = time.perf_counter()
+    with tempfile.TemporaryDirectory() as data_dir:
+        # data_dir terpisah: crawl state, indeks near-duplicate dan store proyek tidak tersentuh
+        scrape_dan_klasifikasi(max_articles=max_articles, max_pages=max_pages, use_cache=False, collect=False,
+                               progress=progress, fetchers=fetchers, data_dir=data_dir, portals=portals)
+    return _summary("scrape_dan_klasifikasi", [x for x in latencies if x is not None], time.perf_counter() - t0)
+
+
+def _isolated(fn, *args):
+    # proses baru per skenario -> peak RSS milik skenario itu saja
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(fn, args)
+
+
+def _previous_results(path):
+    previous = {}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                previous[(row["name"], row.get("latency"))] = row
+    return previous
+
+
+def run(latency=0.0, fixtures_dir=FIXTURES_DIR, max_pages=2, results_path=RESULTS_PATH):
+    manifests = load_manifests(fixtures_dir)
+    if not manifests:
+        print(f"Tidak ada fixture di {fixtures_dir}; jalankan dulu: python replay.py record")
+        return []
+    # jumlah artikel yang direkam per portal = batas max_articles supaya semua request kena fixture
+    recorded = {k: sum(1 for v in m.values() if os.path.basename(v).startswith("article_")) for k, m in manifests.items()}
+    previous = _previous_results(results_path)
+    results = []
+    print(f"{'skenario':<28}{'artikel':>8}{'art/dtk':>10}{'p50 ms':>10}{'p95 ms':>10}{'RSS MB':>9}{'vs lalu':>10}")
+    with FixtureServer(fixtures_dir, latency=latency) as server:
+        jobs = [(_bench_parser, key, server.url, recorded[key], max_pages) for key in PORTALS if recorded.get(key)]
+        # end-to-end hanya portal yang punya fixture
+        jobs.append((_bench_end_to_end, server.url, list(recorded), max(recorded.values()), max_pages))
+        for fn, *args in jobs:
+            row = _isolated(fn, *args)
+            row.update(latency=latency, timestamp=time.time())
+            prev = previous.get((row["name"], latency))
+            delta = (f"{row['articles_per_sec'] / prev['articles_per_sec']:.2f}x"
+                     if prev and prev.get("articles_per_sec") else "-")
+            print(f"{row['name']:<28}{row['articles']:>8}{row['articles_per_sec']:>10.1f}{row['p50_ms']:>10.1f}"
+                  f"{row['p95_ms']:>10.1f}{row['peak_rss_mb']:>9.1f}{delta:>10}")
+            results.append(row)
+        print(f"Request ke fixture server: {server.requests} ({server.misses} tidak ada di fixture)")
+    with open(results_path, "a", encoding="utf-8") as f:
+        for row in results:
+            f.write(json.dumps(row) + "\n")
+    return results
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    run(float(args[0]) if args else 0.0, args[1] if len(args) > 1 else FIXTURES_DIR)
@@ -0,0 +1,200 @@
+# browser_profile.py
+# Profil Chrome yang ramping untuk fetch lewat browser: pageLoadStrategy
+# "eager" (driver.get kembali begitu DOM siap, tanpa menunggu gambar/iklan),
+# fitur Chrome yang tidak dipakai dimatikan, dan resource berat (gambar,
+# media, font, embed video, domain iklan/analytics) diblokir lewat CDP
+# Network.setBlockedURLs. Kategori yang diblokir bisa diatur per portal.
+# Satu-satunya tempat Chrome driver dibuat (dipakai driver_pool.py,
+# scraper_all.py dan parser_radarlampung.py); path chromedriver hanya
+# di-resolve sekali per proses.
+import os
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from portals import PORTALS
+
+PAGE_LOAD_STRATEGY = "eager"
+# dengan "eager" 20 detik sudah longgar; yang ditunggu hanya HTML + script sinkron
+PAGE_LOAD_TIMEOUT = 20
+
+# pola URL (wildcard "*") per kategori resource
+RESOURCE_PATTERNS = {
+    "images": ["*.jpg*", "*.jpeg*", "*.png*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*", "*.bmp*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*", "*.m4a*"],
+    "fonts": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "embeds": ["*youtube.com/embed*", "*youtube-nocookie.com*", "*ytimg.com*", "*player.vimeo.com*",
+               "*dailymotion.com/embed*", "*platform.twitter.com*", "*instagram.com/embed*", "*tiktok.com/embed*"],
+    "ads": ["*doubleclick.net*", "*googlesyndication.com*", "*googleadservices.com*", "*adservice.google.*",
+            "*googletagmanager.com*", "*googletagservices.com*", "*google-analytics.com*", "*connect.facebook.net*",
+            "*facebook.com/tr*", "*scorecardresearch.com*", "*taboola.com*", "*outbrain.com*", "*criteo.*",
+            "*amazon-adsystem.com*", "*mgid.com*", "*adnxs.com*", "*pubmatic.com*", "*rubiconproject.com*",
+            "*hotjar.com*", "*histats.com*", "*quantserve.com*", "*mc.yandex.ru*", "*onesignal.com*",
+            "*clarity.ms*", "*cdn.ampproject.org/*amp-ad*", "*innity.net*", "*revive-adserver*"],
+    "stylesheets": ["*.css*"],
+}
+# kategori yang diblokir kalau portal tidak diatur di PORTAL_BLOCKED; CSS tetap dimuat
+# karena ada portal yang memunculkan konten lewat lazy-load berbasis layout
+DEFAULT_BLOCKED = ("images", "media", "fonts", "embeds", "ads")
+# kunci portal -> kategori yang diblokir (menggantikan DEFAULT_BLOCKED)
+PORTAL_BLOCKED = {}
+# path chromedriver yang sudah ada (melewati webdriver-manager sama sekali)
+CHROMEDRIVER_ENV = "CHROMEDRIVER_PATH"
+# storage yang dihapus antar job (cookie dihapus terpisah lewat Network.clearBrowserCookies)
+_STORAGE_TYPES = "local_storage,session_storage,indexeddb,websql,service_workers,cache_storage"
+
+_CHROME_ARGS = (
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--window-size=1920,1080",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-translate",
+    "--disable-notifications",
+    "--disable-renderer-backgrounding",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--autoplay-policy=user-gesture-required",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,"
+    "InterestFeedContentSuggestions,CalculateNativeWinOcclusion",
+)
+# dijalankan di setiap dokumen baru: sembunyikan navigator.webdriver dan perbesar buffer
+# resource timing (default 250 entri) supaya byte per halaman terhitung semua
+_INIT_SCRIPT = (
+    "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
+    "try { performance.setResourceTimingBufferSize(2000); } catch (e) {}"
+)
+# byte yang ditransfer dokumen + semua resource-nya (transferSize resource lintas
+# origin tanpa Timing-Allow-Origin terbaca 0, jadi angka ini batas bawah)
+_TRANSFER_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const res = performance.getEntriesByType('resource');
+let bytes = nav ? nav.transferSize : 0;
+for (const r of res) bytes += r.transferSize || 0;
+return [bytes, res.length];
+"""
+
+
+def blocked_patterns(portal=None):
+    """Pola URL yang diblokir untuk `portal` (kunci portals.PORTALS, None = default)."""
+    categories = PORTAL_BLOCKED.get(portal, DEFAULT_BLOCKED)
+    return [p for c in categories for p in RESOURCE_PATTERNS[c]]
+
+
+def apply_resource_policy(driver, portal=None):
+    """
+    Pasang daftar blokir portal ini di driver sebelum navigasi. Driver di pool
+    dipakai bergantian oleh beberapa portal, jadi CDP hanya dipanggil kalau
+    daftarnya berbeda dengan yang terakhir dipasang di driver itu.
+    """
+    patterns = blocked_patterns(portal)
+    if getattr(driver, "_blocked_patterns", None) == patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        driver._blocked_patterns = patterns
+    except Exception:
+        # driver tanpa CDP (remote/non-Chrome): halaman dimuat penuh
+        pass
+
+
+def transfer_stats(driver):
+    """(byte yang ditransfer, jumlah resource) halaman yang sedang terbuka, atau (None, None)."""
+    try:
+        nbytes, resources = driver.execute_script(_TRANSFER_SCRIPT)
+        return int(nbytes or 0), int(resources or 0)
+    except Exception:
+        return None, None
+
+
+_driver_path_lock = threading.Lock()
+_driver_path = {}
+
+
+def chromedriver_path():
+    """
+    Path chromedriver, di-resolve sekali per proses: $CHROMEDRIVER_PATH kalau ada,
+    selain itu ChromeDriverManager().install() (cek versi + unduh/IO) cukup sekali.
+    None kalau gagal: Selenium mencari sendiri (Selenium Manager / PATH).
+    """
+    with _driver_path_lock:
+        if "path" not in _driver_path:
+            path = os.environ.get(CHROMEDRIVER_ENV)
+            if not path:
+                try:
+                    path = ChromeDriverManager().install()
+                except Exception as e:
+                    print(f"Gagal menginstal/setup ChromeDriver, coba cara manual: {e}")
+                    path = None
+            _driver_path["path"] = path
+        return _driver_path["path"]
+
+
+def clear_session_state(driver):
+    """Hapus cookie dan storage portal (antar job) tanpa me-restart Chrome; False kalau driver rusak."""
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for portal in PORTALS.values():
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                   {"origin": f"https://{portal['host']}", "storageTypes": _STORAGE_TYPES})
+        driver.get("about:blank")
+        return True
+    except Exception:
+        return False
+
+
+def chrome_options(headless=True, memory_mb=None):
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    for arg in _CHROME_ARGS:
+        options.add_argument(arg)
+    if memory_mb:
+        # batas heap JavaScript per renderer supaya satu tab tidak menghabiskan RAM
+        options.add_argument(f"--js-flags=--max-old-space-size={int(memory_mb)}")
+    options.page_load_strategy = PAGE_LOAD_STRATEGY
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option("useAutomationExtension", False)
+    options.add_experimental_option("prefs", {
+        "profile.default_content_setting_values.notifications": 2,
+        "profile.default_content_setting_values.geolocation": 2,
+        "credentials_enable_service": False,
+        "profile.password_manager_enabled": False,
+    })
+    return options
+
+
+def make_chrome_driver(headless=True, memory_mb=None):
+    """Membuat satu instance Chrome driver dengan profil ramping."""
+    options = chrome_options(headless=headless, memory_mb=memory_mb)
+    path = chromedriver_path()
+    driver = None
+    if path:
+        try:
+            driver = webdriver.Chrome(service=Service(path), options=options)
+        except Exception as e:
+            print(f"Gagal menjalankan ChromeDriver {path}, coba cara manual: {e}")
+    if driver is None:
+        # Fallback jika webdriver-manager gagal (misalnya karena firewall)
+        driver = webdriver.Chrome(options=options)
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _INIT_SCRIPT})
+    except Exception:
+        pass
+    apply_resource_policy(driver)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+    driver.set_script_timeout(30)
+    print("[INFO] Chrome driver berhasil dibuat.")
+    return driver
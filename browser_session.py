@@ -0,0 +1,69 @@
+# browser_session.py
+# Sesi browser yang hidup selama proses (Flask app / scheduler): satu
+# DriverPool dipakai semua job, jadi Chrome tidak di-cold-start ulang tiap
+# request. Thread perawatan memeriksa driver idle secara berkala (health
+# check + daur ulang driver tua) dan menjaga `warm` driver tetap hidup
+# begitu Chrome pernah dibutuhkan. Antar job cookie/storage dibersihkan
+# (FetcherSet.close -> DriverPool.maintain(clear_state=True)).
+import atexit
+import threading
+
+from driver_pool import DRIVER_MEMORY_MB, DRIVER_POOL_SIZE, DriverPool
+
+# jeda antar pemeriksaan driver idle (detik)
+HEALTH_CHECK_INTERVAL = 60
+# jumlah Chrome yang dijaga tetap hidup setelah pemakaian pertama
+WARM_DRIVERS = 1
+
+
+class BrowserSessions:
+    """Pemilik DriverPool jangka panjang; pool dan Chrome-nya dibuat malas (lazy)."""
+
+    def __init__(self, size=DRIVER_POOL_SIZE, warm=WARM_DRIVERS, interval=HEALTH_CHECK_INTERVAL,
+                 memory_mb=DRIVER_MEMORY_MB, factory=None):
+        self.size = size
+        self.warm = warm
+        self.interval = interval
+        self.memory_mb = memory_mb
+        self.factory = factory
+        self._pool = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def pool(self):
+        """DriverPool bersama (dibuat saat pertama diminta, tanpa langsung menyalakan Chrome)."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = DriverPool(size=self.size, factory=self.factory, memory_mb=self.memory_mb)
+                self._thread = threading.Thread(target=self._maintain_loop, name="browser-session", daemon=True)
+                self._thread.start()
+            return self._pool
+
+    def warm_up_async(self):
+        """Nyalakan `warm` Chrome di thread background (misal saat proses start)."""
+        t = threading.Thread(target=lambda: self.pool().warm(self.warm), name="browser-warmup", daemon=True)
+        t.start()
+        return t
+
+    def _maintain_loop(self):
+        while not self._stop.wait(self.interval):
+            pool = self._pool
+            try:
+                pool.maintain()
+                # Chrome baru dijaga hangat kalau memang pernah dipakai (portal "auto" sering cukup HTTP)
+                if pool.created:
+                    pool.warm(self.warm)
+            except Exception as e:
+                print(f"[WARNING] Perawatan sesi browser gagal: {e}")
+
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+
+
+SESSIONS = BrowserSessions()
+atexit.register(SESSIONS.close)
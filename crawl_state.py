@@ -0,0 +1,98 @@
+# crawl_state.py
+# High-water mark per portal: artikel terbaru yang sudah berhasil di-ingest
+# (URL + tanggal) beserta daftar URL terakhir. Dipakai mode incremental supaya
+# crawl berikutnya berhenti begitu listing mencapai artikel yang sudah dilihat.
+# Mark hanya maju setelah walk listing benar-benar sampai ke mark lama, supaya
+# artikel di antara keduanya tidak terlewat kalau run terpotong max_articles.
+import json
+import os
+import threading
+from datetime import date, datetime
+
+from url_canon import canonical_url
+
+DEFAULT_STATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawl_state.json")
+# jumlah URL terakhir yang diingat per portal (untuk melewati artikel yang sudah di-ingest)
+RECENT_LINKS = 200
+# batas "recent" selama walk incremental belum sampai ke mark lama (backfill bertahap)
+BACKFILL_RECENT_LINKS = 5000
+
+
+class CrawlState:
+    """State crawl yang disimpan sebagai JSON kecil di disk."""
+
+    def __init__(self, path=DEFAULT_STATE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._data = self._read(warn=True)
+
+    def _read(self, warn=False):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                if warn:
+                    print(f"[WARNING] Gagal membaca {self.path}, mulai dari awal: {e}")
+        return {}
+
+    def watermark(self, portal):
+        """{"url", "tanggal" (date), "recent" (set URL kanonik)} atau None kalau belum pernah crawl."""
+        with self._lock:
+            entry = self._data.get(portal)
+        if not entry:
+            return None
+        return {
+            "url": entry.get("url"),
+            "tanggal": date.fromisoformat(entry["tanggal"]) if entry.get("tanggal") else None,
+            "recent": set(entry.get("recent", [])),
+        }
+
+    def update(self, portal, records, reached_mark=False):
+        """
+        Catat record yang baru di-ingest. High-water mark hanya maju kalau
+        `reached_mark`: walk listing run ini sampai ke mark lama (untuk portal
+        yang belum punya mark: semua halaman listing run itu) tanpa terpotong.
+        Selain itu mark lama dipertahankan: link baru masuk "recent" supaya
+        tidak di-fetch ulang, dan kandidat mark disimpan di "pending" sampai ada
+        run yang walk-nya tuntas. Mark tidak pernah mundur.
+        """
+        records = [r for r in records if r.get("link")]
+        with self._lock:
+            entry = self._data.get(portal) or {}
+            if not records and not (reached_mark and entry.get("pending")):
+                return
+            recent = [canonical_url(r["link"]) for r in records]
+            recent += [u for u in entry.get("recent", []) if u not in set(recent)]
+            candidates = [(r["tanggal"], canonical_url(r["link"])) for r in records if r.get("tanggal")]
+            pending = entry.pop("pending", None)
+            if pending:
+                candidates.append((date.fromisoformat(pending["tanggal"]), pending["url"]))
+            newest = max(candidates, key=lambda c: c[0]) if candidates else None
+            if reached_mark:
+                old = date.fromisoformat(entry["tanggal"]) if entry.get("tanggal") else None
+                if newest is not None and (old is None or newest[0] >= old):
+                    entry["tanggal"], entry["url"] = newest[0].isoformat(), newest[1]
+                entry["recent"] = recent[:RECENT_LINKS]
+            else:
+                if newest is not None:
+                    entry["pending"] = {"url": newest[1], "tanggal": newest[0].isoformat()}
+                # selama backfill belum tuntas, semua link yang sudah di-ingest harus tetap dilewati
+                entry["recent"] = recent[:BACKFILL_RECENT_LINKS]
+            entry["updated_at"] = datetime.now().isoformat(timespec="seconds")
+            self._data[portal] = entry
+            self._dirty.add(portal)
+
+    def save(self):
+        # hanya portal yang diperbarui instance ini yang ditulis; portal lain diambil dari
+        # file terbaru supaya run yang jalan bersamaan (scheduler + web) tidak saling menimpa
+        with self._lock:
+            data = self._read()
+            data.update({p: self._data[p] for p in self._dirty})
+            self._data.update(data)
+            self._dirty.clear()
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp, self.path)
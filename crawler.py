@@ -0,0 +1,256 @@
+# crawler.py
+# Mode crawl konkuren: halaman listing dan artikel dari semua portal masuk ke
+# satu scheduler dengan batas koneksi per host dan batas global. HTML yang
+# sudah diambil diserahkan ke parse_listing / parse_article milik tiap portal.
+# Portal yang punya feed/sitemap (discovery.py) mulai dari situ; halaman
+# listing HTML hanya diambil kalau feed gagal atau tidak mencakup rentang tanggal.
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import date, datetime
+from urllib.parse import urlparse
+
+from discovery import discover
+from fetcher import fetch_article
+from listing import UNBOUNDED_MAX_PAGES, apply_watermark, filter_listing
+from portals import PORTALS, load_portal
+from url_canon import SeenSet, canonical_url
+
+GLOBAL_CONCURRENCY = 16
+PER_HOST_CONCURRENCY = 4
+
+
+def _host(url):
+    return urlparse(url).netloc.lower()
+
+
+def _to_date(value):
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.fromisoformat(str(value).strip()).date()
+
+
+class _PortalState:
+    """Status crawl satu portal: antrian link, halaman berikutnya, hasil."""
+
+    def __init__(self, key, fetcher, max_pages, max_articles, watermark=None, seen=None):
+        self.key = key
+        self.module = load_portal(key)
+        self.fetcher = fetcher
+        self.watermark = watermark
+        self.seen = seen if seen is not None else SeenSet()
+        # max_pages=None -> terus paging sampai listing melewati start_date;
+        # dengan high-water mark, paging berlanjut sampai artikel yang sudah dilihat
+        # (state yang baru berisi "recent" tanpa mark tetap memakai max_pages)
+        self.has_mark = bool(watermark and (watermark.get("url") or watermark.get("tanggal")))
+        if max_pages is None or self.has_mark:
+            max_pages = UNBOUNDED_MAX_PAGES
+        self.max_pages = max_pages
+        self.exhausted = False
+        # walk listing sampai ke high-water mark (atau listing habis) tanpa ada yang terpotong
+        self.walked = False
+        self.truncated = False
+        self.max_articles = max_articles
+        self.queue = deque()
+        self.order = {}  # link -> posisi di listing
+        self.next_page = 1
+        # feed/sitemap dicoba sekali sebelum halaman listing pertama
+        self.feed_pending = bool(PORTALS[key].get("feeds"))
+        self.listing_inflight = False
+        self.articles_inflight = 0
+        self.found = 0
+
+    def wants_articles(self):
+        return self.found + self.articles_inflight < self.max_articles
+
+    def can_fetch_listing(self):
+        # halaman berikutnya baru diambil kalau antrian link sudah habis
+        return (not self.listing_inflight and not self.queue and not self.exhausted
+                and self.next_page <= self.max_pages and self.wants_articles())
+
+    def walk_complete(self):
+        # semua link baru di atas mark sudah diambil -> crawl_state boleh memajukan mark;
+        # tanpa mark, walk tuntas = semua halaman listing run ini sudah dijalani
+        if self.truncated or self.queue:
+            return False
+        return self.walked or (not self.has_mark and (self.exhausted or self.next_page > self.max_pages))
+
+    def can_fetch_feed(self):
+        return self.feed_pending and not self.listing_inflight and self.wants_articles()
+
+    def add_feed(self, entries, start_date, end_date):
+        # entri feed urut terbaru dengan tanggal pasti; kalau feed sudah mencapai
+        # start_date / high-water mark, halaman listing tidak perlu diambil sama sekali
+        self.feed_pending = False
+        if entries:
+            self.add_links(entries, start_date, end_date, newest_first=True)
+
+    def add_links(self, links, start_date, end_date, newest_first=None):
+        if not links:
+            self.exhausted = True
+            self.walked = True
+            return
+        if newest_first is None:
+            newest_first = getattr(self.module, "SORTED_NEWEST_FIRST", False)
+        links, reached_start = filter_listing(links, start_date, end_date, newest_first)
+        links, reached_mark = apply_watermark(links, self.watermark, newest_first, canonical_url)
+        if reached_start or reached_mark:
+            self.exhausted = True
+        if reached_mark:
+            self.walked = True
+        for title, link, _ in links:
+            # seen-set dipakai bersama semua portal: link yang sama (atau varian
+            # AMP/tracking-nya, termasuk artikel sindikasi) hanya di-fetch sekali
+            if self.seen.add(link):
+                self.order[link] = len(self.order)
+                self.queue.append((title, link))
+
+
+def _fetch_listing(state, url):
+    html = state.fetcher.get(url)
+    if html is None:
+        return None
+    return state.module.parse_listing(html)
+
+
+def _fetch_feed(state):
+    return discover(state.key, state.fetcher)
+
+
+def _fetch_article(state, title, link):
+    return fetch_article(state.fetcher, title, link, state.module.parse_article)
+
+
+def iter_crawl(fetchers, portals=None, start_date=None, end_date=None, max_articles=5, max_pages=2,
+               max_workers=GLOBAL_CONCURRENCY, per_host=PER_HOST_CONCURRENCY, state=None, seen=None,
+               on_complete=None):
+    """
+    Crawl beberapa portal sekaligus dengan thread pool.
+    `fetchers` adalah fetcher.FetcherSet. Generator yang menghasilkan
+    (portal, record) begitu artikel selesai diambil (urutan selesai, bukan
+    urutan listing). Dengan max_pages=None, paging berlanjut sampai listing
+    melewati start_date.
+    Kalau `state` (crawl_state.CrawlState) diberikan, crawl berjalan incremental:
+    listing tiap portal hanya dijalani sampai high-water mark terakhir.
+    `seen` (url_canon.SeenSet) bisa diisi URL yang sudah dimiliki supaya tidak
+    di-fetch ulang; duplikat lintas portal selalu dilewati sebelum dijadwalkan.
+    `on_complete(portal)` dipanggil setelah crawl selesai untuk tiap portal
+    yang walk listing-nya sampai ke high-water mark (atau listing habis) tanpa
+    terpotong max_articles; hanya untuk portal itu mark boleh dimajukan.
+    """
+    for key, _, record in _crawl(fetchers, portals, start_date, end_date, max_articles, max_pages,
+                                 max_workers, per_host, state, seen, on_complete):
+        yield key, record
+
+
+def _crawl(fetchers, portals, start_date, end_date, max_articles, max_pages, max_workers, per_host, state, seen,
+           on_complete=None):
+    # menghasilkan (portal, posisi_di_listing, record)
+    start_date = _to_date(start_date)
+    end_date = _to_date(end_date)
+    keys = list(portals or PORTALS)
+    seen = seen if seen is not None else SeenSet()
+    states = [_PortalState(k, fetchers.for_portal(k), max_pages, max_articles,
+                           state.watermark(k) if state is not None else None, seen) for k in keys]
+
+    host_inflight = defaultdict(int)
+    futures = {}
+
+    def in_range(tanggal):
+        return not ((start_date and tanggal < start_date) or (end_date and tanggal > end_date))
+
+    def submit(pool, state, kind, url, fn, *args):
+        host_inflight[_host(url)] += 1
+        futures[pool.submit(fn, state, *args)] = (state, kind, url)
+
+    def schedule(pool):
+        # round-robin antar portal supaya portal yang lambat tidak menahan yang lain
+        progressed = True
+        while progressed and len(futures) < max_workers:
+            progressed = False
+            for st in states:
+                if len(futures) >= max_workers:
+                    break
+                if st.queue and st.wants_articles():
+                    title, link = st.queue[0]
+                    if host_inflight[_host(link)] >= per_host:
+                        continue
+                    st.queue.popleft()
+                    st.articles_inflight += 1
+                    submit(pool, st, "article", link, _fetch_article, title, link)
+                    progressed = True
+                elif st.can_fetch_feed():
+                    url = PORTALS[st.key]["feeds"][0]
+                    if host_inflight[_host(url)] >= per_host:
+                        continue
+                    print(f"📰 [{PORTALS[st.key]['name']}] feed → {url}")
+                    st.listing_inflight = True
+                    submit(pool, st, "feed", url, _fetch_feed)
+                    progressed = True
+                elif st.can_fetch_listing():
+                    url = st.module.listing_url(st.next_page)
+                    if host_inflight[_host(url)] >= per_host:
+                        continue
+                    print(f"🔄 [{PORTALS[st.key]['name']}] halaman {st.next_page} → {url}")
+                    st.next_page += 1
+                    st.listing_inflight = True
+                    submit(pool, st, "listing", url, _fetch_listing, url)
+                    progressed = True
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        schedule(pool)
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for fut in done:
+                state, kind, url = futures.pop(fut)
+                host_inflight[_host(url)] -= 1
+                try:
+                    result = fut.result()
+                except Exception as e:
+                    print(f"   [warn] gagal memproses {url}: {e}")
+                    result = None
+                if kind == "feed":
+                    state.listing_inflight = False
+                    if not result:
+                        print(f"  ℹ️ [{PORTALS[state.key]['name']}] feed tidak tersedia, pakai halaman listing")
+                    state.add_feed(result, start_date, end_date)
+                elif kind == "listing":
+                    state.listing_inflight = False
+                    if result is None:
+                        print(f"  ❌ Gagal load page {url}")
+                        state.truncated = True
+                    else:
+                        state.add_links(result, start_date, end_date)
+                else:
+                    state.articles_inflight -= 1
+                    if result and in_range(result["tanggal"]):
+                        if state.found >= state.max_articles:
+                            state.truncated = True
+                            continue
+                        state.found += 1
+                        yield state.key, state.order.get(result["link"], 0), result
+            schedule(pool)
+    if on_complete is not None:
+        for st in states:
+            if st.walk_complete():
+                on_complete(st.key)
+
+
+def crawl(fetchers, portals=None, start_date=None, end_date=None, max_articles=5, max_pages=2,
+          max_workers=GLOBAL_CONCURRENCY, per_host=PER_HOST_CONCURRENCY, state=None, seen=None, progress=None):
+    """
+    Seperti iter_crawl(), tetapi mengumpulkan hasilnya: dict {portal: [record, ...]}
+    dengan urutan record mengikuti urutan di halaman listing.
+    `progress(portal, record)` dipanggil untuk tiap artikel yang diterima.
+    """
+    keys = list(portals or PORTALS)
+    results = {k: [] for k in keys}
+    for key, position, record in _crawl(fetchers, keys, start_date, end_date, max_articles, max_pages,
+                                        max_workers, per_host, state, seen):
+        results[key].append((position, record))
+        if progress is not None:
+            progress(key, record)
+    return {k: [r for _, r in sorted(v, key=lambda item: item[0])] for k, v in results.items()}
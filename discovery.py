@@ -0,0 +1,178 @@
+# discovery.py
+# Penemuan artikel lewat RSS/Atom feed dan sitemap.xml / news-sitemap portal.
+# Satu dokumen XML kecil sudah berisi URL, judul dan tanggal terbit, jadi
+# listing cukup satu-dua request dan tanggal sudah pasti sebelum artikel
+# diambil. XML dibaca bertahap dengan XMLPullParser (elemen dibuang begitu
+# selesai diproses) dan berhenti begitu MAX_ENTRIES tercapai. Portal tanpa
+# "feeds" di portals.PORTALS, atau yang feed-nya gagal/kosong, tetap memakai
+# halaman listing HTML (crawler.py).
+import re
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from fetcher import AutoFetcher
+from listing import parse_indonesian_date
+from metrics import log_event, timed
+from portals import PORTALS, portal_for_url
+
+# jumlah entri maksimum yang dibaca dari satu feed/sitemap
+MAX_ENTRIES = 200
+# sitemap anak yang diikuti dari satu sitemapindex (news-sitemap dan lastmod terbaru dulu)
+MAX_CHILD_SITEMAPS = 2
+# feed yang gagal tidak dicoba lagi selama sekian detik (proses jangka panjang: app/scheduler)
+FEED_RETRY_AFTER = 60 * 60
+# ukuran potongan teks yang diumpankan ke parser XML
+_CHUNK = 64 * 1024
+
+_unavailable = {}  # url feed -> time.monotonic() saat gagal
+
+
+def _local(tag):
+    # "{namespace}loc" -> "loc"
+    return tag.rsplit("}", 1)[-1].lower()
+
+
+def _child_text(elem, *names):
+    for child in elem:
+        if _local(child.tag) in names and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+
+def _atom_link(elem):
+    fallback = None
+    for child in elem:
+        if _local(child.tag) == "link" and child.get("href"):
+            if child.get("rel", "alternate") == "alternate":
+                return child.get("href")
+            fallback = fallback or child.get("href")
+    return fallback
+
+
+def _news_title(elem):
+    for child in elem:
+        if _local(child.tag) == "news":
+            return _child_text(child, "title")
+    return None
+
+
+def _news_date(elem):
+    for child in elem:
+        if _local(child.tag) == "news":
+            return _child_text(child, "publication_date")
+    return None
+
+
+def _slug_title(link):
+    # sitemap biasa tidak punya judul; parse_article butuh string -> judul dari slug URL
+    slug = [part for part in urlsplit(link).path.split("/") if part]
+    slug = slug[-1].rsplit(".", 1)[0] if slug else link
+    return re.sub(r"[-_]+", " ", slug).strip().capitalize()
+
+
+def parse_date(text):
+    """Tanggal dari pubDate RFC 822, ISO 8601 (lastmod/published) atau teks Indonesia."""
+    if not text:
+        return None
+    try:
+        return parsedate_to_datetime(text).date()
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).date()
+    except ValueError:
+        return parse_indonesian_date(text)
+
+
+def iter_entries(xml_text, max_entries=MAX_ENTRIES):
+    """
+    Generator entri dari satu dokumen RSS, Atom, sitemap atau sitemapindex:
+    ("entry", title, link, tanggal) untuk artikel dan ("sitemap", None, loc,
+    tanggal) untuk sitemap anak. Berhenti setelah `max_entries` artikel.
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    count = 0
+    for start in range(0, len(xml_text), _CHUNK):
+        parser.feed(xml_text[start:start + _CHUNK])
+        for _, elem in parser.read_events():
+            name = _local(elem.tag)
+            if name == "item":  # RSS 2.0
+                entry = (_child_text(elem, "title"), _child_text(elem, "link"),
+                         parse_date(_child_text(elem, "pubdate", "date")))
+            elif name == "entry":  # Atom
+                entry = (_child_text(elem, "title"), _atom_link(elem),
+                         parse_date(_child_text(elem, "published", "updated")))
+            elif name == "url":  # sitemap / news-sitemap
+                entry = (_news_title(elem), _child_text(elem, "loc"),
+                         parse_date(_news_date(elem) or _child_text(elem, "lastmod")))
+            elif name == "sitemap":  # sitemapindex
+                yield "sitemap", None, _child_text(elem, "loc"), parse_date(_child_text(elem, "lastmod"))
+                elem.clear()
+                continue
+            else:
+                continue
+            elem.clear()
+            if entry[1]:
+                yield ("entry",) + entry
+                count += 1
+                if count >= max_entries:
+                    return
+    parser.close()
+
+
+def _xml_fetcher(fetcher):
+    # feed diambil lewat HTTP biasa: AutoFetcher akan jatuh ke browser untuk dokumen
+    # kecil, dan page_source Chrome untuk XML bukan XML lagi
+    return fetcher.http if isinstance(fetcher, AutoFetcher) else fetcher
+
+
+def _read(fetcher, url, key, max_entries, depth=0):
+    html = fetcher.get(url)
+    if html is None:
+        return None
+    entries, children = [], []
+    try:
+        for kind, title, link, tanggal in iter_entries(html, max_entries):
+            if kind == "sitemap":
+                children.append((link, tanggal))
+            elif portal_for_url(link) == key:
+                entries.append((title or _slug_title(link), link, tanggal))
+    except ET.ParseError as e:
+        print(f"[WARNING] Feed {url} bukan XML yang valid: {e}")
+        return entries or None
+    if children and depth == 0:
+        # news-sitemap dulu, lalu sitemap anak dengan lastmod terbaru
+        children.sort(key=lambda c: ("news" not in (c[0] or "").lower(), -(c[1].toordinal() if c[1] else 0)))
+        for loc, _ in children[:MAX_CHILD_SITEMAPS]:
+            entries.extend(_read(fetcher, loc, key, max_entries - len(entries), depth + 1) or [])
+            if len(entries) >= max_entries:
+                break
+    return entries
+
+
+def discover(key, fetcher, max_entries=MAX_ENTRIES):
+    """
+    Entri listing (title, link, tanggal) portal `key` dari feed/sitemap-nya,
+    urut dari yang terbaru; None kalau portal tidak punya feed atau semua
+    feed-nya gagal (pemanggil kembali ke halaman listing HTML).
+    """
+    fetcher = _xml_fetcher(fetcher)
+    for url in PORTALS[key].get("feeds", ()):
+        failed_at = _unavailable.get(url)
+        if failed_at is not None and time.monotonic() - failed_at < FEED_RETRY_AFTER:
+            continue
+        with timed("discover", key):
+            entries = _read(fetcher, url, key, max_entries)
+        if not entries:
+            _unavailable[url] = time.monotonic()
+            log_event("discover", portal=key, feed=url, entries=0)
+            continue
+        _unavailable.pop(url, None)
+        # tanggal feed lengkap -> urutan terbaru dulu bisa dipakai untuk berhenti lebih awal
+        entries.sort(key=lambda e: e[2].toordinal() if e[2] else 0, reverse=True)
+        log_event("discover", portal=key, feed=url, entries=len(entries))
+        return entries
+    return None
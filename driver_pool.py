@@ -0,0 +1,208 @@
+# driver_pool.py
+# Pool beberapa Chrome headless yang dipinjamkan (lease) ke thread crawler.
+# Driver yang crash / timeout / melewati batas memori / terlalu tua didaur
+# ulang otomatis. Pool yang hidup lama (browser_session.py) dirawat lewat
+# maintain(): driver idle dicek kesehatannya dan cookie/storage-nya
+# dibersihkan antar job, sehingga Chrome tidak perlu di-restart.
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import psutil
+except ImportError:  # psutil opsional; tanpa itu batas memori hanya dihitung dari /proc/meminfo
+    psutil = None
+
+DRIVER_POOL_SIZE = 2
+# Batas memori per instance Chrome (MB). Juga dipakai untuk membatasi berapa
+# instance yang boleh jalan bersamaan berdasarkan memori yang tersedia.
+DRIVER_MEMORY_MB = 700
+# Driver di-restart setelah sekian kali dipakai untuk mencegah memory leak Chrome
+DRIVER_MAX_USES = 200
+# ... atau setelah sekian detik hidup (pool yang dipakai lintas job)
+DRIVER_MAX_AGE = 30 * 60
+
+
+def _available_memory_mb():
+    if psutil is not None:
+        return psutil.virtual_memory().available // (1024 * 1024)
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+
+def effective_pool_size(size, memory_mb=DRIVER_MEMORY_MB):
+    """Batasi jumlah Chrome sesuai memori yang tersedia (minimal 1)."""
+    available = _available_memory_mb()
+    if available is None or not memory_mb:
+        return max(1, size)
+    return max(1, min(size, available // memory_mb))
+
+
+def driver_rss_mb(driver):
+    """Total RSS chromedriver + semua proses Chrome anaknya, atau None kalau tidak bisa diukur."""
+    if psutil is None:
+        return None
+    try:
+        proc = psutil.Process(driver.service.process.pid)
+        procs = [proc] + proc.children(recursive=True)
+        return sum(p.memory_info().rss for p in procs) // (1024 * 1024)
+    except Exception:
+        return None
+
+
+def _default_factory(memory_mb):
+    from browser_profile import make_chrome_driver
+    return make_chrome_driver(headless=True, memory_mb=memory_mb)
+
+
+class DriverPool:
+    """
+    Pool Chrome driver dengan ukuran tetap. Driver dibuat malas (lazy) saat
+    dibutuhkan, dipinjamkan lewat lease(), dan dibuang kalau tidak sehat.
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, factory=None, memory_mb=DRIVER_MEMORY_MB,
+                 max_uses=DRIVER_MAX_USES, max_age=DRIVER_MAX_AGE, drivers=None):
+        self.size = effective_pool_size(size, memory_mb)
+        if self.size < size:
+            print(f"[INFO] Ukuran pool Chrome dibatasi {self.size} (memori tersedia terbatas).")
+        self.factory = factory or (lambda: _default_factory(memory_mb))
+        self.memory_mb = memory_mb
+        self.max_uses = max_uses
+        self.max_age = max_age
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._uses = {}
+        self._born = {}
+        self._all = []
+        # driver dari luar (misal dari pemanggil lama) tidak di-quit oleh pool
+        self._external = set()
+        for d in drivers or []:
+            self._external.add(id(d))
+            self._all.append(d)
+            self._uses[id(d)] = 0
+            self._born[id(d)] = time.monotonic()
+            self._idle.put(d)
+        self._closed = False
+
+    def _create(self):
+        driver = self.factory()
+        with self._lock:
+            self._all.append(driver)
+            self._uses[id(driver)] = 0
+            self._born[id(driver)] = time.monotonic()
+            self.created += 1
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._all:
+                self._all.remove(driver)
+            self._uses.pop(id(driver), None)
+            self._born.pop(id(driver), None)
+        if id(driver) in self._external:
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _is_healthy(self, driver):
+        try:
+            driver.execute_script("return 1")
+        except Exception:
+            return False
+        if self._uses.get(id(driver), 0) >= self.max_uses:
+            return False
+        if self.max_age and id(driver) not in self._external \
+                and time.monotonic() - self._born.get(id(driver), 0) > self.max_age:
+            return False
+        rss = driver_rss_mb(driver)
+        if rss is not None and self.memory_mb and rss > self.memory_mb:
+            print(f"[INFO] Chrome memakai {rss} MB (> {self.memory_mb} MB), didaur ulang.")
+            return False
+        return True
+
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Meminjam satu driver. Kalau blok di dalamnya melempar exception
+        (crash, timeout), driver dianggap rusak dan diganti yang baru.
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool sudah ditutup")
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Tidak ada Chrome driver yang bebas")
+        driver = None
+        healthy = False
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._create()
+            self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+            yield driver
+            healthy = True
+        finally:
+            if driver is not None:
+                if healthy and not self._closed and self._is_healthy(driver):
+                    self._idle.put(driver)
+                else:
+                    self._discard(driver)
+            self._slots.release()
+
+    def maintain(self, clear_state=False):
+        """
+        Periksa driver yang sedang idle: yang tidak sehat/terlalu tua dibuang,
+        sisanya (kalau clear_state) dibersihkan cookie & storage-nya. Driver
+        yang sedang dipinjam tidak disentuh; tiap driver diperiksa sambil
+        memegang satu slot supaya jumlah Chrome tidak melebihi ukuran pool.
+        """
+        from browser_profile import clear_session_state
+
+        for _ in range(self._idle.qsize()):
+            if self._closed or not self._slots.acquire(blocking=False):
+                return
+            try:
+                try:
+                    driver = self._idle.get_nowait()
+                except queue.Empty:
+                    return
+                ok = self._is_healthy(driver) and (not clear_state or clear_session_state(driver))
+                if ok:
+                    self._idle.put(driver)
+                else:
+                    self._discard(driver)
+            finally:
+                self._slots.release()
+
+    def warm(self, count):
+        """Pastikan minimal `count` driver (maks. ukuran pool) sudah hidup."""
+        while not self._closed and len(self._all) < min(count, self.size):
+            if not self._slots.acquire(blocking=False):
+                return
+            try:
+                self._idle.put(self._create())
+            except Exception as e:
+                print(f"[WARNING] Gagal menyiapkan Chrome: {e}")
+                return
+            finally:
+                self._slots.release()
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            drivers = list(self._all)
+        for d in drivers:
+            self._discard(d)
+        if drivers:
+            print("[INFO] Chrome driver ditutup.")
@@ -0,0 +1,275 @@
+# fast_model.py
+# Jalur inferensi cepat: pipeline TF-IDF + CalibratedClassifierCV(LinearSVC)
+# hasil train_model.py "didistilasi" menjadi satu vektor bobot (rata-rata
+# koefisien SVM tiap fold, digabung dengan idf) + ambang keputusan + kurva
+# kalibrasi gabungan, disimpan sebagai .npz kecil tanpa pickle. Prediksi cukup
+# tokenisasi + satu dot product sparse per artikel.
+#
+#   python fast_model.py model_berita_svm2.pkl [contoh.csv]   -> model_berita_svm2.npz
+import os
+import re
+import sys
+from collections import Counter
+
+import numpy as np
+
+FAST_MODEL_FORMAT = 1
+# kurva kalibrasi gabungan dievaluasi di grid skor keputusan ini
+CALIBRATION_GRID = np.linspace(-8.0, 8.0, 1601)
+# koefisien/kalibrator fold dirata-rata, jadi fast model hanya mendekati pipeline
+# asli; distil() dengan holdout_texts menolak ekspor di bawah batas ini
+MIN_AGREEMENT = 0.995
+MAX_PROBA_DIFF = 0.05
+
+
+def fast_model_path(pkl_path):
+    """model_berita_svm2.pkl -> model_berita_svm2.npz"""
+    return os.path.splitext(pkl_path)[0] + ".npz"
+
+
+def _split_pipeline(pipeline):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.pipeline import Pipeline
+    from text_preprocessor import TextPreprocessor
+
+    if not isinstance(pipeline, Pipeline):
+        raise ValueError("model bukan sklearn Pipeline")
+    steps = [est for _, est in pipeline.steps]
+    clean = False
+    while steps and isinstance(steps[0], TextPreprocessor):
+        if steps[0]._options() is not None:
+            raise ValueError("normalisasi per token TextPreprocessor belum didukung fast model")
+        clean = True
+        steps = steps[1:]
+    if len(steps) != 2 or not isinstance(steps[0], TfidfVectorizer):
+        raise ValueError(f"pipeline tidak didukung: {[name for name, _ in pipeline.steps]}")
+    return clean, steps[0], steps[1]
+
+
+def _check_vectorizer(vec):
+    unsupported = {
+        "analyzer": vec.analyzer != "word", "tokenizer": vec.tokenizer is not None,
+        "preprocessor": vec.preprocessor is not None, "stop_words": vec.stop_words is not None,
+        "strip_accents": vec.strip_accents is not None, "norm": vec.norm not in ("l2", None),
+        "use_idf": not vec.use_idf,
+    }
+    bad = [k for k, v in unsupported.items() if v]
+    if bad:
+        raise ValueError(f"opsi TfidfVectorizer belum didukung fast model: {', '.join(bad)}")
+
+
+def _linear_parts(clf):
+    """(w, b, calibrators) dari CalibratedClassifierCV / model linear biasa."""
+    folds = getattr(clf, "calibrated_classifiers_", None)
+    if folds is None:
+        coef = np.asarray(clf.coef_, dtype=np.float64)
+        if coef.shape[0] != 1:
+            raise ValueError("hanya klasifikasi biner yang didukung")
+        return coef[0], float(np.ravel(clf.intercept_)[0]), []
+    coefs, intercepts, calibrators = [], [], []
+    for fold in folds:
+        est = fold.estimator
+        if not hasattr(est, "coef_") or np.asarray(est.coef_).shape[0] != 1:
+            raise ValueError("hanya estimator linear biner yang didukung")
+        coefs.append(np.asarray(est.coef_, dtype=np.float64)[0])
+        intercepts.append(float(np.ravel(est.intercept_)[0]))
+        calibrators.append(fold.calibrators[0])
+    return np.mean(coefs, axis=0), float(np.mean(intercepts)), calibrators
+
+
+def agreement(pipeline, fast, texts):
+    """Kecocokan fast model dengan pipeline asli: fraksi label sama dan selisih P(positif) terbesar."""
+    texts = list(texts)
+    agree = float(np.mean(np.asarray(pipeline.predict(texts)) == np.asarray(fast.predict(texts))))
+    proba_diff = None
+    if hasattr(pipeline, "predict_proba"):
+        proba_diff = float(np.max(np.abs(pipeline.predict_proba(texts)[:, 1] - fast.predict_proba(texts)[:, 1])))
+    return {"n": len(texts), "agreement": agree, "max_proba_diff": proba_diff}
+
+
+def distil(pipeline, out_path, sample_texts=None, holdout_texts=None, min_agreement=MIN_AGREEMENT,
+           max_proba_diff=MAX_PROBA_DIFF):
+    """
+    Ekspor `pipeline` ke .npz. Kalau `sample_texts` diberikan, ambang keputusan
+    disetel supaya label sama dengan pipeline asli sebanyak mungkin di sampel
+    tersebut; kalau tidak, ambang = titik kurva kalibrasi gabungan melewati 0.5.
+    Kalau `holdout_texts` (teks yang tidak dipakai menyetel ambang) diberikan,
+    file hanya ditulis bila kecocokan label >= `min_agreement` dan selisih
+    probabilitas <= `max_proba_diff`; selain itu ValueError.
+    """
+    clean, vec, clf = _split_pipeline(pipeline)
+    _check_vectorizer(vec)
+    classes = np.asarray(clf.classes_)
+    if len(classes) != 2:
+        raise ValueError("hanya klasifikasi biner yang didukung")
+    w, b, calibrators = _linear_parts(clf)
+
+    if calibrators:
+        curve = np.mean([cal.predict(CALIBRATION_GRID) for cal in calibrators], axis=0)
+    else:
+        curve = 1.0 / (1.0 + np.exp(-CALIBRATION_GRID))
+    above = np.nonzero(curve >= 0.5)[0]
+    threshold = float(CALIBRATION_GRID[above[0]]) if len(above) else 0.0
+
+    terms = np.array(sorted(vec.vocabulary_, key=vec.vocabulary_.get), dtype=object).astype(str)
+    model = FastLinearModel(terms=terms, idf=vec.idf_, weights=w, bias=b, threshold=threshold,
+                            grid=CALIBRATION_GRID, curve=curve, classes=classes,
+                            ngram_range=vec.ngram_range, token_pattern=vec.token_pattern,
+                            lowercase=vec.lowercase, sublinear_tf=vec.sublinear_tf, binary=vec.binary,
+                            norm=vec.norm or "", clean=clean)
+    if sample_texts:
+        model.threshold = _tune_threshold(model.decision_function(sample_texts),
+                                          np.asarray(pipeline.predict(sample_texts)) == classes[1],
+                                          threshold)
+    model.validation = None
+    if holdout_texts:
+        model.validation = check = agreement(pipeline, model, holdout_texts)
+        too_far = check["max_proba_diff"] is not None and check["max_proba_diff"] > max_proba_diff
+        if check["agreement"] < min_agreement or too_far:
+            diff = "-" if check["max_proba_diff"] is None else f"{check['max_proba_diff']:.3f}"
+            raise ValueError(f"fast model hanya cocok {check['agreement']:.2%} label (min {min_agreement:.2%}), "
+                             f"selisih probabilitas maks {diff} (batas {max_proba_diff}) "
+                             f"pada {check['n']} teks held-out")
+    model.save(out_path)
+    return model
+
+
+def _tune_threshold(scores, positive, default):
+    # ambang di antara dua skor berurutan yang memaksimalkan kecocokan label
+    order = np.argsort(scores)
+    s, pos = scores[order], positive[order]
+    # kandidat ambang i: semua skor < s[i] negatif, sisanya positif
+    agree = (np.concatenate([[0], np.cumsum(~pos)]) +
+             np.concatenate([np.cumsum(pos[::-1])[::-1], [0]]))
+    best = int(np.argmax(agree))
+    if best == 0:
+        return min(default, float(s[0]))
+    if best == len(s):
+        return max(default, float(s[-1]) + 1e-9)
+    return float((s[best - 1] + s[best]) / 2)
+
+
+class FastLinearModel:
+    """Scorer linear hasil distil(); API mirip estimator sklearn (predict/predict_proba/decision_function)."""
+
+    def __init__(self, terms, idf, weights, bias, threshold, grid, curve, classes, ngram_range=(1, 1),
+                 token_pattern=r"(?u)\b\w\w+\b", lowercase=True, sublinear_tf=False, binary=False,
+                 norm="l2", clean=False):
+        self.terms = terms
+        self.vocabulary = {t: i for i, t in enumerate(terms.tolist())}
+        self.idf = np.asarray(idf, dtype=np.float64)
+        # bobot sudah dikali idf: skor = sum(tf * w_idf) / ||tf * idf|| + bias
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.w_idf = self.weights * self.idf
+        self.bias = float(bias)
+        self.threshold = float(threshold)
+        self.grid = np.asarray(grid, dtype=np.float64)
+        self.curve = np.asarray(curve, dtype=np.float64)
+        self.classes_ = np.asarray(classes)
+        self.ngram_range = tuple(int(n) for n in ngram_range)
+        self.token_pattern = str(token_pattern)
+        self._token_re = re.compile(self.token_pattern)
+        self.lowercase = bool(lowercase)
+        self.sublinear_tf = bool(sublinear_tf)
+        self.binary = bool(binary)
+        self.norm = str(norm)
+        self.clean = bool(clean)
+
+    # --- tokenisasi (sama dengan analyzer "word" TfidfVectorizer) ---
+    def _analyze(self, text):
+        if self.clean:
+            from text_preprocessor import clean_text_simple
+            text = clean_text_simple(text)
+        if self.lowercase:
+            text = text.lower()
+        tokens = self._token_re.findall(text)
+        lo, hi = self.ngram_range
+        if hi == 1:
+            return tokens
+        grams = list(tokens) if lo == 1 else []
+        for n in range(max(lo, 2), hi + 1):
+            grams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return grams
+
+    def _score(self, text):
+        vocab = self.vocabulary
+        counts = Counter(i for i in map(vocab.get, self._analyze(str(text or ""))) if i is not None)
+        if not counts:
+            return self.bias
+        idx = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+        tf = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+        if self.binary:
+            tf[:] = 1.0
+        elif self.sublinear_tf:
+            tf = 1.0 + np.log(tf)
+        dot = float(tf @ self.w_idf[idx])
+        if self.norm == "l2":
+            dot /= float(np.sqrt(np.sum((tf * self.idf[idx]) ** 2)))
+        elif self.norm == "l1":
+            dot /= float(np.sum(np.abs(tf * self.idf[idx])))
+        return dot + self.bias
+
+    def decision_function(self, texts):
+        return np.fromiter((self._score(t) for t in texts), dtype=np.float64)
+
+    def predict_proba(self, texts):
+        p = np.interp(self.decision_function(texts), self.grid, self.curve)
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, texts):
+        return np.where(self.decision_function(texts) >= self.threshold, self.classes_[1], self.classes_[0])
+
+    def predict_with_proba(self, texts):
+        """(label, P(kelas positif)) dari satu kali scoring."""
+        scores = self.decision_function(texts)
+        labels = np.where(scores >= self.threshold, self.classes_[1], self.classes_[0])
+        return labels, np.interp(scores, self.grid, self.curve)
+
+    # --- penyimpanan ---
+    def save(self, path):
+        np.savez_compressed(
+            path, format=np.array(FAST_MODEL_FORMAT), terms=self.terms, idf=self.idf, weights=self.weights,
+            bias=np.array(self.bias), threshold=np.array(self.threshold), grid=self.grid, curve=self.curve,
+            classes=np.asarray(self.classes_.tolist()), ngram_range=np.array(self.ngram_range), token_pattern=np.array(self.token_pattern),
+            flags=np.array([self.lowercase, self.sublinear_tf, self.binary, self.clean]), norm=np.array(self.norm))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["format"]) != FAST_MODEL_FORMAT:
+                raise ValueError(f"format fast model tidak dikenal: {int(data['format'])}")
+            lowercase, sublinear_tf, binary, clean = (bool(v) for v in data["flags"])
+            return cls(terms=data["terms"], idf=data["idf"], weights=data["weights"], bias=float(data["bias"]),
+                       threshold=float(data["threshold"]), grid=data["grid"], curve=data["curve"],
+                       classes=data["classes"], ngram_range=tuple(data["ngram_range"]),
+                       token_pattern=str(data["token_pattern"]), lowercase=lowercase, sublinear_tf=sublinear_tf,
+                       binary=binary, norm=str(data["norm"]), clean=clean)
+
+
+if __name__ == "__main__":
+    import joblib
+    import pandas as pd
+
+    if len(sys.argv) < 2:
+        print("Usage: python fast_model.py model.pkl [contoh.csv] [kolom_teks]")
+        sys.exit(1)
+    pkl = sys.argv[1]
+    sample = holdout = None
+    if len(sys.argv) > 2:
+        col = sys.argv[3] if len(sys.argv) > 3 else "isi"
+        texts = pd.read_csv(sys.argv[2])[col].dropna().astype(str).tolist()
+        # separuh untuk menyetel ambang, separuh lagi untuk mengukur kecocokan
+        sample, holdout = texts[:len(texts) // 2], texts[len(texts) // 2:]
+    else:
+        print("[WARNING] Tanpa contoh teks: kecocokan dengan model asli tidak diukur")
+    out = fast_model_path(pkl)
+    try:
+        fast = distil(joblib.load(pkl), out, sample, holdout)
+    except ValueError as e:
+        print(f"Fast model tidak dibuat: {e}")
+        sys.exit(1)
+    print(f"Fast model disimpan ke {out} ({len(fast.terms)} term, ambang {fast.threshold:.4f}, "
+          f"{os.path.getsize(out) / 1024:.0f} KB)")
+    if fast.validation:
+        print(f"Kecocokan held-out: {fast.validation['agreement']:.2%} label, "
+              f"selisih probabilitas maks {fast.validation['max_proba_diff']:.3f}")
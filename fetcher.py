@@ -0,0 +1,375 @@
+# fetcher.py
+# Lapisan fetch yang dipakai semua parser: HTTP biasa (keep-alive, gzip/brotli)
+# secara default, Selenium hanya untuk portal yang memang butuh browser.
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from browser_profile import apply_resource_policy, transfer_stats
+from driver_pool import DriverPool, DRIVER_POOL_SIZE
+from metrics import (BROWSER_TRANSFER_BYTES, FETCH_REQUESTS, FETCH_RETRIES, FETCHED_BYTES, STAGE_SECONDS, cache_hit,
+                     log_event, portal_label)
+from portals import PORTALS, host_limits, portal_for_url
+from rate_limiter import HostRateLimiter, parse_retry_after
+
+try:
+    import brotli  # noqa: F401  (urllib3 otomatis decode "br" kalau modul ini ada)
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+DEFAULT_HEADERS = {
+    "User-Agent": ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "id-ID,id;q=0.9,en;q=0.8",
+    "Accept-Encoding": _ACCEPT_ENCODING,
+}
+
+# Mode fetch per portal:
+#   "http"    -> hanya HTTP biasa
+#   "auto"    -> HTTP dulu, fallback ke browser kalau gagal / halaman kosong
+#   "browser" -> selalu lewat Chrome (untuk halaman yang dirender JavaScript)
+PORTAL_FETCH_MODE = {
+    "detik": "auto",
+    "rmol": "auto",
+    "antara": "auto",
+    "lampost": "auto",
+    "radarlampung": "auto",
+}
+
+# Halaman artikel/listing yang lebih kecil dari ini hampir pasti cangkang JS kosong
+_MIN_HTML_LENGTH = 2048
+# Penanda halaman tantangan anti-bot yang dikirim dengan status 200 (dicari di awal HTML, huruf kecil)
+_BLOCK_MARKERS = ("<title>just a moment", "attention required! | cloudflare", "cf-browser-verification",
+                  "<title>ddos-guard")
+_BLOCK_SCAN_CHARS = 4096
+# Batas waktu menunggu DOM / selector siap di browser (detik)
+READY_TIMEOUT = 10
+
+
+class HttpFetcher:
+    """
+    Fetcher HTTP dengan satu requests.Session (connection pool keep-alive).
+    Jeda antar request diatur HostRateLimiter, bukan sleep tetap. Kalau
+    `cache` (article_cache.ArticleCache) diberikan, request dikirim sebagai
+    conditional request (ETag / Last-Modified) dan 304 dilayani dari cache.
+    """
+
+    def __init__(self, pool_size=20, timeout=15, retries=3, headers=None, limiter=None, cache=None):
+        self.timeout = timeout
+        self.retries = retries
+        self.limiter = limiter or HostRateLimiter(host_limits())
+        self.cache = cache
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url):
+        """Mengembalikan HTML halaman, atau None kalau gagal setelah semua percobaan."""
+        return self.fetch(url)[0]
+
+    def fetch(self, url):
+        """
+        (html atau None, status HTTP respons terakhir); status None kalau tidak ada
+        respons sama sekali (error koneksi/timeout). 304 dari cache -> (html cache, 304).
+        """
+        t_start = time.perf_counter()
+        html, outcome, attempts, status = self._get(url)
+        _record_fetch(url, "http", html, outcome, attempts, time.perf_counter() - t_start)
+        return html, status
+
+    def _get(self, url):
+        # (html atau None, outcome, jumlah percobaan, status HTTP terakhir atau None)
+        cached = self.cache.validators(url) if self.cache is not None else None
+        headers = {}
+        if cached is not None:
+            if cached[1]:
+                headers["If-None-Match"] = cached[1]
+            if cached[2]:
+                headers["If-Modified-Since"] = cached[2]
+        status = None
+        for i in range(self.retries):
+            # limiter yang menunggu: setelah 429/5xx/error, laju host ini otomatis diturunkan
+            _acquire(self.limiter, url)
+            t0 = time.monotonic()
+            try:
+                resp = self.session.get(url, timeout=self.timeout, headers=headers)
+            except requests.RequestException as e:
+                self.limiter.feedback(url, None)
+                print(f"[WARN] get {url} failed (attempt {i+1}/{self.retries}): {e}")
+                continue
+            status = resp.status_code
+            self.limiter.feedback(url, resp.status_code, time.monotonic() - t0,
+                                  parse_retry_after(resp.headers.get("Retry-After")))
+            if cached is not None:
+                cache_hit("page", resp.status_code == 304)
+            if resp.status_code == 304 and cached is not None:
+                self.cache.touch(url)
+                return cached[0], "not_modified", i + 1, 304
+            if resp.status_code == 200:
+                if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
+                    resp.encoding = resp.apparent_encoding
+                if self.cache is not None:
+                    self.cache.put_page(url, resp.text, resp.headers.get("ETag"),
+                                        resp.headers.get("Last-Modified"))
+                FETCHED_BYTES.inc(len(resp.content), portal=portal_label(url), via="http")
+                return resp.text, "ok", i + 1, 200
+            if resp.status_code not in (429, 500, 502, 503, 504):
+                print(f"[WARN] get {url} status {resp.status_code}")
+                return None, f"status_{resp.status_code}", i + 1, resp.status_code
+            print(f"[WARN] get {url} status {resp.status_code} (attempt {i+1}/{self.retries})")
+        return None, "failed", self.retries, status
+
+    def close(self):
+        self.session.close()
+
+
+class BrowserFetcher:
+    """
+    Fetcher lewat Selenium. Setiap get() meminjam satu driver dari DriverPool,
+    jadi beberapa thread bisa memakai beberapa Chrome sekaligus. Setelah
+    navigasi, fetcher menunggu DOM siap (dan `ready_selector` kalau diberikan)
+    alih-alih tidur dengan durasi tetap. Gambar, media, font dan domain iklan
+    diblokir sesuai kebijakan portal di browser_profile.py.
+    """
+
+    def __init__(self, driver=None, driver_factory=None, retries=3, pool=None,
+                 pool_size=DRIVER_POOL_SIZE, limiter=None, ready_timeout=READY_TIMEOUT):
+        self.retries = retries
+        self.limiter = limiter or HostRateLimiter(host_limits())
+        self.ready_timeout = ready_timeout
+        self.cache = None  # browser tidak bisa conditional request; cache level artikel tetap jalan
+        self._owns_pool = pool is None
+        if pool is None:
+            # driver dari pemanggil lama dipakai apa adanya (pool berisi satu driver)
+            pool = DriverPool(size=1 if driver is not None else pool_size, factory=driver_factory,
+                              drivers=[driver] if driver is not None else None)
+        self.pool = pool
+
+    def get(self, url, ready_selector=None):
+        t_start = time.perf_counter()
+        for i in range(self.retries):
+            _acquire(self.limiter, url)
+            t0 = time.monotonic()
+            try:
+                with self.pool.lease() as driver:
+                    html = self._navigate(driver, url, ready_selector)
+                self.limiter.feedback(url, 200, time.monotonic() - t0)
+                FETCHED_BYTES.inc(len(html.encode("utf-8")), portal=portal_label(url), via="browser")
+                _record_fetch(url, "browser", html, "ok", i + 1, time.perf_counter() - t_start)
+                return html
+            except Exception as e:
+                # driver yang gagal sudah dibuang oleh pool; percobaan berikutnya pakai driver baru
+                self.limiter.feedback(url, None)
+                print(f"[WARN] get {url} failed (attempt {i+1}/{self.retries}): {e}")
+        _record_fetch(url, "browser", None, "failed", self.retries, time.perf_counter() - t_start)
+        return None
+
+    def _navigate(self, driver, url, ready_selector):
+        # daftar blokir resource sesuai portal (browser_profile.py), lalu catat waktu
+        # navigasi dan byte yang benar-benar ditransfer Chrome untuk halaman ini
+        portal = portal_label(url)
+        apply_resource_policy(driver, portal_for_url(url))
+        t0 = time.perf_counter()
+        driver.get(url)
+        _wait_ready(driver, ready_selector, self.ready_timeout)
+        seconds = time.perf_counter() - t0
+        html = driver.page_source
+        nbytes, resources = transfer_stats(driver)
+        STAGE_SECONDS.observe(seconds, portal=portal, stage="navigate")
+        if nbytes is not None:
+            BROWSER_TRANSFER_BYTES.inc(nbytes, portal=portal)
+        log_event("navigate", portal=portal, url=url, seconds=round(seconds, 4),
+                  transfer_bytes=nbytes, resources=resources)
+        return html
+
+    def for_selector(self, ready_selector, cache=None):
+        """Tampilan fetcher ini yang selalu menunggu `ready_selector`."""
+        return _SelectorBrowserFetcher(self, ready_selector, cache)
+
+    def close(self):
+        if self._owns_pool:
+            self.pool.close()
+        else:
+            # pool bersama (browser_session.py) tetap hidup; cukup bersihkan sesi untuk job berikutnya
+            self.pool.maintain(clear_state=True)
+
+
+class _SelectorBrowserFetcher:
+    def __init__(self, browser, ready_selector, cache=None):
+        self.browser = browser
+        self.ready_selector = ready_selector
+        self.cache = cache
+
+    def get(self, url):
+        return self.browser.get(url, ready_selector=self.ready_selector)
+
+    def close(self):
+        pass
+
+
+def _acquire(limiter, url):
+    # waktu tunggu rate limiter dicatat terpisah dari fetch ("rate_wait")
+    t0 = time.perf_counter()
+    limiter.acquire(url)
+    STAGE_SECONDS.observe(time.perf_counter() - t0, portal=portal_label(url), stage="rate_wait")
+
+
+def _record_fetch(url, via, html, outcome, attempts, seconds):
+    """Metrik + log terstruktur satu get() (semua percobaan, termasuk jeda rate limiter)."""
+    portal = portal_label(url)
+    STAGE_SECONDS.observe(seconds, portal=portal, stage="fetch")
+    FETCH_REQUESTS.inc(portal=portal, via=via, outcome=outcome)
+    if attempts > 1:
+        FETCH_RETRIES.inc(attempts - 1, portal=portal, via=via)
+    log_event("fetch", portal=portal, via=via, url=url, outcome=outcome, attempts=attempts,
+              seconds=round(seconds, 4), chars=len(html) if html is not None else 0)
+
+
+def _wait_ready(driver, selector=None, timeout=READY_TIMEOUT):
+    """Tunggu document.readyState lalu (opsional) elemen `selector`; timeout selector tidak fatal."""
+    WebDriverWait(driver, timeout).until(
+        lambda d: d.execute_script("return document.readyState") in ("interactive", "complete"))
+    if selector:
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+        except TimeoutException:
+            pass
+
+
+def _needs_browser(html, status):
+    """
+    Apakah hasil HTTP perlu diulang lewat browser: 200 yang terlalu kecil (cangkang JS)
+    atau berisi halaman tantangan anti-bot, dan request yang tidak mendapat respons final
+    (error koneksi / 429 / 5xx sampai percobaan habis). Status lain (404, 410, 403, ...)
+    adalah jawaban server yang sama saja lewat browser.
+    """
+    if status is None or status == 429 or status >= 500:
+        return True
+    if html is None or status not in (200, 304):
+        return False
+    if len(html) < _MIN_HTML_LENGTH:
+        return True
+    head = html[:_BLOCK_SCAN_CHARS].lower()
+    return any(marker in head for marker in _BLOCK_MARKERS)
+
+
+class AutoFetcher:
+    """HTTP dulu; kalau respons 200-nya terlalu kecil / diblokir atau tidak ada respons, ulangi lewat browser."""
+
+    def __init__(self, http, browser):
+        self.http = http
+        self.browser = browser
+        self.cache = http.cache
+
+    def get(self, url):
+        html, status = self.http.fetch(url)
+        if not _needs_browser(html, status):
+            return html
+        print(f"[INFO] Fallback ke browser untuk {url} (status {status})")
+        return self.browser.get(url)
+
+    def close(self):
+        pass
+
+
+class FetcherSet:
+    """
+    Menyediakan fetcher untuk tiap portal dari satu HttpFetcher bersama.
+    Chrome hanya dinyalakan kalau ada portal yang benar-benar membutuhkannya.
+    """
+
+    def __init__(self, modes=None, driver=None, driver_factory=None, http=None,
+                 browser_pool_size=DRIVER_POOL_SIZE, cache=None, browser_pool=None):
+        self.modes = dict(PORTAL_FETCH_MODE)
+        if modes:
+            self.modes.update(modes)
+        # satu limiter bersama supaya HTTP dan browser menghormati batas host yang sama
+        self.limiter = HostRateLimiter(host_limits())
+        self.cache = cache
+        self.http = http or HttpFetcher(limiter=self.limiter, cache=cache)
+        # browser_pool: DriverPool jangka panjang (browser_session.SESSIONS) yang tidak ditutup di close()
+        self.browser = BrowserFetcher(driver=driver, driver_factory=driver_factory, pool=browser_pool,
+                                      pool_size=browser_pool_size, limiter=self.limiter)
+
+    def for_portal(self, portal):
+        mode = self.modes.get(portal, "auto")
+        if mode == "http":
+            return self.http
+        browser = self.browser.for_selector(PORTALS.get(portal, {}).get("ready_selector"), self.cache)
+        if mode == "browser":
+            return browser
+        return AutoFetcher(self.http, browser)
+
+    def close(self):
+        self.http.close()
+        self.browser.close()
+        if self.cache is not None:
+            self.cache.evict()
+
+
+def open_fetcher(obj, portal, driver_factory=None):
+    """
+    Normalisasi argumen pertama parser menjadi fetcher.
+    Menerima fetcher, Selenium WebDriver (kompatibel dengan pemanggilan lama),
+    atau None. Mengembalikan (fetcher, owned); kalau owned True, pemanggil
+    wajib memanggil close() setelah selesai.
+    """
+    if obj is None:
+        fs = FetcherSet(driver_factory=driver_factory)
+        return _OwnedFetcher(fs, fs.for_portal(portal)), True
+    if hasattr(obj, "page_source"):
+        return BrowserFetcher(driver=obj), False
+    return obj, False
+
+
+class _OwnedFetcher:
+    def __init__(self, fetcher_set, fetcher):
+        self._set = fetcher_set
+        self._fetcher = fetcher
+        self.cache = fetcher_set.cache
+
+    def get(self, url):
+        return self._fetcher.get(url)
+
+    def close(self):
+        self._set.close()
+
+
+def fetch_article(fetcher, title, link, parse):
+    """
+    Ambil dan ekstrak satu artikel memakai parse(html, title, link).
+    Kalau fetcher punya cache: record yang masih segar dipakai tanpa request,
+    dan HTML yang tidak berubah (termasuk 304) tidak diekstrak ulang.
+    """
+    cache = getattr(fetcher, "cache", None)
+    if cache is not None:
+        record = cache.fresh_record(link)
+        cache_hit("record", record is not None)
+        if record is not None:
+            return record
+    html = fetcher.get(link)
+    if html is None:
+        return None
+    if cache is not None:
+        record = cache.record_for_html(link, html)
+        cache_hit("html", record is not None)
+        if record is not None:
+            cache.put_record(link, record, html)
+            return record
+    record = parse(html, title, link)
+    if cache is not None and record is not None:
+        cache.put_record(link, record, html)
+    return record
@@ -0,0 +1,105 @@
+# html_parsing.py
+# Lapisan parsing HTML: memilih backend tercepat yang tersedia (lxml, fallback
+# ke html.parser bawaan Python) dan mendukung parsing sebagian (hanya subtree
+# yang dibutuhkan) lewat SoupStrainer.
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    DEFAULT_BACKEND = "lxml"
+except ImportError:
+    DEFAULT_BACKEND = "html.parser"
+
+# Bisa diganti saat runtime (misal dari benchmark) lewat set_backend() / set_partial_parsing()
+_settings = {"backend": DEFAULT_BACKEND, "partial": True}
+
+
+def set_backend(name):
+    """Pilih backend BeautifulSoup: "lxml", "html.parser", atau "html5lib"."""
+    _settings["backend"] = name
+
+
+def get_backend():
+    return _settings["backend"]
+
+
+def set_partial_parsing(enabled):
+    """Matikan untuk selalu membangun DOM penuh (berguna untuk membandingkan hasil)."""
+    _settings["partial"] = bool(enabled)
+
+
+def _parse_rule(selector):
+    # "div.entry-content" -> ("div", {"entry-content"}); ".date" -> (None, {"date"})
+    tag, *classes = selector.strip().split(".")
+    return (tag or None, frozenset(classes))
+
+
+class _SelectorStrainer(SoupStrainer):
+    """
+    SoupStrainer untuk beberapa selector sederhana sekaligus ("tag", ".cls",
+    "tag.cls"). Elemen top-level yang cocok di-parse beserta seluruh isinya;
+    sisanya dilewati. Mendukung API bs4 lama (search_tag) dan baru
+    (allow_tag_creation).
+    """
+
+    def __init__(self, selectors):
+        super().__init__()
+        self.selectors = tuple(selectors)
+        self.rules = [_parse_rule(s) for s in selectors]
+
+    @property
+    def excludes_everything(self):
+        return False
+
+    def _matches(self, name, attrs):
+        if attrs is None:
+            attrs = {}
+        elif not isinstance(attrs, dict):
+            attrs = dict(attrs)
+        cls = attrs.get("class") or ""
+        classes = set(cls.split() if isinstance(cls, str) else cls)
+        for tag, wanted in self.rules:
+            if (tag is None or tag == name) and wanted <= classes:
+                return True
+        return False
+
+    # bs4 >= 4.13
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self._matches(name, attrs)
+
+    def allow_string_creation(self, string):
+        return False
+
+    # bs4 < 4.13
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if isinstance(markup_name, str) and self._matches(markup_name, markup_attrs):
+            return markup_name
+        return None
+
+    def search(self, markup):
+        return None if isinstance(markup, str) else super().search(markup)
+
+    def __repr__(self):
+        return f"<_SelectorStrainer {', '.join(self.selectors)}>"
+
+
+_strainers = {}
+
+
+def only(*selectors):
+    """Strainer (di-cache) yang hanya mem-parse elemen yang cocok dengan `selectors`."""
+    key = tuple(selectors)
+    strainer = _strainers.get(key)
+    if strainer is None:
+        strainer = _strainers[key] = _SelectorStrainer(selectors)
+    return strainer
+
+
+def make_soup(html, parse_only=None):
+    """
+    BeautifulSoup dengan backend terpilih. `parse_only` (hasil only(...))
+    membatasi parsing ke subtree yang dibutuhkan saja.
+    """
+    if not _settings["partial"]:
+        parse_only = None
+    return BeautifulSoup(html, _settings["backend"], parse_only=parse_only)
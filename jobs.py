@@ -0,0 +1,217 @@
+# jobs.py
+# Antrian job di background untuk app Flask: submit langsung mengembalikan id
+# job, sejumlah kecil worker thread menjalankan scrape_dan_klasifikasi, dan
+# progress per portal + hasil sementara bisa di-poll atau di-stream (SSE).
+# Permintaan identik (rentang tanggal + max_articles sama) yang masih antri
+# atau berjalan digabung ke job yang sudah ada.
+import json
+import queue
+import threading
+import time
+import traceback
+import uuid
+from contextlib import nullcontext
+
+from metrics import log_event, profiled
+
+# satu worker: dua job paralel berarti dua set Chrome berebut RAM/CPU
+JOB_WORKERS = 1
+JOB_QUEUE_SIZE = 8
+# job selesai yang disimpan untuk ditampilkan/di-poll
+JOB_HISTORY = 20
+# panjang ringkasan isi artikel di hasil job
+ISI_PREVIEW_CHARS = 200
+
+
+class QueueFull(Exception):
+    """Antrian job penuh; klien sebaiknya mencoba lagi nanti."""
+
+
+def _preview(record):
+    item = dict(record)
+    isi = str(item.get("isi") or "")
+    item["isi"] = (isi[:ISI_PREVIEW_CHARS] + '...') if len(isi) > ISI_PREVIEW_CHARS else isi
+    return item
+
+
+class Job:
+    """Satu permintaan scraping beserta progress, event dan hasilnya."""
+
+    def __init__(self, key, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.params = params
+        self.status = "queued"  # queued -> running -> done | error
+        self.stage = "antri"
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.portals = {}  # nama portal -> jumlah artikel sejauh ini
+        self.partial = []  # artikel yang sudah diklasifikasi (judul/link/tanggal/portal/label)
+        self.hasil_all = []
+        self.hasil_ekonomi = []
+        self.requesters = 1
+        self.profile_path = None
+        self._events = []
+        self._cond = threading.Condition()
+
+    @property
+    def event_count(self):
+        """Jumlah event sejauh ini (untuk melanjutkan stream dari posisi halaman)."""
+        return len(self._events)
+
+    @property
+    def active(self):
+        return self.status in ("queued", "running")
+
+    def _emit(self, event, status=None):
+        with self._cond:
+            # status diganti bersamaan dengan event-nya supaya stream tidak
+            # berhenti sebelum event status akhir terkirim
+            if status is not None:
+                self.status = status
+            event = dict(event, seq=len(self._events))
+            self._events.append(event)
+            self._cond.notify_all()
+
+    def progress(self, event):
+        """Callback progress dari scrape_dan_klasifikasi."""
+        if event.get("type") == "article":
+            self.portals[event["portal"]] = self.portals.get(event["portal"], 0) + 1
+            self.partial.append({k: event.get(k) for k in ("portal", "judul", "link", "tanggal", "label")})
+        elif event.get("type") == "stage":
+            self.stage = event["stage"]
+        self._emit(event)
+
+    def add_result(self, record):
+        """Sink pipeline: simpan ringkasan record (isi dipotong), tanpa menyimpan teks lengkap."""
+        item = _preview(record)
+        self.hasil_all.append(item)
+        if item.get("label") == 1:
+            self.hasil_ekonomi.append(item)
+
+    def events(self, since=0, timeout=15):
+        """Event dengan seq >= since; menunggu sampai `timeout` detik kalau belum ada yang baru."""
+        with self._cond:
+            if since >= len(self._events) and self.active:
+                self._cond.wait(timeout)
+            return self._events[since:]
+
+    def snapshot(self, include_results=False):
+        data = {
+            "id": self.id, "status": self.status, "stage": self.stage, "error": self.error,
+            "params": self.params, "portals": dict(self.portals), "found": len(self.partial),
+            "requesters": self.requesters, "created_at": self.created_at,
+            "started_at": self.started_at, "finished_at": self.finished_at, "profile": self.profile_path,
+        }
+        if include_results:
+            data["hasil_all"] = self.hasil_all
+            data["hasil_ekonomi"] = self.hasil_ekonomi
+        return data
+
+
+class JobQueue:
+    """Antrian terbatas dengan `workers` thread; job identik yang masih aktif digabung."""
+
+    def __init__(self, run=None, workers=JOB_WORKERS, maxsize=JOB_QUEUE_SIZE, history=JOB_HISTORY):
+        self._run = run or _run_scrape
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._active = {}  # key -> job yang masih queued/running
+        self._history = history
+        self._threads = []
+        for i in range(workers):
+            t = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, start_date=None, end_date=None, max_articles=5, profile=False):
+        """
+        Kembalikan Job (baru, atau yang sudah ada kalau permintaannya identik).
+        profile=True: job dijalankan di bawah profiler (metrics.profiled), path hasilnya di job.profile_path.
+        """
+        params = {"start_date": start_date or None, "end_date": end_date or None, "max_articles": int(max_articles),
+                  "profile": bool(profile)}
+        key = (params["start_date"], params["end_date"], params["max_articles"], params["profile"])
+        with self._lock:
+            job = self._active.get(key)
+            if job is not None:
+                job.requesters += 1
+                return job
+            job = Job(key, params)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFull(f"Antrian penuh ({self._queue.maxsize} job)")
+            self._jobs[job.id] = job
+            self._active[key] = job
+            self._trim()
+        job._emit({"type": "status", "status": job.status})
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _trim(self):
+        finished = [j for j in self._jobs.values() if not j.active]
+        for job in sorted(finished, key=lambda j: j.finished_at or 0)[:max(0, len(finished) - self._history)]:
+            del self._jobs[job.id]
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            job.stage = "crawl"
+            job.started_at = time.time()
+            job._emit({"type": "status", "status": "running"}, status="running")
+            status = "error"
+            prof = None
+            try:
+                with profiled(f"job-{job.id}") if job.params.get("profile") else nullcontext() as prof:
+                    self._run(job)
+                status = "done"
+            except Exception as e:
+                traceback.print_exc()
+                job.error = str(e)
+            finally:
+                if prof is not None:
+                    job.profile_path = prof["path"]
+                log_event("job", id=job.id, status=status, error=job.error, articles=len(job.partial),
+                          seconds=round(time.time() - job.started_at, 3), profile=job.profile_path)
+                job.stage = status
+                job.finished_at = time.time()
+                with self._lock:
+                    if self._active.get(job.key) is job:
+                        del self._active[job.key]
+                job._emit({"type": "status", "status": status, "error": job.error}, status=status)
+                with self._lock:
+                    self._trim()
+                self._queue.task_done()
+
+
+def _run_scrape(job):
+    from browser_session import SESSIONS
+    from scraper_all import scrape_dan_klasifikasi
+
+    p = job.params
+    print(f"[JOB {job.id}] start_date={p['start_date']}, end_date={p['end_date']}, max_articles={p['max_articles']}")
+    # hasil langsung masuk ke job lewat sink, tanpa DataFrame / to_dict di akhir;
+    # Chrome (kalau dibutuhkan) dipinjam dari sesi browser proses ini, bukan dinyalakan ulang
+    scrape_dan_klasifikasi(p["start_date"], p["end_date"], p["max_articles"],
+                           progress=job.progress, sinks=[job.add_result], collect=False,
+                           browser_pool=SESSIONS.pool())
+
+
+def sse_stream(job, since=0):
+    """Generator Server-Sent Events untuk satu job; selesai setelah event status akhir."""
+    while True:
+        events = job.events(since)
+        for event in events:
+            yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        since += len(events)
+        if not job.active and since >= job.event_count:
+            return
+        if not events:
+            yield ": keep-alive\n\n"
@@ -0,0 +1,144 @@
+# listing.py
+# Helper bersama untuk halaman listing: membaca tanggal dari entri listing
+# (sebelum artikel diambil), menyaring entri di luar rentang tanggal, dan
+# menentukan kapan paging boleh berhenti.
+import itertools
+import re
+from datetime import date, datetime, timedelta
+
+# Batas aman untuk mode "crawl sampai tanggal" (max_pages=None)
+UNBOUNDED_MAX_PAGES = 50
+
+BULAN = {
+    "januari": 1, "jan": 1, "january": 1,
+    "februari": 2, "pebruari": 2, "feb": 2, "february": 2,
+    "maret": 3, "mar": 3, "march": 3,
+    "april": 4, "apr": 4,
+    "mei": 5, "may": 5,
+    "juni": 6, "jun": 6, "june": 6,
+    "juli": 7, "jul": 7, "july": 7,
+    "agustus": 8, "agu": 8, "agt": 8, "ags": 8, "aug": 8, "august": 8,
+    "september": 9, "sep": 9, "sept": 9,
+    "oktober": 10, "okt": 10, "oct": 10, "october": 10,
+    "november": 11, "nopember": 11, "nov": 11,
+    "desember": 12, "des": 12, "dec": 12, "december": 12,
+}
+
+_ISO_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+_DMY_RE = re.compile(r"(\d{1,2})\s+([A-Za-z]+)\.?\s+(\d{4})")
+_SLASH_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+_RELATIVE_RE = re.compile(r"(\d+)\s+(detik|menit|jam|hari|minggu|bulan)\s+(?:yang\s+)?lalu", re.I)
+_RELATIVE_DAYS = {"detik": 0, "menit": 0, "jam": 0, "hari": 1, "minggu": 7, "bulan": 30}
+
+
+def parse_indonesian_date(text, today=None):
+    """
+    Tanggal dari teks seperti "Senin, 13 Oktober 2025 | 10:00 WIB",
+    "12 Okt 2025", "2025-10-12T08:00:00+07:00", "13/10/2025" atau "3 jam lalu".
+    Mengembalikan None kalau tidak dikenali.
+    """
+    if not text:
+        return None
+    text = text.strip()
+    m = _ISO_RE.search(text)
+    if m:
+        try:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            pass
+    for m in _DMY_RE.finditer(text):
+        month = BULAN.get(m.group(2).lower())
+        if month:
+            try:
+                return date(int(m.group(3)), month, int(m.group(1)))
+            except ValueError:
+                pass
+    m = _SLASH_RE.search(text)
+    if m:
+        try:
+            return date(int(m.group(3)), int(m.group(2)), int(m.group(1)))
+        except ValueError:
+            pass
+    m = _RELATIVE_RE.search(text)
+    if m:
+        today = today or datetime.now().date()
+        return today - timedelta(days=int(m.group(1)) * _RELATIVE_DAYS[m.group(2).lower()])
+    return None
+
+
+def _is_date_node(tag):
+    classes = " ".join(tag.get("class") or []).lower()
+    return tag.name == "time" or "date" in classes or "time" in classes
+
+
+def listing_entry_date(node, max_depth=4):
+    """
+    Cari tanggal di sekitar satu entri listing (biasanya elemen <a>): naik ke
+    beberapa ancestor dan cari <time datetime> atau elemen ber-class date/time.
+    Berhenti sebelum ancestor yang sudah memuat beberapa artikel lain.
+    """
+    current = node
+    for _ in range(max_depth):
+        if current is None:
+            break
+        hrefs = {a.get("href") for a in current.find_all("a", href=True)} if hasattr(current, "find_all") else set()
+        if len(hrefs) > 3:
+            break
+        for tag in current.find_all(_is_date_node) if hasattr(current, "find_all") else []:
+            tanggal = parse_indonesian_date(tag.get("datetime") or tag.get_text(" ", strip=True))
+            if tanggal:
+                return tanggal
+        current = current.parent
+    return None
+
+
+def filter_listing(entries, start_date=None, end_date=None, newest_first=False):
+    """
+    Saring entri listing (title, link, tanggal) sebelum artikel diambil.
+    Entri tanpa tanggal selalu dipertahankan (tanggalnya dicek setelah fetch).
+    Mengembalikan (entri_yang_perlu_diambil, stop); stop True berarti listing
+    sudah melewati start_date dan (untuk portal urut terbaru) halaman
+    berikutnya tidak perlu diambil.
+    """
+    keep = []
+    stop = False
+    for title, link, tanggal in entries:
+        if tanggal is not None:
+            if end_date and tanggal > end_date:
+                continue
+            if start_date and tanggal < start_date:
+                if newest_first:
+                    stop = True
+                    break
+                continue
+        keep.append((title, link, tanggal))
+    return keep, stop
+
+
+def page_range(max_pages):
+    """Nomor halaman 1..max_pages; max_pages=None berarti sampai UNBOUNDED_MAX_PAGES."""
+    limit = UNBOUNDED_MAX_PAGES if max_pages is None else max_pages
+    return itertools.islice(itertools.count(1), limit)
+
+
+def apply_watermark(entries, watermark, newest_first=False, canonical=None):
+    """
+    Mode incremental: buang entri yang sudah pernah di-ingest dan berhenti
+    begitu listing mencapai high-water mark (URL terbaru yang sudah dilihat,
+    atau - untuk portal urut terbaru - tanggal yang lebih tua dari mark).
+    Mengembalikan (entri_baru, stop).
+    """
+    if not watermark:
+        return list(entries), False
+    canonical = canonical or (lambda u: u)
+    keep = []
+    for title, link, tanggal in entries:
+        key = canonical(link)
+        if key == watermark.get("url"):
+            return keep, True
+        if newest_first and tanggal is not None and watermark.get("tanggal") and tanggal < watermark["tanggal"]:
+            return keep, True
+        if key in watermark.get("recent", ()):
+            continue
+        keep.append((title, link, tanggal))
+    return keep, False
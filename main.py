@@ -2,18 +2,41 @@
 import os
 import pandas as pd
 
-def run_scrapers(start_date=None, end_date=None, max_articles=10):
+def run_scrapers(start_date=None, end_date=None, max_articles=10, incremental=False):
     try:
         from scraper_all import scrape_dan_klasifikasi
     except Exception as e:
         print("scraper_all tidak ditemukan atau error:", e)
         raise
-    df_all, df_ekonomi = scrape_dan_klasifikasi(start_date, end_date, max_articles)
-    if not df_all.empty:
-        df_all.to_excel("hasil_semua_portal.xlsx", index=False)
-        df_ekonomi.to_excel("Berita_Ekonomi.xlsx", index=False)
-        print("Hasil disimpan: hasil_semua_portal.xlsx, Berita_Ekonomi.xlsx")
+    # incremental=True: hanya ambil artikel baru sejak run terakhir (lihat crawl_state.py)
+    # Artikel di-upsert ke article_store selama crawl berjalan; file Excel diekspor dari store
+    df_all, df_ekonomi = scrape_dan_klasifikasi(start_date, end_date, max_articles, incremental=incremental)
+    export_excel(start_date, end_date)
     return df_all, df_ekonomi
 
+
+def run_scheduler(portals=None):
+    """Daemon: crawl tiap portal berkala ke article_store (lihat scheduler.py) sampai dihentikan."""
+    from scheduler import run_scheduler as _run
+    _run(portals)
+
+
+def export_excel(start_date=None, end_date=None, path_all="hasil_semua_portal.xlsx",
+                 path_ekonomi="Berita_Ekonomi.xlsx"):
+    """Ekspor artikel di article_store (rentang tanggal opsional) ke dua file Excel."""
+    from article_store import ArticleStore
+    store = ArticleStore()
+    try:
+        store.export_excel(path_all, start_date, end_date)
+        store.export_excel(path_ekonomi, start_date, end_date, label=1)
+    finally:
+        store.close()
+
 if __name__ == "__main__":
-    run_scrapers()
+    import sys
+    if "--export" in sys.argv:
+        export_excel()
+    elif "--daemon" in sys.argv:
+        run_scheduler([a for a in sys.argv[1:] if not a.startswith("--")] or None)
+    else:
+        run_scrapers(incremental="--incremental" in sys.argv)
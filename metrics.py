@@ -0,0 +1,226 @@
+# metrics.py
+# Instrumentasi ringan tanpa dependensi: histogram latensi per portal & tahap
+# (fetch, navigate, parse, date, classify, render), byte yang diambil, retry, rasio hit
+# cache, dan logging terstruktur (satu baris JSON per event). Semua metrik
+# bisa dibaca dalam format teks Prometheus lewat render_prometheus() (route
+# /metrics di app.py). profiled() membungkus satu job dengan cProfile (atau
+# pyinstrument kalau terpasang).
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ContextDecorator, contextmanager
+from urllib.parse import urlparse
+
+from portals import portal_for_url
+
+# batas atas bucket histogram (detik)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LOG_LEVEL = logging.INFO
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+# "cprofile" atau "pyinstrument" (fallback ke cProfile kalau tidak terpasang)
+PROFILER = "cprofile"
+
+log = logging.getLogger("berita")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_text(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value=1, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels):
+        return self._values.get(tuple(str(labels.get(n, "")) for n in self.labels), 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += [f"{self.name}{_label_text(self.labels, k)} {v}" for k, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label -> [count per bucket (+Inf terakhir), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(n, "")) for n in self.labels)
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(c), s)) for k, (c, s) in self._series.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_label_text(self.labels + ('le',), key + (bound,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {total}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("berita_stage_seconds",
+                          "Latensi per portal dan tahap (fetch, navigate, parse, date, classify, render)",
+                          ("portal", "stage"))
+FETCHED_BYTES = Counter("berita_fetched_bytes_total", "Byte HTML yang diambil", ("portal", "via"))
+FETCH_REQUESTS = Counter("berita_fetch_requests_total", "Hasil fetch halaman", ("portal", "via", "outcome"))
+FETCH_RETRIES = Counter("berita_fetch_retries_total", "Percobaan ulang fetch", ("portal", "via"))
+BROWSER_TRANSFER_BYTES = Counter("berita_browser_transfer_bytes_total",
+                                 "Byte jaringan yang ditransfer Chrome (dokumen + resource yang tidak diblokir)",
+                                 ("portal",))
+# kind: "record" (record segar, tanpa request), "page" (conditional request -> 304),
+# "html" (HTML tidak berubah, ekstraksi dilewati)
+CACHE_KINDS = ("record", "page", "html")
+CACHE_LOOKUPS = Counter("berita_cache_lookups_total", "Lookup article_cache per jenis", ("kind", "result"))
+ARTICLES = Counter("berita_articles_total", "Artikel yang selesai diklasifikasi", ("portal", "label"))
+REGISTRY = [STAGE_SECONDS, FETCHED_BYTES, FETCH_REQUESTS, FETCH_RETRIES, BROWSER_TRANSFER_BYTES, CACHE_LOOKUPS, ARTICLES]
+
+
+def portal_label(url):
+    """Label portal untuk metrik: kunci portal, atau host-nya kalau tidak dikenal."""
+    return portal_for_url(url) or urlparse(url).netloc or "-"
+
+
+def cache_hit(kind, hit):
+    CACHE_LOOKUPS.inc(kind=kind, result="hit" if hit else "miss")
+
+
+def cache_hit_ratio(kind):
+    hits = CACHE_LOOKUPS.value(kind=kind, result="hit")
+    total = hits + CACHE_LOOKUPS.value(kind=kind, result="miss")
+    return hits / total if total else 0.0
+
+
+class timed(ContextDecorator):
+    """Context manager / decorator: catat durasi blok ke STAGE_SECONDS{portal, stage}."""
+
+    def __init__(self, stage, portal="-"):
+        self.stage = stage
+        self.portal = portal
+
+    def _recreate_cm(self):
+        # dipakai sebagai decorator: instance baru per panggilan (aman lintas thread)
+        return timed(self.stage, self.portal)
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.seconds = time.perf_counter() - self._t0
+        STAGE_SECONDS.observe(self.seconds, portal=self.portal, stage=self.stage)
+        log_event("stage", logging.DEBUG, portal=self.portal, stage=self.stage,
+                  seconds=round(self.seconds, 6), ok=exc_type is None)
+        return False
+
+
+def render_prometheus():
+    """Semua metrik dalam format teks Prometheus (text/plain; version=0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.render()
+    lines += ["# HELP berita_cache_hit_ratio Rasio hit article_cache sejak proses mulai",
+              "# TYPE berita_cache_hit_ratio gauge"]
+    lines += [f'berita_cache_hit_ratio{{kind="{kind}"}} {cache_hit_ratio(kind)}' for kind in CACHE_KINDS]
+    return "\n".join(lines) + "\n"
+
+
+# --- logging terstruktur ---
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        data = {"ts": round(record.created, 3), "level": record.levelname.lower(), "event": record.getMessage()}
+        data.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            data["exc"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+def log_event(event, level=logging.INFO, **fields):
+    """Satu event terstruktur (nama + field) ke logger "berita"."""
+    if log.isEnabledFor(level):
+        log.log(level, event, extra={"fields": fields})
+
+
+def configure_logging(level=LOG_LEVEL):
+    """Pasang handler JSON (stderr) di logger "berita" sekali saja."""
+    if not any(isinstance(h.formatter, JsonFormatter) for h in log.handlers):
+        handler = logging.StreamHandler()
+        handler.setFormatter(JsonFormatter())
+        log.addHandler(handler)
+        log.propagate = False
+    log.setLevel(level)
+
+
+# --- profiling ---
+@contextmanager
+def profiled(name, out_dir=PROFILE_DIR, profiler=PROFILER):
+    """
+    Profile blok ini; menghasilkan dict yang berisi "path" file hasilnya setelah
+    blok selesai (.prof untuk cProfile -> snakeviz/pstats, .html untuk pyinstrument).
+    Hanya thread pemanggil yang diprofile: fetch di thread pool crawler.py terlihat
+    lewat histogram STAGE_SECONDS, bukan di sini.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    result = {"path": None}
+    if profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            profiler = "cprofile"
+    if profiler == "pyinstrument":
+        prof = Profiler()
+        prof.start()
+        try:
+            yield result
+        finally:
+            prof.stop()
+            result["path"] = os.path.join(out_dir, f"{name}.html")
+            with open(result["path"], "w", encoding="utf-8") as f:
+                f.write(prof.output_html())
+            log_event("profile", path=result["path"])
+        return
+    import cProfile
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield result
+    finally:
+        prof.disable()
+        result["path"] = os.path.join(out_dir, f"{name}.prof")
+        prof.dump_stats(result["path"])
+        log_event("profile", path=result["path"])
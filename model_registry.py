@@ -0,0 +1,152 @@
+# model_registry.py
+# Registry model di level proses: model klasifikasi di-load sekali, dipakai
+# bersama oleh semua request/worker thread, dan hanya di-load ulang kalau file
+# .pkl/.npz-nya berubah (mtime/ukuran berubah dan hash isinya berbeda).
+import hashlib
+import os
+import threading
+import time
+
+import joblib
+
+from fast_model import fast_model_path
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_berita_svm2.pkl")
+# array numpy di dalam pickle (idf_, koefisien SVM) di-mmap, tidak disalin ke RAM;
+# hanya berlaku untuk file hasil joblib.dump tanpa kompresi
+MODEL_MMAP_MODE = "r"
+# file model paling sering dicek sekali per interval ini
+MODEL_CHECK_SECONDS = 5.0
+WARMUP_TEXTS = ["harga cabai dan beras di pasar naik menjelang akhir tahun"]
+# fast model .npz hanya mendekati pipeline .pkl, jadi dipakai hanya kalau diminta (USE_FAST_MODEL=1)
+FAST_MODEL_ENV = "USE_FAST_MODEL"
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ModelRegistry:
+    """Satu model yang di-load malas (lazy), di-cache, dan aman dipakai dari banyak thread."""
+
+    def __init__(self, path=DEFAULT_MODEL_PATH, mmap_mode=MODEL_MMAP_MODE, check_seconds=MODEL_CHECK_SECONDS):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self.check_seconds = check_seconds
+        self._lock = threading.Lock()
+        self._model = None
+        self._stat = None  # (mtime, size) file yang sedang dipakai
+        self._hash = None
+        self._checked_at = 0.0
+        self.loads = 0
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size
+
+    def _load(self, stat):
+        digest = file_hash(self.path)
+        if self._model is not None and digest == self._hash:
+            # file di-touch/ditulis ulang dengan isi sama: model lama tetap dipakai
+            self._stat = stat
+            return
+        t0 = time.perf_counter()
+        if self.path.endswith(".npz"):
+            # fast model hasil fast_model.distil(): array saja, tanpa unpickle
+            from fast_model import FastLinearModel
+            model = FastLinearModel.load(self.path)
+        else:
+            model = joblib.load(self.path, mmap_mode=self.mmap_mode)
+        _warm_up(model)
+        self._model, self._stat, self._hash = model, stat, digest
+        self.loads += 1
+        print(f"[INFO] Model berhasil dimuat: {self.path} ({time.perf_counter() - t0:.2f}s, sha1 {digest[:10]})")
+
+    def get(self):
+        """Model terkini, atau None kalau file tidak ada / gagal di-load (model lama dipertahankan)."""
+        now = time.monotonic()
+        if self._model is not None and now - self._checked_at < self.check_seconds:
+            return self._model
+        with self._lock:
+            if self._model is not None and now - self._checked_at < self.check_seconds:
+                return self._model
+            self._checked_at = now
+            stat = self._file_stat()
+            if stat is None:
+                if self._model is None:
+                    print(f"[INFO] Model tidak ditemukan di {self.path}. Lewati klasifikasi.")
+                return self._model
+            if stat != self._stat:
+                try:
+                    self._load(stat)
+                except Exception as e:
+                    print(f"[WARNING] Gagal memuat model: {e}")
+            return self._model
+
+    def info(self):
+        return {"path": self.path, "loaded": self._model is not None, "sha1": self._hash,
+                "loads": self.loads, "mmap_mode": self.mmap_mode}
+
+
+def _warm_up(model):
+    # prediksi pertama memicu inisialisasi lazy (cache BLAS, page-in mmap)
+    try:
+        model.predict(WARMUP_TEXTS)
+    except Exception as e:
+        print(f"[WARNING] Warm-up model gagal: {e}")
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(path=DEFAULT_MODEL_PATH):
+    path = os.path.abspath(path)
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = _registries[path] = ModelRegistry(path)
+        return registry
+
+
+_announced = set()
+
+
+def preferred_model_path(pkl_path=DEFAULT_MODEL_PATH, use_fast=None):
+    """
+    .pkl, kecuali fast model diminta (`use_fast`, default env USE_FAST_MODEL=1)
+    dan .npz-nya (fast_model.py) ada serta tidak lebih tua dari .pkl-nya.
+    """
+    if use_fast is None:
+        use_fast = os.environ.get(FAST_MODEL_ENV) == "1"
+    if not use_fast:
+        return pkl_path
+    fast = fast_model_path(pkl_path)
+    if os.path.exists(fast) and (not os.path.exists(pkl_path) or os.path.getmtime(fast) >= os.path.getmtime(pkl_path)):
+        if fast not in _announced:
+            _announced.add(fast)
+            print(f"[INFO] {FAST_MODEL_ENV}=1: memakai fast model {fast} (pendekatan dari {pkl_path})")
+        return fast
+    if pkl_path not in _announced:
+        _announced.add(pkl_path)
+        print(f"[WARNING] {FAST_MODEL_ENV}=1 tetapi {fast} tidak ada atau lebih tua dari .pkl; memakai .pkl")
+    return pkl_path
+
+
+def get_model(path=DEFAULT_MODEL_PATH):
+    """Model bersama untuk `path` (di-load sekali per proses)."""
+    return get_registry(path).get()
+
+
+def warm_up_async(path=DEFAULT_MODEL_PATH):
+    """Load + warm-up model di thread background (misal saat app start)."""
+    t = threading.Thread(target=get_model, args=(preferred_model_path(path),), name="model-warmup", daemon=True)
+    t.start()
+    return t
@@ -0,0 +1,164 @@
+# near_dup.py
+# Deteksi berita hampir-sama lintas portal (sindikasi Antara yang ditulis ulang
+# sedikit): judul + isi dipecah jadi shingle 3 kata, diringkas dengan MinHash,
+# lalu diindeks dengan LSH berpita sehingga tiap insert hanya membandingkan
+# kandidat di bucket yang sama (sub-linear terhadap ukuran arsip). Artikel
+# dikelompokkan ke klaster cerita dengan satu representatif (yang pertama masuk).
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from url_canon import canonical_url
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "near_dup_index.npz")
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+# 32 pita x 4 baris: peluang jadi kandidat ~87% pada Jaccard 0.5, ~23% pada 0.3
+LSH_BANDS = 32
+# estimasi Jaccard minimum untuk dianggap cerita yang sama
+NEAR_DUP_THRESHOLD = 0.5
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, _PRIME, size=NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, _PRIME, size=NUM_PERM).astype(np.uint64)
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def shingles(text, k=SHINGLE_SIZE):
+    """Hash crc32 (stabil antar proses) dari shingle k kata."""
+    tokens = _TOKEN_RE.findall((text or "").lower())
+    if len(tokens) < k:
+        return np.array([zlib.crc32(" ".join(tokens).encode())], dtype=np.uint64) if tokens else np.empty(0, np.uint64)
+    grams = {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+    return np.fromiter((zlib.crc32(g.encode()) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash(shingle_hashes):
+    """Signature MinHash (NUM_PERM,) dengan hash universal (a*x + b) mod p."""
+    if len(shingle_hashes) == 0:
+        return None
+    x = (shingle_hashes % _PRIME)[None, :]
+    return ((_A[:, None] * x + _B[:, None]) % _PRIME).min(axis=1).astype(np.uint32)
+
+
+def article_text(record):
+    return f"{record.get('judul') or ''} {record.get('isi') or ''}"
+
+
+class NearDupIndex:
+    """Indeks MinHash-LSH: add() mengembalikan (cluster_id, representatif_link, baru?)."""
+
+    def __init__(self, bands=LSH_BANDS, threshold=NEAR_DUP_THRESHOLD):
+        if NUM_PERM % bands:
+            raise ValueError("NUM_PERM harus habis dibagi jumlah pita")
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._buckets = {}  # (pita, bytes) -> [id klaster]
+        self.signatures = []  # per klaster: signature representatif
+        self.links = []  # per klaster: link kanonik representatif
+        self._by_link = {}  # link kanonik -> id klaster (representatif & anggota)
+        self.duplicates = 0
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def _band_keys(self, sig):
+        return [(b, sig[b * self.rows:(b + 1) * self.rows].tobytes()) for b in range(self.bands)]
+
+    def _index(self, cid, sig):
+        for key in self._band_keys(sig):
+            self._buckets.setdefault(key, []).append(cid)
+
+    def query(self, sig):
+        """(id klaster, estimasi Jaccard) terbaik di atas ambang, atau (None, 0.0)."""
+        candidates = set()
+        for key in self._band_keys(sig):
+            candidates.update(self._buckets.get(key, ()))
+        best, best_sim = None, 0.0
+        for cid in candidates:
+            sim = float(np.mean(self.signatures[cid] == sig))
+            if sim > best_sim:
+                best, best_sim = cid, sim
+        if best_sim >= self.threshold:
+            return best, best_sim
+        return None, 0.0
+
+    def add(self, link, text):
+        key = canonical_url(link)
+        with self._lock:
+            if key in self._by_link:
+                cid = self._by_link[key]
+                return cid, self.links[cid], self.links[cid] == key
+            sig = minhash(shingles(text))
+            cid = None
+            if sig is not None:
+                cid, _ = self.query(sig)
+            if cid is not None:
+                self._by_link[key] = cid
+                self.duplicates += 1
+                return cid, self.links[cid], False
+            cid = len(self.signatures)
+            self.signatures.append(sig if sig is not None else np.zeros(NUM_PERM, dtype=np.uint32))
+            self.links.append(key)
+            self._by_link[key] = cid
+            if sig is not None:
+                self._index(cid, sig)
+            return cid, key, True
+
+    # --- penyimpanan ---
+    def save(self, path=DEFAULT_INDEX_PATH):
+        with self._lock:
+            members = list(self._by_link.items())
+            tmp = path + ".tmp.npz"
+            np.savez_compressed(
+                tmp, signatures=np.array(self.signatures, dtype=np.uint32).reshape(-1, NUM_PERM),
+                links=np.array(self.links, dtype=str), member_links=np.array([m for m, _ in members], dtype=str),
+                member_clusters=np.array([c for _, c in members], dtype=np.int64))
+            os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH, **kwargs):
+        index = cls(**kwargs)
+        if not os.path.exists(path):
+            return index
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                index.signatures = list(data["signatures"])
+                index.links = data["links"].tolist()
+                index._by_link = dict(zip(data["member_links"].tolist(), data["member_clusters"].tolist()))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[WARNING] Gagal membaca {path}, mulai dari indeks kosong: {e}")
+            return cls(**kwargs)
+        for cid, sig in enumerate(index.signatures):
+            if sig.any():
+                index._index(cid, sig)
+        return index
+
+
+def near_dedupe(records, index, on_drop=None):
+    """
+    Tahap pipeline sebelum klasifikasi: tiap record diberi "cluster" dan
+    "duplicate_of" (None: dia sendiri representatif klasternya). Hanya
+    representatif yang diteruskan, sekali per run; versi lain dari cerita
+    yang sama dilewati, termasuk yang representatifnya masuk di run
+    sebelumnya (indeks disimpan antar run). `on_drop(record)` dipanggil untuk
+    record yang dilewati (misal pipeline.StateSink, supaya link-nya tidak
+    di-fetch ulang oleh crawl incremental berikutnya).
+    """
+    emitted = set()
+    for record in records:
+        cid, rep, is_rep = index.add(record["link"], article_text(record))
+        record["cluster"] = cid
+        record["duplicate_of"] = None if is_rep else rep
+        if not is_rep or cid in emitted:
+            if on_drop is not None:
+                on_drop(record)
+            continue
+        emitted.add(cid)
+        yield record
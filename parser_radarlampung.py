@@ -1,16 +1,16 @@
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 from datetime import datetime, date as date_cls
-import time
 import pandas as pd
 
 # helpers
-from selenium import webdriver as _webdriver_internal
-import time as _time_internal
+from browser_profile import make_chrome_driver
+from fetcher import open_fetcher, fetch_article
+from metrics import timed
+from html_parsing import make_soup
+from url_canon import canonical_url
+from listing import listing_entry_date, filter_listing, page_range
 
 def _ensure_date(dt):
     if dt is None:
@@ -32,124 +32,125 @@ def _ensure_date(dt):
             raise ValueError(f"String date format not supported: {s}")
     raise TypeError(f"Unsupported date type: {type(dt)}")
 
-def _make_chrome_driver(headless=True):
-    options = Options()
-    if headless:
+_make_chrome_driver = make_chrome_driver
+
+PORTAL = "radarlampung"
+# urutan listing tidak dijamin terbaru dulu -> entri di luar rentang tanggal dilewati,
+# tetapi paging tidak berhenti hanya karena satu entri lebih tua dari start_date
+SORTED_NEWEST_FIRST = False
+LISTING_URL = "https://radarlampung.disway.id/kategori/458/lampung-raya/{}"
+
+def listing_url(page):
+    # Radar Lampung memakai offset (10 artikel per halaman), bukan nomor halaman
+    return LISTING_URL.format((page - 1) * 10)
+
+@timed("parse_listing", PORTAL)
+def parse_listing(html):
+    # listing di-parse penuh: tanggal entri dicari lewat ancestor-nya
+    soup = make_soup(html)
+    article_links = []
+    seen = set()  # URL kanonik; varian AMP/tracking dari artikel yang sama dilewati
+    for p in soup.find_all('p'):
+        a_tag = p.find('a', href=True)
+        if a_tag:
+            href = a_tag['href']
+            if href and "radarlampung" in href:
+                title = a_tag.get_text(strip=True)
+                key = canonical_url(href)
+                if key not in seen:
+                    seen.add(key)
+                    article_links.append((title, href, listing_entry_date(a_tag)))
+    return article_links
+
+@timed("date", PORTAL)
+def _article_date(art_soup):
+    """Tanggal terbit dari halaman artikel (hari ini kalau tidak ditemukan)."""
+    tanggal = None
+    # try to parse time tag or text
+    ttag = art_soup.find("time")
+    if ttag and ttag.has_attr("datetime"):
         try:
-            options.add_argument("--headless=new")
+            tanggal = datetime.fromisoformat(ttag["datetime"]).date()
         except Exception:
-            options.add_argument("--headless")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1920,1080")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    service = Service(ChromeDriverManager().install())
-    driver = _webdriver_internal.Chrome(service=service, options=options)
-    try:
-        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-            "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-        })
-    except Exception:
-        pass
-    driver.set_page_load_timeout(30)
-    driver.set_script_timeout(30)
-    return driver
+            pass
+    if not tanggal:
+        # fallback parse from text nodes
+        textnodes = art_soup.find_all(text=True)[:120]
+        for tn in textnodes:
+            txt = tn.strip()
+            if txt and any(c.isdigit() for c in txt):
+                for fmt in ("%d %B %Y", "%Y-%m-%d"):
+                    try:
+                        tanggal = datetime.strptime(txt, fmt).date()
+                        break
+                    except Exception:
+                        pass
+            if tanggal:
+                break
+    if not tanggal:
+        tanggal = datetime.now().date()
+    return tanggal
 
-def _safe_get(driver, url, retries=3, delay=2):
-    for i in range(retries):
-        try:
-            driver.get(url)
-            return True
-        except Exception as e:
-            print(f"[WARN] get {url} failed (attempt {i+1}/{retries}): {e}")
-            _time_internal.sleep(delay)
-    return False
+@timed("parse", PORTAL)
+def parse_article(html, title, link):
+    # di-parse penuh: fallback tanggal memindai text node seluruh halaman
+    art_soup = make_soup(html)
+    tanggal = _article_date(art_soup)
+    paras = art_soup.find_all("p")
+    isi = " ".join(p.get_text(strip=True) for p in paras)
+    return {"judul": title.strip(), "link": link, "tanggal": tanggal, "isi": isi}
 
-def parse_radar_lampung(driver=None, start_date=None, end_date=None, max_articles=30, max_pages=2):
+def iter_radar_lampung(fetcher=None, start_date=None, end_date=None, max_articles=30, max_pages=2, driver=None):
     """
-    Note: original repo used this parser with a driver passed in — we keep the signature.
-    If driver is None, we'll create one.
+    Note: 'fetcher' may be a fetcher, a Selenium driver (old call style) or None.
+    If it is None, we create our own and fall back to a local Chrome driver when needed.
+    'driver' is the old name of this argument and is still accepted as an alias.
     """
     start_date = _ensure_date(start_date)
     end_date = _ensure_date(end_date)
 
-    close_driver = False
-    if driver is None:
-        driver = _make_chrome_driver(headless=True)
-        close_driver = True
+    fetcher, close_fetcher = open_fetcher(
+        fetcher if fetcher is not None else driver, PORTAL, driver_factory=lambda: _make_chrome_driver(headless=True))
 
-    results = []
     try:
         found = 0
-        for page in range(1, max_pages+1):
-            offset = (page - 1) * 10
-            url = f"https://radarlampung.disway.id/kategori/458/lampung-raya/{offset}"
+        for page in page_range(max_pages):
+            url = listing_url(page)
             print(f"🌐 Memuat halaman: {url}")
-            if not _safe_get(driver, url):
+            html = fetcher.get(url)
+            if html is None:
                 continue
-            time.sleep(2)
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-
-            article_links = []
-            for p in soup.find_all('p'):
-                a_tag = p.find('a', href=True)
-                if a_tag:
-                    href = a_tag['href']
-                    if href and "radarlampung" in href:
-                        title = a_tag.get_text(strip=True)
-                        if href not in [l[1] for l in article_links]:
-                            article_links.append((title, href))
+            article_links = parse_listing(html)
+            if not article_links:
+                break
+            # entri yang tanggalnya sudah terlihat di listing disaring tanpa fetch artikel
+            article_links, reached_start = filter_listing(article_links, start_date, end_date, SORTED_NEWEST_FIRST)
 
-            for title, link in article_links:
+            for title, link, _ in article_links:
                 if found >= max_articles:
                     break
-                if not _safe_get(driver, link):
+                try:
+                    record = fetch_article(fetcher, title, link, parse_article)
+                except Exception as e:
+                    # satu artikel yang gagal tidak menghentikan portal
+                    print(f"   [warn] gagal parse artikel: {link}, {e}")
                     continue
-                time.sleep(0.6)
-                art_soup = BeautifulSoup(driver.page_source, "html.parser")
-                tanggal = None
-                # try to parse time tag or text
-                ttag = art_soup.find("time")
-                if ttag and ttag.has_attr("datetime"):
-                    try:
-                        tanggal = datetime.fromisoformat(ttag["datetime"]).date()
-                    except Exception:
-                        pass
-                if not tanggal:
-                    # fallback parse from text nodes
-                    textnodes = art_soup.find_all(text=True)[:120]
-                    for tn in textnodes:
-                        txt = tn.strip()
-                        if txt and any(c.isdigit() for c in txt):
-                            for fmt in ("%d %B %Y", "%Y-%m-%d"):
-                                try:
-                                    tanggal = datetime.strptime(txt, fmt).date()
-                                    break
-                                except Exception:
-                                    pass
-                        if tanggal:
-                            break
-                if not tanggal:
-                    tanggal = datetime.now().date()
+                if record is None:
+                    continue
+                tanggal = record["tanggal"]
                 if start_date and tanggal < start_date:
                     continue
                 if end_date and tanggal > end_date:
                     continue
-                paras = art_soup.find_all("p")
-                isi = " ".join(p.get_text(strip=True) for p in paras)
-                results.append({"judul": title.strip(), "link": link, "tanggal": tanggal, "isi": isi})
+                yield record
                 found += 1
-            if found >= max_articles:
+            if found >= max_articles or reached_start:
                 break
     finally:
-        if close_driver:
-            try:
-                driver.quit()
-            except Exception:
-                pass
+        if close_fetcher:
+            fetcher.close()
 
-    df = pd.DataFrame(results)
+def parse_radar_lampung(fetcher=None, start_date=None, end_date=None, max_articles=30, max_pages=2, driver=None):
+    """Versi DataFrame dari iter_radar_lampung() (mengumpulkan semua record)."""
+    df = pd.DataFrame(list(iter_radar_lampung(fetcher, start_date=start_date, end_date=end_date, max_articles=max_articles, max_pages=max_pages, driver=driver)))
     return df
@@ -7,12 +7,15 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 from datetime import datetime, date as date_cls
-import time
 import pandas as pd
 
 # --- helpers ---
-from selenium import webdriver as _webdriver_internal
-import time as _time_internal
+from fetcher import open_fetcher, fetch_article
+from metrics import timed
+from html_parsing import make_soup, only
+from url_canon import canonical_url
+from article_store import save_records
+from listing import listing_entry_date, filter_listing, page_range
 
 def _ensure_date(dt):
     if dt is None:
@@ -34,81 +37,118 @@ def _ensure_date(dt):
             raise ValueError(f"String date format not supported: {s}")
     raise TypeError(f"Unsupported date type: {type(dt)}")
 
-def _safe_get(driver, url, retries=3, delay=2):
-    for i in range(retries):
+# --- extraction helpers (dipakai juga oleh crawler.py) ---
+PORTAL = "rmol"
+# urutan listing tidak dijamin terbaru dulu -> entri di luar rentang tanggal dilewati,
+# tetapi paging tidak berhenti hanya karena satu entri lebih tua dari start_date
+SORTED_NEWEST_FIRST = False
+# hanya subtree ini yang di-parse dari halaman artikel
+ARTICLE_PARSE_ONLY = only("time", ".text-body-tertiary", "div.read-content")
+LISTING_URL = "https://rmollampung.id/?s=lampung&page={}"
+
+def listing_url(page):
+    return LISTING_URL.format(page)
+
+@timed("parse_listing", PORTAL)
+def parse_listing(html):
+    # listing di-parse penuh: tanggal entri dicari lewat ancestor-nya
+    soup = make_soup(html)
+    links = []
+    seen = set()  # URL kanonik; varian AMP/tracking dari artikel yang sama dilewati
+    for a in soup.find_all("a", href=True):
+        href = a['href']
+        if "/berita/" in href and "rmollampung.id" in href:
+             title = a.get_text(strip=True)
+             key = canonical_url(href)
+             if title and key not in seen:
+                 seen.add(key)
+                 links.append((title, href, listing_entry_date(a)))
+    return links
+
+@timed("date", PORTAL)
+def _article_date(art_soup):
+    """Tanggal terbit dari halaman artikel (hari ini kalau tidak ditemukan)."""
+    tanggal = None
+    meta_time = art_soup.find("time")
+    if meta_time and meta_time.has_attr("datetime"):
         try:
-            driver.get(url)
-            return True
-        except Exception as e:
-            print(f"[WARN] get {url} failed (attempt {i+1}/{retries}): {e}")
-            _time_internal.sleep(delay)
-    return False
+            tanggal = datetime.fromisoformat(meta_time["datetime"]).date()
+        except Exception:
+            pass
+
+    if not tanggal:
+        date_text_element = art_soup.select_one(".text-body-tertiary.d-inline-block.me-3")
+        if date_text_element:
+            date_text = date_text_element.text.strip()
+            try:
+               tanggal = datetime.strptime(date_text, "%A, %d %B %Y | %H:%M WIB").date()
+            except ValueError:
+                pass
+    if not tanggal:
+        tanggal = datetime.now().date()
+    return tanggal
+
+@timed("parse", PORTAL)
+def parse_article(html, title, link):
+    art_soup = make_soup(html, ARTICLE_PARSE_ONLY)
+
+    tanggal = _article_date(art_soup)
 
-# SIGNATURE UPDATED to accept 'driver'
-def parse_rmol_lampung(driver, start_date=None, end_date=None, max_pages=2, max_articles=50, simpan=False, output_file="hasil_rmol_lampung.xlsx"):
+    content_div = art_soup.find("div", class_="read-content")
+    if not content_div:
+        return None
+    paras = content_div.find_all("p")
+    isi = " ".join(p.get_text(strip=True) for p in paras)
+    return {"judul": title.strip(), "link": link, "tanggal": tanggal, "isi": isi}
+
+# 'fetcher' bisa berupa fetcher, Selenium driver (cara lama), atau None;
+# driver= (nama lama argumen ini) tetap diterima sebagai alias fetcher=
+def iter_rmol_lampung(fetcher=None, start_date=None, end_date=None, max_pages=2, max_articles=50, driver=None):
+    """Generator: menghasilkan record artikel satu per satu begitu selesai di-parse."""
     start_date_obj = _ensure_date(start_date)
     end_date_obj = _ensure_date(end_date)
 
-    base = "https://rmollampung.id/?s=lampung&page={}"
-    results = []
-    
-    # REMOVED driver creation and driver.quit() block
-    found = 0
-    for p in range(1, max_pages+1):
-        if found >= max_articles:
-            break
-        url = base.format(p)
-        print(f"🔄 Memuat RMOL halaman {p} -> {url}")
-        if not _safe_get(driver, url):
-            continue
-        time.sleep(1)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        links = []
-        for a in soup.find_all("a", href=True):
-            href = a['href']
-            if "/berita/" in href and "rmollampung.id" in href:
-                 title = a.get_text(strip=True)
-                 if title and href not in [l[1] for l in links]:
-                     links.append((title, href))
-        
-        for title, link in links:
+    fetcher, close_fetcher = open_fetcher(fetcher if fetcher is not None else driver, PORTAL)
+    try:
+        found = 0
+        for p in page_range(max_pages):
             if found >= max_articles:
                 break
-            if not _safe_get(driver, link):
+            url = listing_url(p)
+            print(f"🔄 Memuat RMOL halaman {p} -> {url}")
+            html = fetcher.get(url)
+            if html is None:
                 continue
-            time.sleep(0.6)
-            art_soup = BeautifulSoup(driver.page_source, "html.parser")
-            
-            tanggal = None
-            meta_time = art_soup.find("time")
-            if meta_time and meta_time.has_attr("datetime"):
-                try:
-                    tanggal = datetime.fromisoformat(meta_time["datetime"]).date()
-                except Exception:
-                    pass
-            
-            if not tanggal:
-                date_text_element = art_soup.select_one(".text-body-tertiary.d-inline-block.me-3")
-                if date_text_element:
-                    date_text = date_text_element.text.strip()
-                    try:
-                       tanggal = datetime.strptime(date_text, "%A, %d %B %Y | %H:%M WIB").date()
-                    except ValueError:
-                        pass
-            if not tanggal:
-                tanggal = datetime.now().date()
+            links = parse_listing(html)
+            if not links:
+                break
+            # entri yang tanggalnya sudah terlihat di listing disaring tanpa fetch artikel
+            links, reached_start = filter_listing(links, start_date_obj, end_date_obj, SORTED_NEWEST_FIRST)
+        
+            for title, link, _ in links:
+                if found >= max_articles:
+                    break
+                record = fetch_article(fetcher, title, link, parse_article)
+                if record is None:
+                    continue
 
-            if (start_date_obj and tanggal < start_date_obj) or \
-               (end_date_obj and tanggal > end_date_obj):
-                continue
+                tanggal = record["tanggal"]
+                if (start_date_obj and tanggal < start_date_obj) or \
+                   (end_date_obj and tanggal > end_date_obj):
+                    continue
 
-            paras = art_soup.find("div", class_="read-content").find_all("p")
-            isi = " ".join(p.get_text(strip=True) for p in paras)
-            results.append({"judul": title.strip(), "link": link, "tanggal": tanggal, "isi": isi})
-            found += 1
+                yield record
+                found += 1
+            if reached_start:
+                break
+    finally:
+        if close_fetcher:
+            fetcher.close()
 
-    df = pd.DataFrame(results)
+def parse_rmol_lampung(fetcher=None, start_date=None, end_date=None, max_pages=2, max_articles=50, simpan=False, output_file="hasil_rmol_lampung.xlsx", driver=None):
+    """Versi DataFrame dari iter_rmol_lampung() (mengumpulkan semua record)."""
+    df = pd.DataFrame(list(iter_rmol_lampung(fetcher, start_date=start_date, end_date=end_date, max_pages=max_pages, max_articles=max_articles, driver=driver)))
     if simpan and not df.empty:
-        df.to_excel(output_file, index=False)
+        # simpan ke article_store; Excel hanya ekspor dari store
+        save_records(df.to_dict("records"), PORTAL, output_file)
     return df
\ No newline at end of file
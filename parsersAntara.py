@@ -7,12 +7,15 @@ from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime, date as date_cls
-import time
 from dateutil import parser as dateparser
 
 # helpers
-from selenium import webdriver as _webdriver_internal
-import time as _time_internal
+from fetcher import open_fetcher, fetch_article
+from metrics import timed
+from html_parsing import make_soup, only
+from url_canon import canonical_url
+from article_store import save_records
+from listing import listing_entry_date, filter_listing, page_range
 
 def _ensure_date(dt):
     if dt is None:
@@ -31,74 +34,108 @@ def _ensure_date(dt):
                 raise ValueError(f"Cannot parse date string: {dt}")
     raise TypeError(f"Unsupported date type: {type(dt)}")
 
-def _safe_get(driver, url, retries=3, delay=2):
-    for i in range(retries):
+# extraction helpers (dipakai juga oleh crawler.py)
+PORTAL = "antara"
+# listing urut dari yang terbaru -> paging boleh berhenti begitu melewati start_date
+SORTED_NEWEST_FIRST = True
+# hanya subtree ini yang di-parse dari halaman artikel
+ARTICLE_PARSE_ONLY = only("p.date", "div.post-content")
+LISTING_URL = "https://lampung.antaranews.com/lampung-update?page={}"
+
+def listing_url(page):
+    return LISTING_URL.format(page)
+
+@timed("parse_listing", PORTAL)
+def parse_listing(html):
+    # listing di-parse penuh: tanggal entri dicari lewat ancestor-nya
+    soup = make_soup(html)
+    links = []
+    seen = set()  # URL kanonik; varian AMP/tracking dari artikel yang sama dilewati
+    for a in soup.find_all("a", class_="figure", href=True):
+         href = a['href']
+         title_tag = a.find("h3", class_="title")
+         if title_tag:
+             title = title_tag.get_text(strip=True)
+             key = canonical_url(href)
+             if key not in seen:
+                 seen.add(key)
+                 links.append((title, href, listing_entry_date(a)))
+    return links
+
+@timed("date", PORTAL)
+def _article_date(art):
+    """Tanggal terbit dari halaman artikel (hari ini kalau tidak ditemukan)."""
+    tanggal = None
+    date_node = art.find("p", class_="date")
+    if date_node:
         try:
-            driver.get(url)
-            return True
-        except Exception as e:
-            print(f"[WARN] get {url} failed (attempt {i+1}/{retries}): {e}")
-            _time_internal.sleep(delay)
-    return False
-    
-# SIGNATURE UPDATED to accept 'driver'
-def parse_antara(driver, start_date=None, end_date=None, max_pages=2, max_articles=50, simpan=False, output_file='antara_lampung.xlsx'):
+            tanggal = dateparser.parse(date_node.get_text(strip=True)).date()
+        except Exception:
+            pass
+    if not tanggal:
+        tanggal = datetime.now().date()
+    return tanggal
+
+@timed("parse", PORTAL)
+def parse_article(html, title, link):
+    art = make_soup(html, ARTICLE_PARSE_ONLY)
+
+    tanggal = _article_date(art)
+
+    content_div = art.find("div", class_="post-content")
+    if not content_div:
+        return None
+    paras = content_div.find_all("p")
+    isi = " ".join(p.get_text(strip=True) for p in paras)
+    return {"judul": title.strip(), "link": link, "tanggal": tanggal, "isi": isi}
+
+# 'fetcher' bisa berupa fetcher, Selenium driver (cara lama), atau None;
+# driver= (nama lama argumen ini) tetap diterima sebagai alias fetcher=
+def iter_antara(fetcher=None, start_date=None, end_date=None, max_pages=2, max_articles=50, driver=None):
+    """Generator: menghasilkan record artikel satu per satu begitu selesai di-parse."""
     start_date = _ensure_date(start_date)
     end_date = _ensure_date(end_date)
 
-    results = []
-    
-    # REMOVED driver creation and driver.quit() block
-    base = "https://lampung.antaranews.com/lampung-update?page={}"
-    total = 0
-    for page in range(1, max_pages+1):
-        if total >= max_articles:
-            break
-        url = base.format(page)
-        print(f"🔄 Memproses halaman {page} → {url}")
-        if not _safe_get(driver, url):
-            continue
-        time.sleep(1)
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        
-        links = []
-        for a in soup.find_all("a", class_="figure", href=True):
-             href = a['href']
-             title_tag = a.find("h3", class_="title")
-             if title_tag:
-                 title = title_tag.get_text(strip=True)
-                 if href not in [l[1] for l in links]:
-                     links.append((title, href))
-
-        for title, link in links:
+    fetcher, close_fetcher = open_fetcher(fetcher if fetcher is not None else driver, PORTAL)
+    try:
+        total = 0
+        for page in page_range(max_pages):
             if total >= max_articles:
                 break
-            if not _safe_get(driver, link):
+            url = listing_url(page)
+            print(f"🔄 Memproses halaman {page} → {url}")
+            html = fetcher.get(url)
+            if html is None:
                 continue
-            time.sleep(0.6)
-            art = BeautifulSoup(driver.page_source, "html.parser")
-            
-            tanggal = None
-            date_node = art.find("p", class_="date")
-            if date_node:
-                try:
-                    tanggal = dateparser.parse(date_node.get_text(strip=True)).date()
-                except Exception:
-                    pass
-            if not tanggal:
-                tanggal = datetime.now().date()
-            
-            if (start_date and tanggal < start_date) or (end_date and tanggal > end_date):
-                continue
-                
-            content_div = art.find("div", class_="post-content")
-            if content_div:
-                paras = content_div.find_all("p")
-                isi = " ".join(p.get_text(strip=True) for p in paras)
-                results.append({"judul": title.strip(), "link": link, "tanggal": tanggal, "isi": isi})
+            links = parse_listing(html)
+            if not links:
+                break
+            # entri yang tanggalnya sudah terlihat di listing disaring tanpa fetch artikel
+            links, reached_start = filter_listing(links, start_date, end_date, SORTED_NEWEST_FIRST)
+
+            for title, link, _ in links:
+                if total >= max_articles:
+                    break
+                record = fetch_article(fetcher, title, link, parse_article)
+                if record is None:
+                    continue
+
+                tanggal = record["tanggal"]
+                if (start_date and tanggal < start_date) or (end_date and tanggal > end_date):
+                    continue
+
+                yield record
                 total += 1
+            if reached_start:
+                break
+    finally:
+        if close_fetcher:
+            fetcher.close()
 
-    df = pd.DataFrame(results)
+def parse_antara(fetcher=None, start_date=None, end_date=None, max_pages=2, max_articles=50, simpan=False, output_file='antara_lampung.xlsx', driver=None):
+    """Versi DataFrame dari iter_antara() (mengumpulkan semua record)."""
+    df = pd.DataFrame(list(iter_antara(fetcher, start_date=start_date, end_date=end_date, max_pages=max_pages, max_articles=max_articles, driver=driver)))
     if simpan and not df.empty:
-        df.to_excel(output_file, index=False)
+        # simpan ke article_store; Excel hanya ekspor dari store
+        save_records(df.to_dict("records"), PORTAL, output_file)
     return df
\ No newline at end of file
@@ -0,0 +1,206 @@
+# pipeline.py
+# Pipeline streaming dari parser sampai output: record artikel mengalir satu
+# per satu lewat generator (dedupe -> klasifikasi per micro-batch -> sink),
+# sehingga hasil pertama bisa ditampilkan/disimpan dalam hitungan detik dan
+# pemakaian memori tidak bergantung pada jumlah artikel yang di-crawl.
+import traceback
+
+from metrics import ARTICLES, timed
+from portals import PORTALS, load_iter
+from url_canon import SeenSet
+
+# jumlah artikel per panggilan model.predict
+CLASSIFY_BATCH_SIZE = 8
+# jumlah record per transaksi upsert ke article_store
+STORE_BATCH_SIZE = 50
+# nama tampilan -> kunci portal (label metrik memakai kunci, sama dengan fetcher/parser)
+_PORTAL_KEYS = {p["name"]: key for key, p in PORTALS.items()}
+
+
+def from_crawl(pairs):
+    """(portal_key, record) dari crawler.iter_crawl -> record dengan kolom "portal" (nama tampilan)."""
+    for key, record in pairs:
+        yield dict(record, portal=PORTALS[key]["name"])
+
+
+def from_parsers(fetchers, keys=None, **kwargs):
+    """Jalankan generator iter_* tiap portal berurutan; parser yang gagal dilewati."""
+    for key in keys or PORTALS:
+        print(f"--- Menjalankan parser: {PORTALS[key]['name']} ---")
+        try:
+            yield from from_crawl((key, record) for record in load_iter(key)(fetcher=fetchers.for_portal(key), **kwargs))
+        except Exception as e:
+            print(f"[WARNING] Parser {PORTALS[key]['iter']} gagal: {e}")
+            traceback.print_exc()
+
+
+def dedupe(records, seen=None):
+    """Lewati record yang link kanoniknya sudah pernah lewat (termasuk lintas portal)."""
+    seen = seen if seen is not None else SeenSet()
+    for record in records:
+        if seen.add(record["link"]):
+            yield record
+
+
+def _predict(model, batch):
+    # (labels, scores); model dengan score_batch (prefilter.PrefilterCascade) juga memberi skor
+    if model is None:
+        return [-1] * len(batch), [None] * len(batch)
+    texts = [str(r.get("isi") or "") for r in batch]
+    try:
+        if hasattr(model, "score_batch"):
+            return model.score_batch(texts)
+        return list(model.predict(texts)), [None] * len(batch)
+    except Exception as e:
+        print(f"[WARNING] Klasifikasi gagal: {e}")
+        return [-1] * len(batch), [None] * len(batch)
+
+
+def _labelled(batch, model):
+    with timed("classify"):
+        labels, scores = _predict(model, batch)
+    for r, label, score in zip(batch, labels, scores):
+        r["label"] = int(label)
+        r["score"] = score
+        ARTICLES.inc(portal=_PORTAL_KEYS.get(r.get("portal"), r.get("portal", "-")), label=r["label"])
+        yield r
+
+
+def classify(records, model, batch_size=CLASSIFY_BATCH_SIZE):
+    """
+    Tambahkan kolom "label" (dan "score" = P(ekonomi), None kalau tidak ada)
+    per micro-batch; label -1 kalau model tidak ada/gagal.
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield from _labelled(batch, model)
+            batch = []
+    if batch:
+        yield from _labelled(batch, model)
+
+
+def run(records, sinks):
+    """
+    Kirim setiap record ke semua sink (callable); sink dengan .close() ditutup
+    di akhir. Kalau run gagal, .abort() dipanggil dulu pada sink yang punya
+    (hasil yang baru sebagian tidak boleh di-commit sebagai run yang selesai).
+    """
+    count = 0
+    try:
+        for record in records:
+            for sink in sinks:
+                sink(record)
+            count += 1
+    except BaseException:
+        for sink in sinks:
+            abort = getattr(sink, "abort", None)
+            if abort is not None:
+                abort()
+        raise
+    finally:
+        for sink in sinks:
+            close = getattr(sink, "close", None)
+            if close is not None:
+                close()
+    return count
+
+
+# --- sink ---
+class CollectSink:
+    """Mengumpulkan record di memori (untuk API yang tetap mengembalikan DataFrame)."""
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, record):
+        self.records.append(record)
+
+    def frame(self):
+        import pandas as pd
+        return pd.DataFrame(self.records)
+
+
+class ExcelSink:
+    """Menulis record ke .xlsx baris per baris (openpyxl write-only), disimpan saat close()."""
+
+    def __init__(self, path, where=None, columns=("judul", "link", "tanggal", "isi", "portal", "label", "score")):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.where = where
+        self.columns = list(columns)
+        self.rows = 0
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet()
+        self._ws.append(self.columns)
+
+    def __call__(self, record):
+        if self.where is not None and not self.where(record):
+            return
+        self._ws.append([record.get(c) for c in self.columns])
+        self.rows += 1
+
+    def close(self):
+        if self._wb is None:
+            return
+        if self.rows:
+            self._wb.save(self.path)
+            print(f"Hasil disimpan: {self.path} ({self.rows} baris)")
+        self._wb = None
+
+
+class StoreSink:
+    """Upsert record ke article_store.ArticleStore per batch (sisa batch di-commit saat close())."""
+
+    def __init__(self, store, batch_size=STORE_BATCH_SIZE):
+        self.store = store
+        self.batch_size = batch_size
+        self.rows = 0
+        self._batch = []
+
+    def __call__(self, record):
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        if self._batch:
+            self.rows += self.store.upsert_many(self._batch)
+            self._batch = []
+
+    def close(self):
+        self._flush()
+
+
+class StateSink:
+    """
+    Mencatat link+tanggal per portal lalu meneruskannya ke crawl_state saat
+    close(). Mark hanya dimajukan untuk portal yang dilaporkan lewat complete()
+    (crawler.iter_crawl on_complete); run yang gagal tidak menyimpan apa pun.
+    """
+
+    def __init__(self, state):
+        self.state = state
+        self._keys = {p["name"]: key for key, p in PORTALS.items()}
+        self.ingested = {}
+        self.completed = set()
+        self._aborted = False
+
+    def complete(self, key):
+        self.completed.add(key)
+
+    def abort(self):
+        self._aborted = True
+
+    def __call__(self, record):
+        key = self._keys.get(record.get("portal"), record.get("portal"))
+        self.ingested.setdefault(key, []).append({"link": record["link"], "tanggal": record.get("tanggal")})
+
+    def close(self):
+        if self._aborted:
+            return
+        for key in set(self.ingested) | self.completed:
+            self.state.update(key, self.ingested.get(key, []), reached_mark=key in self.completed)
+        self.state.save()
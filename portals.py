@@ -0,0 +1,82 @@
+# portals.py
+# Registry portal: nama tampilan, modul parser, dan fungsi parser sekuensialnya
+# (parse_* mengembalikan DataFrame, iter_* generator record per artikel).
+# Setiap modul parser menyediakan PORTAL, listing_url(page), parse_listing(html)
+# dan parse_article(html, title, link) yang dipakai crawler.py.
+import importlib
+from functools import lru_cache
+from urllib.parse import urlparse
+
+# "host", "rate" (request/detik) dan "burst" dipakai rate_limiter.HostRateLimiter;
+# "ready_selector" adalah elemen yang ditunggu browser sebelum HTML diambil
+# (listing atau artikel, mana saja yang muncul duluan). "feeds" (opsional):
+# RSS/Atom atau sitemap yang dicoba berurutan oleh discovery.py sebelum
+# halaman listing HTML; cakupannya harus sama dengan listing portal itu.
+PORTALS = {
+    "detik": {
+        "name": "Detik Lampung", "module": "parser_detik", "parser": "parse_detik_lampung", "iter": "iter_detik_lampung",
+        "host": "www.detik.com", "rate": 4.0, "burst": 4,
+        "ready_selector": "article, .detail__body-text",
+    },
+    "rmol": {
+        "name": "RMOL Lampung", "module": "parser_rmol", "parser": "parse_rmol_lampung", "iter": "iter_rmol_lampung",
+        "host": "rmollampung.id", "rate": 2.0, "burst": 2,
+        "ready_selector": "div.read-content, a[href*='/berita/']",
+        "feeds": ["https://rmollampung.id/rss"],
+    },
+    "antara": {
+        "name": "Antara News", "module": "parsersAntara", "parser": "parse_antara", "iter": "iter_antara",
+        "host": "lampung.antaranews.com", "rate": 3.0, "burst": 3,
+        "ready_selector": "div.post-content, a.figure",
+        "feeds": ["https://lampung.antaranews.com/rss/terkini.xml"],
+    },
+    "lampost": {
+        "name": "Lampost", "module": "lampost_parser", "parser": "parse_lampost", "iter": "iter_lampost",
+        "host": "lampost.co.id", "rate": 2.0, "burst": 2,
+        "ready_selector": "div.entry-content, h2.title a",
+        # WordPress: feed tag yang sama dengan listing /tag/lampung/
+        "feeds": ["https://lampost.co.id/tag/lampung/feed/"],
+    },
+    "radarlampung": {
+        "name": "Radar Lampung", "module": "parser_radarlampung", "parser": "parse_radar_lampung", "iter": "iter_radar_lampung",
+        "host": "radarlampung.disway.id", "rate": 1.0, "burst": 2,
+        "ready_selector": "time, p a[href]",
+    },
+}
+
+
+def load_portal(key):
+    """Mengimpor modul parser untuk portal `key`."""
+    return importlib.import_module(PORTALS[key]["module"])
+
+
+def load_parser(key):
+    """Mengembalikan fungsi parser sekuensial (parse_*) untuk portal `key`."""
+    return getattr(load_portal(key), PORTALS[key]["parser"])
+
+
+def load_iter(key):
+    """Mengembalikan generator parser sekuensial (iter_*) untuk portal `key`."""
+    return getattr(load_portal(key), PORTALS[key]["iter"])
+
+
+def host_limits():
+    """{host: (rate, burst)} untuk HostRateLimiter."""
+    return {p["host"]: (p["rate"], p["burst"]) for p in PORTALS.values()}
+
+
+@lru_cache(maxsize=256)
+def _portal_for_host(host):
+    host = host.lower()
+    for key, portal in PORTALS.items():
+        domain = portal["host"]
+        if domain.startswith("www."):
+            domain = domain[4:]
+        if host == domain or host.endswith("." + domain):
+            return key
+    return None
+
+
+def portal_for_url(url):
+    """Kunci portal untuk `url` (subdomain termasuk), atau None kalau host-nya tidak dikenal."""
+    return _portal_for_host(urlparse(url).netloc)
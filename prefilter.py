@@ -0,0 +1,176 @@
+# prefilter.py
+# Cascade murah sebelum model: scan leksikon istilah ekonomi (Aho-Corasick
+# lewat pyahocorasick kalau terpasang, fallback ke satu regex gabungan).
+# Artikel tanpa istilah ekonomi spesifik (atau beberapa istilah umum
+# sekaligus) langsung dilabeli non-ekonomi tanpa TF-IDF + SVM; sisanya
+# diteruskan ke model dan skor predict_proba-nya dicatat (beserta pita keyakinan).
+import re
+import threading
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# istilah yang spesifik ekonomi: satu saja cukup untuk meneruskan artikel ke model
+ECONOMY_TERMS = (
+    "ekonomi", "perekonomian", "inflasi", "deflasi", "umkm", "ukm", "investasi", "investor",
+    "apbd", "apbn", "ekspor", "impor", "perbankan", "kredit", "rupiah", "dolar", "saham", "bursa",
+    "pajak", "retribusi", "anggaran", "komoditas", "sembako", "bbm", "subsidi", "upah", "umr", "ump",
+    "umk", "pengangguran", "kemiskinan", "pdrb", "bps", "neraca", "perdagangan", "industri", "koperasi",
+    "bumn", "bumd", "ojk", "bank indonesia", "keuangan", "fiskal", "moneter", "devisa", "pengusaha",
+    "wirausaha", "laba", "omzet", "dana desa", "insentif", "stimulus", "daya beli", "nilai tukar",
+    "suku bunga", "qris", "pembiayaan", "ekonomi kreatif", "hilirisasi", "agribisnis", "pertumbuhan ekonomi",
+    "harga cabai", "harga beras", "harga bbm", "tenaga kerja", "lapangan kerja",
+)
+# istilah umum yang juga sering muncul di berita non-ekonomi ("harga diri", "pasar malam",
+# "usaha polisi", "belanja pegawai"): baru dihitung kalau beberapa muncul bersamaan
+BROAD_TERMS = (
+    "harga", "pasar", "usaha", "belanja", "bank", "pinjaman", "pendapatan", "pedagang", "beras", "cabai",
+    "gabah", "bansos", "gaji", "pertumbuhan", "pabrik", "tarif", "bisnis", "modal", "penjualan",
+    "produksi", "panen", "petani", "nelayan", "pariwisata", "properti", "logistik", "pelabuhan",
+    "infrastruktur", "konsumsi",
+)
+# artikel diteruskan ke model kalau punya minimal PREFILTER_MIN_TERMS istilah spesifik
+# berbeda, atau minimal PREFILTER_MIN_BROAD_TERMS istilah umum berbeda (setel dengan bench_prefilter.py)
+PREFILTER_MIN_TERMS = 1
+PREFILTER_MIN_BROAD_TERMS = 2
+# pita keyakinan predict_proba: di antara LOW dan HIGH dianggap ragu-ragu
+CONFIDENCE_LOW = 0.35
+CONFIDENCE_HIGH = 0.65
+PREFILTER_ENABLED = True
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """Mencari istilah (utuh per kata, tanpa beda huruf besar/kecil) di teks."""
+
+    def __init__(self, terms=ECONOMY_TERMS, broad_terms=BROAD_TERMS):
+        self.broad = frozenset(t.lower() for t in broad_terms)
+        self.terms = tuple(sorted({t.lower() for t in terms} | self.broad))
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for term in self.terms:
+                self._automaton.add_word(term, term)
+            self._automaton.make_automaton()
+            self._regex = None
+        else:
+            self._automaton = None
+            alternation = "|".join(re.escape(t) for t in sorted(self.terms, key=len, reverse=True))
+            self._regex = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)")
+
+    def _iter(self, text):
+        text = (text or "").lower()
+        if self._regex is not None:
+            for m in self._regex.finditer(text):
+                yield m.group(0)
+            return
+        n = len(text)
+        hits = []
+        for end, term in self._automaton.iter(text):
+            start = end - len(term) + 1
+            if (start == 0 or not _is_word_char(text[start - 1])) and (end + 1 >= n or not _is_word_char(text[end + 1])):
+                hits.append((start, -len(term), term))
+        # automaton memberi semua kemunculan yang tumpang tindih ("harga cabai" dan "harga");
+        # ambil yang paling kiri lalu paling panjang, tanpa tumpang tindih, sama seperti regex
+        pos = 0
+        for start, neg_len, term in sorted(hits):
+            if start >= pos:
+                pos = start - neg_len
+                yield term
+
+    def matches(self, text):
+        """Himpunan istilah yang muncul di `text`."""
+        return set(self._iter(text))
+
+    def has_at_least(self, text, n, n_broad=None):
+        """
+        True begitu `n` istilah spesifik berbeda, atau `n_broad` istilah umum
+        berbeda (None = istilah umum dihitung sama dengan yang spesifik),
+        ditemukan; scan berhenti lebih awal.
+        """
+        if n <= 0:
+            return True
+        found, broad = set(), set()
+        for term in self._iter(text):
+            if n_broad is not None and term in self.broad:
+                broad.add(term)
+                if len(broad) >= n_broad:
+                    return True
+                continue
+            found.add(term)
+            if len(found) >= n:
+                return True
+        return False
+
+
+def label_and_proba(model, texts):
+    """(label, P(kelas positif) atau None) dengan satu kali scoring kalau model mendukungnya."""
+    if hasattr(model, "predict_with_proba"):
+        return model.predict_with_proba(texts)
+    if hasattr(model, "predict_proba"):
+        # CalibratedClassifierCV.predict = classes_[argmax(predict_proba)], jadi label tetap sama
+        proba = model.predict_proba(texts)
+        return list(model.classes_[proba.argmax(axis=1)]), proba[:, 1]
+    return list(model.predict(texts)), None
+
+
+class PrefilterCascade:
+    """
+    Pembungkus model dengan API predict/score_batch. Artikel tanpa cukup istilah
+    ekonomi dilabeli negatif tanpa memanggil model; sisanya memakai
+    predict_proba model (kalau ada) dan skornya dikembalikan.
+    """
+
+    def __init__(self, model, matcher=None, min_terms=PREFILTER_MIN_TERMS, min_broad_terms=PREFILTER_MIN_BROAD_TERMS,
+                 low=CONFIDENCE_LOW, high=CONFIDENCE_HIGH):
+        self.model = model
+        self.matcher = matcher or KeywordMatcher()
+        self.min_terms = min_terms
+        self.min_broad_terms = min_broad_terms
+        self.low = low
+        self.high = high
+        classes = getattr(model, "classes_", None)
+        self.classes_ = classes if classes is not None else [0, 1]
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"total": 0, "skipped": 0, "model_calls": 0, "yakin": 0, "ragu": 0}
+
+    def passes(self, text):
+        """True kalau `text` cukup berbau ekonomi untuk diteruskan ke model."""
+        return self.matcher.has_at_least(text, self.min_terms, self.min_broad_terms)
+
+    def score_batch(self, texts):
+        """(labels, scores); score None untuk artikel yang disaring prefilter."""
+        texts = [str(t or "") for t in texts]
+        labels = [self.classes_[0]] * len(texts)
+        scores = [None] * len(texts)
+        todo = [i for i, t in enumerate(texts) if self.passes(t)]
+        if todo:
+            batch = [texts[i] for i in todo]
+            predicted, proba = label_and_proba(self.model, batch)
+            for j, i in enumerate(todo):
+                labels[i] = predicted[j]
+                scores[i] = None if proba is None else float(proba[j])
+        scored = [scores[i] for i in todo if scores[i] is not None]
+        ragu = sum(1 for p in scored if self.low < p < self.high)
+        with self._lock:
+            self.stats["total"] += len(texts)
+            self.stats["skipped"] += len(texts) - len(todo)
+            self.stats["model_calls"] += len(todo)
+            self.stats["ragu"] += ragu
+            self.stats["yakin"] += len(scored) - ragu
+        return labels, scores
+
+    def predict(self, texts):
+        return self.score_batch(texts)[0]
+
+    def summary(self):
+        s = dict(self.stats)
+        s["skipped_ratio"] = (s["skipped"] / s["total"]) if s["total"] else 0.0
+        return s
@@ -0,0 +1,101 @@
+# rate_limiter.py
+# Token bucket per host untuk menjaga kesopanan crawl, dengan backoff adaptif:
+# laju diturunkan saat server membalas 429/5xx atau merespons lambat, lalu
+# dinaikkan lagi pelan-pelan setelah request berhasil.
+import threading
+import time
+from urllib.parse import urlparse
+
+DEFAULT_RATE = 2.0        # request per detik per host
+DEFAULT_BURST = 2
+SLOW_RESPONSE_SECONDS = 5.0
+# laju tidak pernah turun di bawah fraksi ini dari laju dasarnya
+MIN_RATE_FACTOR = 0.1
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class _Bucket:
+    def __init__(self, rate, burst):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostRateLimiter:
+    """
+    Rate limiter per host. `limits` berisi {host: (rate, burst)}; host lain
+    memakai DEFAULT_RATE / DEFAULT_BURST. Aman dipakai dari banyak thread.
+    """
+
+    def __init__(self, limits=None, default_rate=DEFAULT_RATE, default_burst=DEFAULT_BURST,
+                 slow_threshold=SLOW_RESPONSE_SECONDS):
+        self.limits = {h.lower(): v for h, v in (limits or {}).items()}
+        self.default = (default_rate, default_burst)
+        self.slow_threshold = slow_threshold
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        b = self._buckets.get(host)
+        if b is None:
+            rate, burst = self.limits.get(host, self.default)
+            b = self._buckets[host] = _Bucket(rate, burst)
+        return b
+
+    def acquire(self, url):
+        """Blok sampai host dari `url` boleh di-request lagi."""
+        host = urlparse(url).netloc.lower()
+        while True:
+            with self._lock:
+                b = self._bucket(host)
+                now = time.monotonic()
+                b.refill(now)
+                wait = b.blocked_until - now
+                if wait <= 0:
+                    if b.tokens >= 1:
+                        b.tokens -= 1
+                        return
+                    wait = (1 - b.tokens) / b.rate
+            time.sleep(wait)
+
+    def feedback(self, url, status=None, elapsed=None, retry_after=None):
+        """
+        Laporkan hasil request. status None berarti error koneksi/timeout.
+        429/5xx/error -> laju dipotong setengah (dan jeda sesuai Retry-After),
+        respons lambat -> laju diturunkan sedikit, sukses -> laju naik pelan.
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            b = self._bucket(host)
+            now = time.monotonic()
+            min_rate = b.base_rate * MIN_RATE_FACTOR
+            if status is None or status == 429 or status >= 500:
+                b.rate = max(min_rate, b.rate / 2)
+                b.tokens = 0.0
+                pause = retry_after if retry_after is not None else 1.0 / b.rate
+                b.blocked_until = max(b.blocked_until, now + min(pause, MAX_BACKOFF_SECONDS))
+            elif elapsed is not None and elapsed > self.slow_threshold:
+                b.rate = max(min_rate, b.rate * 0.8)
+            else:
+                b.rate = min(b.base_rate, b.rate + b.base_rate * 0.1)
+
+    def current_rate(self, host):
+        with self._lock:
+            return self._bucket(host.lower()).rate
+
+
+def parse_retry_after(value):
+    """Nilai header Retry-After (detik) atau None; format tanggal HTTP diabaikan."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,226 @@
+# replay.py
+# Record/replay halaman portal untuk benchmark dan uji regresi offline.
+# record() mengambil halaman listing + artikel tiap portal sekali lalu
+# menyimpannya di fixtures/<portal>/listing_<n>.html dan article_<n>.html
+# (layout yang sama dengan bench_parsing.py), feed/sitemap portal di
+# feed_<n>.xml (discovery.py), beserta manifest.json berisi
+# URL asli -> nama file. FixtureServer menyajikannya lewat HTTP lokal di
+# /<portal>/<path asli>?<query asli>, dengan latensi buatan yang bisa diatur;
+# ReplayFetcherSet mengarahkan URL portal ke server itu sehingga parser dan
+# scrape_dan_klasifikasi berjalan tanpa menyentuh situs aslinya.
+#
+#   python replay.py record [portal ...]
+#   python replay.py serve [latency_detik] [jitter_detik]
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from portals import PORTALS, load_portal, portal_for_url
+from rate_limiter import HostRateLimiter
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+MANIFEST_NAME = "manifest.json"
+RECORD_PAGES = 2
+RECORD_ARTICLES = 10
+# server lokal tidak perlu dibatasi; yang diukur parser, bukan sopan santun ke host
+_UNLIMITED = 1e9
+
+
+def _request_key(url):
+    """Bagian URL yang dipakai mencocokkan request: path + query (tanpa fragment)."""
+    parts = urlsplit(url)
+    return (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+
+
+def _write(folder, name, html):
+    with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+        f.write(html)
+
+
+def record(keys=None, pages=RECORD_PAGES, articles=RECORD_ARTICLES, fixtures_dir=FIXTURES_DIR, fetchers=None):
+    """Ambil `pages` halaman listing dan `articles` artikel pertama tiap portal dari situs aslinya."""
+    from fetcher import FetcherSet
+
+    own = fetchers is None
+    fetchers = fetchers or FetcherSet()
+    try:
+        for key in keys or PORTALS:
+            module = load_portal(key)
+            fetcher = fetchers.for_portal(key)
+            folder = os.path.join(fixtures_dir, key)
+            os.makedirs(folder, exist_ok=True)
+            manifest, links = {}, []
+            for n, url in enumerate(PORTALS[key].get("feeds", ()), 1):
+                xml = fetcher.get(url)
+                if xml is not None:
+                    _write(folder, f"feed_{n}.xml", xml)
+                    manifest[_request_key(url)] = f"feed_{n}.xml"
+            for page in range(1, pages + 1):
+                url = module.listing_url(page)
+                html = fetcher.get(url)
+                if html is None:
+                    print(f"[WARNING] {key}: listing {url} gagal diambil")
+                    continue
+                name = f"listing_{page}.html"
+                _write(folder, name, html)
+                manifest[_request_key(url)] = name
+                links.extend(module.parse_listing(html))
+            saved = 0
+            for _, link, _ in links:
+                if saved >= articles:
+                    break
+                if _request_key(link) in manifest:
+                    continue
+                html = fetcher.get(link)
+                if html is None:
+                    continue
+                saved += 1
+                name = f"article_{saved}.html"
+                _write(folder, name, html)
+                manifest[_request_key(link)] = name
+            with open(os.path.join(folder, MANIFEST_NAME), "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=1, ensure_ascii=False)
+            print(f"{PORTALS[key]['name']}: {len(manifest) - saved} listing/feed, {saved} artikel -> {folder}")
+    finally:
+        if own:
+            fetchers.close()
+
+
+def load_manifests(fixtures_dir=FIXTURES_DIR):
+    """{portal: {path?query: path file}} untuk portal yang punya manifest."""
+    manifests = {}
+    for key in PORTALS:
+        path = os.path.join(fixtures_dir, key, MANIFEST_NAME)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                manifests[key] = {k: os.path.join(fixtures_dir, key, v) for k, v in json.load(f).items()}
+    return manifests
+
+
+class FixtureServer:
+    """
+    Server HTTP lokal (thread sendiri) yang meniru kelima portal dari fixture.
+    Setiap response ditunda `latency` + uniform(0, `jitter`) detik.
+    """
+
+    def __init__(self, fixtures_dir=FIXTURES_DIR, latency=0.0, jitter=0.0, host="127.0.0.1", port=0):
+        self.manifests = load_manifests(fixtures_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.misses = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0.0)
+                if delay:
+                    time.sleep(delay)
+                key, _, rest = self.path.lstrip("/").partition("/")
+                path = server.manifests.get(key, {}).get(_request_key("/" + rest))
+                if path is None:
+                    server.misses += 1
+                    self.send_error(404)
+                    return
+                with open(path, "rb") as f:
+                    body = f.read()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def local_url(base_url, url):
+    """URL portal -> URL di FixtureServer; URL host lain dikembalikan apa adanya."""
+    key = portal_for_url(url)
+    if key is None:
+        return url
+    return f"{base_url}/{key}{_request_key(url)}"
+
+
+class ReplayFetcher:
+    """Fetcher yang mengambil URL portal dari FixtureServer lewat HttpFetcher bersama."""
+
+    def __init__(self, base_url, http, requested=None):
+        self.base_url = base_url
+        self.http = http
+        self.requested = requested if requested is not None else {}
+        self.cache = None
+
+    def get(self, url):
+        # waktu request pertama per URL asli (untuk latensi per artikel di bench_scrape.py)
+        self.requested.setdefault(url, time.perf_counter())
+        return self.http.get(local_url(self.base_url, url))
+
+    def close(self):
+        pass
+
+
+class ReplayFetcherSet:
+    """Pengganti fetcher.FetcherSet (for_portal/close) yang diarahkan ke FixtureServer."""
+
+    def __init__(self, base_url, pool_size=20):
+        from fetcher import HttpFetcher
+
+        self.base_url = base_url
+        self.cache = None
+        self.requested = {}  # URL asli -> perf_counter() request pertama
+        self.http = HttpFetcher(pool_size=pool_size, retries=1,
+                                limiter=HostRateLimiter(default_rate=_UNLIMITED, default_burst=_UNLIMITED))
+
+    def for_portal(self, portal):
+        return ReplayFetcher(self.base_url, self.http, self.requested)
+
+    def close(self):
+        self.http.close()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "record":
+        record(args[1:] or None)
+    elif args and args[0] == "serve":
+        srv = FixtureServer(latency=float(args[1]) if len(args) > 1 else 0.0,
+                            jitter=float(args[2]) if len(args) > 2 else 0.0, port=8000).start()
+        print(f"Fixture server di {srv.url} (portal: {', '.join(srv.manifests) or '-'}); Ctrl+C untuk berhenti")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            srv.stop()
+    else:
+        print("Usage: python replay.py record [portal ...] | serve [latency] [jitter]")
@@ -0,0 +1,164 @@
+# scheduler.py
+# Daemon crawler: tiap portal di-crawl incremental dengan intervalnya sendiri
+# (plus jitter supaya tidak selalu menembak host di detik yang sama), paling
+# banyak MAX_CONCURRENT portal sekaligus. Artikel diklasifikasi dan di-upsert
+# ke article_store, sehingga web app cukup membaca hasil yang sudah jadi.
+#
+#   python scheduler.py [portal ...]      (atau: python main.py --daemon)
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from metrics import configure_logging, log_event
+from portals import PORTALS
+
+# jeda antar crawl per portal (detik); portal yang tidak tercantum memakai DEFAULT_INTERVAL
+DEFAULT_INTERVAL = 15 * 60
+PORTAL_INTERVALS = {
+    "detik": 10 * 60,
+    "antara": 10 * 60,
+    "lampost": 15 * 60,
+    "rmol": 20 * 60,
+    "radarlampung": 20 * 60,
+}
+# jitter sebagai fraksi interval (0.2 -> +/- 20%)
+JITTER = 0.2
+# jumlah portal yang boleh di-crawl bersamaan
+MAX_CONCURRENT = 2
+# batas artikel per portal per run (incremental: biasanya jauh lebih sedikit yang baru)
+MAX_ARTICLES_PER_RUN = 50
+# run yang mencapai batas di atas belum sampai ke high-water mark; sisa artikelnya
+# diambil run berikutnya, yang dijadwalkan lebih cepat dari interval biasa
+BACKLOG_INTERVAL = 60
+
+
+class CrawlScheduler:
+    """
+    Menjadwalkan scrape_dan_klasifikasi per portal. Store, crawl state, indeks
+    near-duplicate dan sesi browser dipakai bersama semua run dalam proses ini.
+    """
+
+    def __init__(self, portals=None, intervals=None, jitter=JITTER, max_concurrent=MAX_CONCURRENT,
+                 max_articles=MAX_ARTICLES_PER_RUN, data_dir=None, fetcher_factory=None):
+        from article_store import ArticleStore
+        from crawl_state import CrawlState
+        from near_dup import NearDupIndex
+        from scraper_all import _data_paths
+
+        self.portals = list(portals or PORTALS)
+        self.intervals = dict(PORTAL_INTERVALS, **(intervals or {}))
+        self.jitter = jitter
+        self.max_concurrent = max_concurrent
+        self.max_articles = max_articles
+        self.data_dir = data_dir
+        # callable() -> FetcherSet baru per run (misal replay.ReplayFetcherSet); default FetcherSet biasa
+        self.fetcher_factory = fetcher_factory
+        paths = _data_paths(data_dir)
+        self.store = ArticleStore(**paths["store"])
+        self.state = CrawlState(**paths["state"])
+        self.near_dups = NearDupIndex.load(**paths["near_dups"])
+        self.runs = {}  # portal -> {"at", "seconds", "articles", "error"} run terakhir
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _delay(self, key, first=False):
+        interval = self.intervals.get(key, DEFAULT_INTERVAL)
+        if not first and self.runs.get(key, {}).get("articles", 0) >= self.max_articles:
+            interval = min(interval, BACKLOG_INTERVAL)
+        if first:
+            # run pertama disebar di awal interval supaya portal tidak mulai bersamaan
+            return random.uniform(0, interval * self.jitter)
+        return max(1.0, interval * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def run_once(self, key):
+        """Crawl incremental satu portal; mengembalikan jumlah artikel yang di-ingest."""
+        from browser_session import SESSIONS
+        from scraper_all import scrape_dan_klasifikasi
+
+        count = [0]
+
+        def counter(record):
+            count[0] += 1
+
+        t0 = time.perf_counter()
+        error = None
+        fetchers = self.fetcher_factory() if self.fetcher_factory is not None else None
+        try:
+            scrape_dan_klasifikasi(max_articles=self.max_articles, incremental=True, collect=False,
+                                   sinks=[counter], store=self.store, portals=[key], data_dir=self.data_dir,
+                                   fetchers=fetchers, browser_pool=SESSIONS.pool() if fetchers is None else None,
+                                   crawl_state=self.state, near_dup_index=self.near_dups)
+        except Exception as e:
+            error = str(e)
+            print(f"[WARNING] Crawl terjadwal {key} gagal: {e}")
+        seconds = time.perf_counter() - t0
+        self.runs[key] = {"at": time.time(), "seconds": round(seconds, 3), "articles": count[0], "error": error}
+        log_event("scheduled_run", portal=key, **self.runs[key])
+        return count[0]
+
+    def run_forever(self):
+        """Loop utama sampai stop(); portal yang jatuh tempo menunggu slot kalau budget penuh."""
+        now = time.monotonic()
+        due = [(now + self._delay(key, first=True), key) for key in self.portals]
+        heapq.heapify(due)
+        running = {}
+        print(f"[INFO] Scheduler jalan: {', '.join(self.portals)} (maks {self.max_concurrent} bersamaan)")
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_concurrent, thread_name_prefix="crawl") as pool:
+                while not self._stop.is_set():
+                    now = time.monotonic()
+                    while due and due[0][0] <= now and len(running) < self.max_concurrent:
+                        _, key = heapq.heappop(due)
+                        running[pool.submit(self.run_once, key)] = key
+                    timeout = max(0.0, due[0][0] - now) if due and len(running) < self.max_concurrent else 1.0
+                    timeout = min(timeout, 1.0)  # tetap responsif terhadap stop()
+                    if running:
+                        done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                        for fut in done:
+                            key = running.pop(fut)
+                            heapq.heappush(due, (time.monotonic() + self._delay(key), key))
+                    else:
+                        self._stop.wait(timeout)
+                # run yang sedang jalan diselesaikan dulu (keluar dari with menunggu semuanya)
+        finally:
+            self.close()
+
+    def start(self):
+        """Jalankan run_forever() di thread background (misal di dalam proses lain)."""
+        self._thread = threading.Thread(target=self.run_forever, name="crawl-scheduler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def close(self):
+        from browser_session import SESSIONS
+
+        SESSIONS.close()
+        self.store.close()
+
+
+def run_scheduler(portals=None, **kwargs):
+    """Entry point daemon: jalan sampai Ctrl+C / SIGTERM."""
+    import signal
+
+    configure_logging()
+    scheduler = CrawlScheduler(portals, **kwargs)
+    # SIGTERM (systemd/docker stop) diperlakukan sama dengan Ctrl+C
+    signal.signal(signal.SIGTERM, lambda *_: scheduler.stop())
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        pass
+    print("[INFO] Scheduler berhenti.")
+
+
+if __name__ == "__main__":
+    import sys
+
+    run_scheduler(sys.argv[1:] or None)
@@ -1,43 +1,25 @@
 # scraper_all.py (Optimized)
 import os
+import time
 import pandas as pd
 import traceback
-import joblib
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium import webdriver
-
-# Fungsi untuk membuat driver dipindahkan ke sini
-def _make_chrome_driver(headless=True):
-    """Membuat satu instance Chrome driver yang akan digunakan kembali."""
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1920,1080")
-    options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    options.add_experimental_option('useAutomationExtension', False)
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    
-    # Blok ini untuk mencegah deteksi otomatisasi
-    try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-            "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-        })
-    except Exception as e:
-        print(f"Gagal menginstal/setup ChromeDriver, coba cara manual: {e}")
-        # Fallback jika webdriver-manager gagal (misalnya karena firewall)
-        driver = webdriver.Chrome(options=options)
+from browser_profile import make_chrome_driver
+from fetcher import FetcherSet
+from portals import PORTALS
+from crawler import iter_crawl
+from driver_pool import DRIVER_POOL_SIZE
+from article_cache import ArticleCache
+from article_store import ArticleStore
+from crawl_state import CrawlState
+from model_registry import get_model, preferred_model_path
+from near_dup import NearDupIndex, near_dedupe
+from prefilter import PREFILTER_ENABLED, PrefilterCascade
+from metrics import STAGE_SECONDS, log_event
+from pipeline import CollectSink, StateSink, StoreSink, classify, dedupe, from_crawl, from_parsers
+from pipeline import run as run_pipeline
 
-    driver.set_page_load_timeout(30)
-    driver.set_script_timeout(30)
-    print("[INFO] Chrome driver berhasil dibuat.")
-    return driver
+# Pembuatan Chrome driver (profil ramping) ada di browser_profile.py; nama lama tetap tersedia
+_make_chrome_driver = make_chrome_driver
 
 # ... (Fungsi _try_call dan _load_model_safe tetap sama) ...
 def _try_call(parser_fn, *args, **kwargs):
@@ -49,70 +31,143 @@ def _try_call(parser_fn, *args, **kwargs):
         return pd.DataFrame()
 
 def _load_model_safe(model_path="model_berita_svm2.pkl"):
-    candidate = os.path.join(os.path.dirname(__file__), model_path)
-    if not os.path.exists(candidate):
-        print(f"[INFO] Model tidak ditemukan di {candidate}. Lewati klasifikasi.")
-        return None
-    try:
-        model = joblib.load(candidate)
-        print(f"[INFO] Model berhasil dimuat: {candidate}")
-        return model
-    except Exception as e:
-        print(f"[WARNING] Gagal memuat model: {e}")
-        return None
+    # Model di-load sekali per proses dan di-load ulang hanya kalau file-nya berubah (model_registry.py).
+    # Kalau ada hasil distilasi (.npz, lihat fast_model.py) yang tidak lebih tua dari .pkl, itu yang dipakai.
+    return get_model(preferred_model_path(os.path.join(os.path.dirname(__file__), model_path)))
 
 
-# Fungsi utama yang dimodifikasi
-def scrape_dan_klasifikasi(start_date=None, end_date=None, max_articles=5):
-    # Buat SATU driver untuk semua parser
-    driver = _make_chrome_driver(headless=True)
-    
-    dfs = []
-    # Import parsers
-    from parser_detik import parse_detik_lampung
-    from parser_rmol import parse_rmol_lampung
-    from parsersAntara import parse_antara
-    from lampost_parser import parse_lampost
-    from parser_radarlampung import parse_radar_lampung
-
-    parsers = {
-        "Detik Lampung": parse_detik_lampung,
-        "RMOL Lampung": parse_rmol_lampung,
-        "Antara News": parse_antara,
-        "Lampost": parse_lampost,
-        "Radar Lampung": parse_radar_lampung
+def _article_progress(progress):
+    """Sink pipeline -> event progress untuk `progress` (artikel yang sudah diklasifikasi)."""
+    def report(record):
+        progress({"type": "article", "portal": record.get("portal"), "judul": record.get("judul"),
+                  "link": record.get("link"), "tanggal": str(record.get("tanggal") or ""),
+                  "label": record.get("label")})
+    return report
+
+
+def _stage(progress, stage):
+    """Laporkan tahap run (crawl -> klasifikasi -> simpan -> selesai) ke `progress`, kalau ada."""
+    if progress is not None:
+        progress({"type": "stage", "stage": stage})
+
+
+def _first_record_stage(progress, stage):
+    """Sink pipeline yang melaporkan `stage` sekali, saat record pertama (sudah diklasifikasi) tiba."""
+    reported = []
+
+    def report(record):
+        if not reported:
+            reported.append(True)
+            _stage(progress, stage)
+    return report
+
+
+def _data_paths(data_dir):
+    """kwargs path untuk tiap penyimpanan; kosong (= default di folder proyek) kalau data_dir None."""
+    if data_dir is None:
+        return {"cache": {}, "state": {}, "near_dups": {}, "store": {}}
+    os.makedirs(data_dir, exist_ok=True)
+    return {
+        "cache": {"path": os.path.join(data_dir, "article_cache.sqlite")},
+        "state": {"path": os.path.join(data_dir, "crawl_state.json")},
+        "near_dups": {"path": os.path.join(data_dir, "near_dup_index.npz")},
+        "store": {"path": os.path.join(data_dir, "articles.sqlite")},
     }
 
+
+# Fungsi utama yang dimodifikasi
+def scrape_dan_klasifikasi(start_date=None, end_date=None, max_articles=5, fetch_modes=None,
+                           concurrent=True, max_pages=2, browser_pool_size=DRIVER_POOL_SIZE,
+                           use_cache=True, incremental=False, progress=None, sinks=(), collect=True,
+                           store=True, fetchers=None, data_dir=None, portals=None, browser_pool=None,
+                           crawl_state=None, near_dup_index=None):
+    # Satu pool HTTP untuk semua parser; Chrome (pool berisi beberapa instance)
+    # hanya dibuat kalau ada portal yang butuh. Artikel yang sudah pernah diambil
+    # dilayani dari cache di disk (lihat article_cache.py).
+    # max_pages=None: mode "crawl sampai tanggal", paging berhenti begitu listing melewati start_date.
+    # incremental=True: listing hanya dijalani sampai high-water mark run sebelumnya (crawl_state.py).
+    # Record mengalir lewat pipeline.py: dedupe -> klasifikasi per micro-batch -> sink, begitu artikel selesai.
+    # progress: callable(event_dict) untuk melaporkan artikel per portal dan tahap run (dipakai jobs.py).
+    # Pipeline-nya streaming, jadi tahap saling tumpang tindih: "klasifikasi" dilaporkan begitu
+    # artikel pertama selesai diklasifikasi, "simpan" saat crawl habis dan store/indeks ditutup.
+    # sinks: callable(record) tambahan (misal pipeline.ExcelSink); collect=False berarti record
+    # tidak dikumpulkan di memori dan yang dikembalikan dua DataFrame kosong.
+    # store: semua artikel di-upsert ke article_store (True = articles.sqlite, atau ArticleStore
+    # lain); Excel diekspor dari sana sesuai kebutuhan. False = tidak disimpan.
+    # fetchers: FetcherSet (atau objek dengan for_portal/close) pengganti yang dibuat di sini,
+    # misal replay.ReplayFetcherSet untuk benchmark offline.
+    # data_dir: folder untuk crawl state, cache, indeks near-duplicate dan store (default: folder proyek).
+    # portals: kunci portal yang di-crawl (default: semua di portals.PORTALS).
+    # browser_pool: DriverPool yang tetap hidup setelah run (browser_session.SESSIONS.pool());
+    # default pool baru yang Chrome-nya ditutup di akhir.
+    # crawl_state / near_dup_index: CrawlState / NearDupIndex yang dipakai bersama beberapa run
+    # yang jalan bersamaan (scheduler.py), supaya tidak saling menimpa file-nya.
+    model = _load_model_safe("model_berita_svm2.pkl")
+    if model is not None and PREFILTER_ENABLED:
+        # artikel tanpa istilah ekonomi tidak perlu melewati TF-IDF + SVM (lihat prefilter.py)
+        model = PrefilterCascade(model)
+    paths = _data_paths(data_dir)
+    cache = ArticleCache(**paths["cache"]) if use_cache else None
+    state = crawl_state if crawl_state is not None else CrawlState(**paths["state"])
+    if fetchers is None:
+        fetchers = FetcherSet(modes=fetch_modes, browser_pool_size=browser_pool_size, cache=cache,
+                              browser_pool=browser_pool)
+
+    near_dups = near_dup_index if near_dup_index is not None else NearDupIndex.load(**paths["near_dups"])
+    collector = CollectSink() if collect else None
+    state_sink = StateSink(state)
+    all_sinks = [state_sink] + list(sinks)
+    if progress is not None:
+        all_sinks.insert(0, _first_record_stage(progress, "klasifikasi"))
+    # store=True: store dibuat (dan ditutup) di sini; ArticleStore dari pemanggil dibiarkan terbuka
+    own_store = ArticleStore(**paths["store"]) if store is True else None
+    if store:
+        all_sinks.append(StoreSink(own_store or store))
+    if collector is not None:
+        all_sinks.append(collector)
+    if progress is not None:
+        all_sinks.append(_article_progress(progress))
+    t_start = time.perf_counter()
+    _stage(progress, "crawl")
     try:
-        # Jalankan setiap parser dengan driver yang sama
-        for name, parser_func in parsers.items():
-            print(f"--- Menjalankan parser: {name} ---")
-            df = _try_call(parser_func, driver=driver, start_date=start_date, end_date=end_date, max_articles=max_articles)
-            if isinstance(df, pd.DataFrame) and not df.empty:
-                dfs.append(df)
+        if concurrent or incremental:
+            # Semua portal di-crawl bersamaan lewat satu scheduler (lihat crawler.py)
+            source = from_crawl(iter_crawl(fetchers, portals=portals, start_date=start_date, end_date=end_date,
+                                           max_articles=max_articles, max_pages=max_pages,
+                                           state=state if incremental else None,
+                                           on_complete=state_sink.complete if incremental else None))
+        else:
+            source = from_parsers(fetchers, keys=portals, start_date=start_date, end_date=end_date,
+                                  max_articles=max_articles, max_pages=max_pages)
+        # berita sindikasi yang ditulis ulang di portal lain hanya diklasifikasi/ditampilkan sekali (near_dup.py);
+        # salinan yang dilewati tetap dicatat di crawl state supaya tidak di-fetch ulang
+        total = run_pipeline(classify(near_dedupe(dedupe(source), near_dups, on_drop=state_sink), model), all_sinks)
     finally:
-        # Tutup driver HANYA setelah semua parser selesai
-        if driver:
-            driver.quit()
-            print("[INFO] Chrome driver ditutup.")
+        _stage(progress, "simpan")
+        # Tutup session HTTP dan driver (kalau sempat dibuat) setelah semua parser selesai
+        fetchers.close()
+        if own_store is not None:
+            own_store.close()
+        near_dups.save(**paths["near_dups"])
+        print(f"[INFO] Klaster cerita: {len(near_dups)}, near-duplicate dilewati: {near_dups.duplicates}")
+        if cache is not None:
+            print(f"[INFO] Cache artikel: {cache.stats()}")
+        seconds = time.perf_counter() - t_start
+        STAGE_SECONDS.observe(seconds, portal="-", stage="run")
+        log_event("run", seconds=round(seconds, 3), concurrent=concurrent, incremental=incremental,
+                  near_duplicates=near_dups.duplicates, cache=cache.stats() if cache is not None else None,
+                  prefilter=model.summary() if isinstance(model, PrefilterCascade) else None)
+    _stage(progress, "selesai")
 
-    if not dfs:
+    if not total:
         print("❌ Tidak ada hasil dari parser mana pun.")
         return pd.DataFrame(), pd.DataFrame()
+    print(f"[INFO] {total} artikel diproses.")
+    if isinstance(model, PrefilterCascade):
+        print(f"[INFO] Prefilter: {model.summary()}")
+    if collector is None:
+        return pd.DataFrame(), pd.DataFrame()
 
-    df_all = pd.concat(dfs, ignore_index=True).drop_duplicates(subset=["link"]).reset_index(drop=True)
-    
-    # ... (Sisa kode untuk klasifikasi tetap sama) ...
-    model = _load_model_safe("model_berita_svm2.pkl")
-    if model is not None:
-        try:
-            texts = df_all["isi"].fillna("").astype(str).tolist()
-            df_all["label"] = model.predict(texts)
-        except Exception as e:
-            print(f"[WARNING] Klasifikasi gagal: {e}")
-            df_all["label"] = -1
-    else:
-        df_all["label"] = -1
-
+    df_all = collector.frame()
     df_ekonomi = df_all[df_all["label"] == 1].reset_index(drop=True)
     return df_all, df_ekonomi
@@ -0,0 +1,163 @@
+# search_index.py
+# Indeks full-text (SQLite FTS5) atas judul/isi artikel di article_store.
+# FTS5 bawaan tidak mengenal imbuhan bahasa Indonesia, jadi yang diindeks
+# adalah term hasil stemming ringan (awalan me-/ber-/di-/ter-/pe-/ke-/se-,
+# akhiran -kan/-an, partikel & kata ganti milik) tanpa stopword; query
+# di-stem dengan cara yang sama. Ranking memakai bm25() FTS5, snippet dengan
+# kata yang cocok ditandai <mark> dibuat dari teks asli.
+import re
+from functools import lru_cache
+from html import escape
+
+FTS_TABLE = "articles_fts"
+# bobot bm25 per kolom FTS (judul, isi)
+BM25_WEIGHTS = (3.0, 1.0)
+SNIPPET_WORDS = 30
+SEARCH_LIMIT = 20
+STEM_CACHE_SIZE = 200000
+
+FTS_SCHEMA = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+    judul, isi, tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+STOPWORDS = frozenset("""
+yang dan di ke dari untuk dengan ini itu pada dalam tidak akan juga ada atau oleh karena sebagai
+adalah bahwa sudah telah masih bisa dapat agar saat para kata kami kita mereka ia dia saya anda
+lebih hingga sampai namun tetapi serta maupun jika bila setelah sebelum antara tersebut yakni
+""".split())
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_PARTICLES = ("lah", "kah", "tah", "pun")
+_POSSESSIVES = ("nya", "ku", "mu")
+_SUFFIXES = ("kan", "an")
+# (awalan, pengganti huruf awal kata dasar yang luluh); yang lebih panjang dicoba dulu
+_PREFIXES = (
+    ("meny", "s"), ("peny", "s"), ("meng", ""), ("peng", ""), ("mem", ""), ("pem", ""),
+    ("men", ""), ("pen", ""), ("ber", ""), ("ter", ""), ("per", ""),
+    ("me", ""), ("pe", ""), ("be", ""), ("te", ""), ("di", ""), ("ke", ""), ("se", ""),
+)
+_MIN_STEM = 4
+_VOWELS = "aiueo"
+
+
+def _strip_prefix(word):
+    """(sisa kata, awalan) atau None kalau tidak ada awalan yang bisa dibuang."""
+    for prefix, replacement in _PREFIXES:
+        if word.startswith(prefix) and len(word) - len(prefix) + len(replacement) >= _MIN_STEM:
+            rest = word[len(prefix):]
+            if prefix in ("mem", "pem") and rest[0] in _VOWELS:
+                # memakai -> pakai, pemakai -> pakai
+                return "p" + rest, prefix
+            if prefix in ("me", "pe", "be", "te") and rest[0] in _VOWELS:
+                continue
+            return replacement + rest, prefix
+    return None
+
+
+@lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word):
+    """Stemming ringan satu kata (huruf kecil); cukup konsisten untuk indeks & query."""
+    if len(word) <= _MIN_STEM or word.isdigit():
+        return word
+    for group in (_PARTICLES, _POSSESSIVES):
+        for suffix in group:
+            if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+                word = word[:-len(suffix)]
+                break
+    first = None
+    for _ in range(2):  # maksimal dua awalan: diper-, memper-, keber-
+        stripped = _strip_prefix(word)
+        if stripped is None:
+            break
+        word, prefix = stripped
+        first = first or prefix
+    # konfiks ke-an: kebijakan -> bijak (bukan bija-kan)
+    for suffix in ("an",) if first == "ke" else _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            return word[:-len(suffix)]
+    return word
+
+
+def terms(text):
+    """Daftar term (sudah di-stem, tanpa stopword) dari `text`."""
+    return [stem(t) for t in _TOKEN_RE.findall((text or "").lower()) if t not in STOPWORDS]
+
+
+def index_text(text):
+    return " ".join(terms(text))
+
+
+def create(conn):
+    """Buat tabel FTS; True kalau baru dibuat (isinya perlu diisi dari tabel articles)."""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (FTS_TABLE,)).fetchone()
+    conn.executescript(FTS_SCHEMA)
+    return exists is None
+
+
+def index_rows(conn, rows):
+    """(id, judul, isi) -> (re)index di FTS; dipanggil di transaksi yang sama dengan upsert."""
+    rows = list(rows)
+    conn.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = ?", [(r[0],) for r in rows])
+    conn.executemany(f"INSERT INTO {FTS_TABLE} (rowid, judul, isi) VALUES (?, ?, ?)",
+                     [(r[0], index_text(r[1]), index_text(r[2])) for r in rows])
+
+
+def match_expression(query):
+    """Query pengguna -> ekspresi MATCH FTS5 (semua term harus ada), atau None kalau kosong."""
+    words = _TOKEN_RE.findall((query or "").lower())
+    kept = [w for w in words if w not in STOPWORDS] or words
+    stems = dict.fromkeys(stem(w) for w in kept)
+    if not stems:
+        return None
+    return " ".join('"' + s.replace('"', '""') + '"' for s in stems)
+
+
+def snippet(text, query_stems, words=SNIPPET_WORDS):
+    """Potongan `words` kata dari `text` dengan kecocokan terbanyak; kata yang cocok dibungkus <mark> (HTML)."""
+    text = text or ""
+    tokens = list(_TOKEN_RE.finditer(text))
+    if not tokens:
+        return escape(text[:200])
+    hits = [stem(m.group(0).lower()) in query_stems for m in tokens]
+    best, best_hits, window = 0, -1, sum(hits[:words])
+    for start in range(0, max(len(tokens) - words, 0) + 1):
+        if start:
+            window += hits[start + words - 1] if start + words - 1 < len(tokens) else 0
+            window -= hits[start - 1]
+        if window > best_hits:
+            best, best_hits = start, window
+    chosen = tokens[best:best + words]
+    parts, pos = [], chosen[0].start()
+    for m, hit in zip(chosen, hits[best:best + words]):
+        parts.append(escape(text[pos:m.start()]))
+        parts.append(f"<mark>{escape(m.group(0))}</mark>" if hit else escape(m.group(0)))
+        pos = m.end()
+    prefix = "&hellip; " if best else ""
+    suffix = " &hellip;" if best + words < len(tokens) else ""
+    return prefix + "".join(parts) + suffix
+
+
+def search(conn, query, where="", params=(), limit=SEARCH_LIMIT, offset=0):
+    """
+    (total, hasil) untuk `query`; `where`/`params` filter tambahan atas tabel
+    articles (alias a, lihat ArticleStore._filters). Hasil terurut bm25, dengan
+    "snippet" dan "judul_html" ber-<mark>.
+    """
+    expr = match_expression(query)
+    if expr is None:
+        return 0, []
+    # hit FTS dihitung dulu (MATERIALIZED), baru difilter lewat articles; tanpa ini SQLite bisa
+    # memilih index tanggal/label lalu menjalankan MATCH per baris
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    hits = (f"WITH hits AS MATERIALIZED (SELECT rowid AS id, bm25({FTS_TABLE}, {weights}) AS rank "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH ?) ")
+    base = "FROM hits JOIN articles a ON a.id = hits.id" + (" WHERE " + where if where else "")
+    args = [expr, *params]
+    total = conn.execute(f"{hits}SELECT COUNT(*) {base}", args).fetchone()[0]
+    rows = conn.execute(f"{hits}SELECT a.*, hits.rank AS rank {base} ORDER BY hits.rank LIMIT ? OFFSET ?",
+                        args + [int(limit), int(offset)]).fetchall()
+    query_stems = set(terms(query)) or {stem(w) for w in _TOKEN_RE.findall(query.lower())}
+    return total, [(row, snippet(row["isi"], query_stems), snippet(row["judul"], query_stems, words=1000))
+                   for row in rows]
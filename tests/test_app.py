@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import threading
+
+import pytest
+
+import app as web
+from article_store import ArticleStore
+
+
+def _job_workers():
+    return [t for t in threading.enumerate() if t.name.startswith("job-worker")]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    started = []
+    monkeypatch.setattr(web, "_services", {})
+    monkeypatch.setattr(web, "warm_up_async", lambda: started.append(True))
+    monkeypatch.setattr(web, "ArticleStore", lambda: ArticleStore(str(tmp_path / "articles.sqlite")))
+    client = web.app.test_client()
+    client.started = started
+    yield client
+    if "store" in web._services:
+        web._services["store"].close()
+
+
+def test_import_has_no_side_effects():
+    # proses baru: import saja tidak boleh menyalakan worker, store atau warm-up model
+    code = "import threading, app; print(sorted(app._services), threading.active_count())"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert out.stdout.split() == ["[]", "1"]
+
+
+def test_services_start_on_first_request_only(client):
+    workers = len(_job_workers())
+    assert client.get("/jobs/tidak-ada").status_code == 404
+    assert client.get("/search?q=cabai&format=json").get_json()["total"] == 0
+    assert client.started == [True]
+    assert set(web._services) == {"started", "job_queue", "store"}
+    assert len(_job_workers()) == workers + 1
+    client.get("/metrics")
+    assert client.started == [True]
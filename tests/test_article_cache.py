@@ -0,0 +1,22 @@
+from article_cache import ArticleCache
+from url_canon import canonical_url
+
+
+def test_listing_pages_do_not_share_a_cache_row(tmp_path):
+    cache = ArticleCache(path=str(tmp_path / "cache.sqlite"))
+    try:
+        base = "https://lampung.antaranews.com/lampung-update"
+        cache.put_page(base + "?page=1", "<html>halaman 1</html>", last_modified="Mon, 12 Oct 2026 08:00:00 GMT")
+        cache.put_page(base + "?page=2", "<html>halaman 2</html>", last_modified="Mon, 12 Oct 2026 09:00:00 GMT")
+
+        html, _, last_modified = cache.validators(base + "?page=1")
+        assert html == "<html>halaman 1</html>"
+        assert last_modified == "Mon, 12 Oct 2026 08:00:00 GMT"
+        assert cache.validators(base + "?page=2")[0] == "<html>halaman 2</html>"
+        assert cache.validators("https://www.detik.com/sumbagsel/lampung?sortby=time&page=3") is None
+    finally:
+        cache.close()
+
+
+def test_dedupe_still_ignores_page_param():
+    assert canonical_url("https://rmollampung.id/berita/x?page=2") == canonical_url("https://rmollampung.id/berita/x")
@@ -0,0 +1,114 @@
+# Feed/sitemap discovery terhadap fixture replay (tests/fixtures/discovery/<portal>/,
+# layout yang sama dengan replay.record) yang disajikan lewat replay.FixtureServer.
+import os
+from datetime import date
+
+import pytest
+
+import discovery
+from discovery import discover, iter_entries, parse_date
+from portals import PORTALS
+from replay import FixtureServer, ReplayFetcherSet
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "discovery")
+
+
+def _read(portal, name):
+    with open(os.path.join(FIXTURES, portal, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def fetchers():
+    discovery._unavailable.clear()
+    with FixtureServer(fixtures_dir=FIXTURES) as server:
+        fetcher_set = ReplayFetcherSet(server.url)
+        fetcher_set.server = server
+        try:
+            yield fetcher_set
+        finally:
+            fetcher_set.close()
+    discovery._unavailable.clear()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Fri, 16 Oct 2026 09:15:00 +0700", date(2026, 10, 16)),
+    ("2026-10-17T07:00:00Z", date(2026, 10, 17)),
+    ("2026-10-14", date(2026, 10, 14)),
+    ("17 Oktober 2026", date(2026, 10, 17)),
+    ("kemarin sore", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text) == expected
+
+
+def test_rss_entries_with_bad_date_and_missing_link():
+    entries = list(iter_entries(_read("rmol", "feed_1.xml")))
+    assert [(kind, title) for kind, title, _, _ in entries] == [
+        ("entry", "Inflasi Lampung Oktober Turun"), ("entry", "Pemprov Salurkan Dana Desa"),
+        ("entry", "Tanggal Rusak"), ("entry", "Berita Portal Lain")]
+    assert [e[3] for e in entries] == [date(2026, 10, 16), date(2026, 10, 17), None, date(2026, 10, 16)]
+
+
+def test_atom_prefers_alternate_link():
+    entries = list(iter_entries(_read("lampost", "feed_1.xml")))
+    assert entries == [
+        ("entry", "Harga Cabai Naik Jelang Akhir Tahun", "https://lampost.co.id/berita/harga-cabai-naik/",
+         date(2026, 10, 15)),
+        ("entry", "Nelayan Kota Agung Melaut Lagi", "https://lampost.co.id/berita/nelayan-melaut/",
+         date(2026, 10, 16)),
+    ]
+
+
+def test_max_entries_stops_early():
+    assert len(list(iter_entries(_read("rmol", "feed_1.xml"), max_entries=2))) == 2
+
+
+def test_discover_rss_keeps_own_portal_newest_first(fetchers):
+    entries = discover("rmol", fetchers.for_portal("rmol"))
+    assert [link for _, link, _ in entries] == [
+        "https://rmollampung.id/pemprov-salurkan-dana-desa",
+        "https://rmollampung.id/inflasi-lampung-oktober-turun",
+        "https://rmollampung.id/tanggal-rusak",
+    ]
+
+
+def test_discover_sitemap_index_follows_news_and_latest_children(fetchers):
+    entries = discover("antara", fetchers.for_portal("antara"))
+    assert entries == [
+        ("BPS Catat Ekspor Lampung Naik", "https://lampung.antaranews.com/berita/100/bps-catat-ekspor-naik",
+         date(2026, 10, 17)),
+        # sitemap biasa tanpa judul -> judul dari slug
+        ("Petani kopi panen raya", "https://lampung.antaranews.com/berita/99/petani-kopi-panen-raya",
+         date(2026, 10, 14)),
+        ("Tanpa tanggal", "https://lampung.antaranews.com/berita/98/tanpa-tanggal", None),
+    ]
+    # hanya MAX_CHILD_SITEMAPS sitemap anak yang diikuti; September (lastmod tertua) dilewati
+    requested = " ".join(fetchers.requested)
+    assert "news-sitemap.xml" in requested and "sitemap-2026-10" in requested
+    assert "sitemap-2026-09" not in requested
+
+
+def test_failed_feed_backs_off_then_retries(fetchers, monkeypatch):
+    monkeypatch.setitem(PORTALS["radarlampung"], "feeds", ["https://radarlampung.disway.id/feed/"])
+    clock = [1000.0]
+    monkeypatch.setattr(discovery.time, "monotonic", lambda: clock[0])
+    fetcher = fetchers.for_portal("radarlampung")
+
+    assert discover("radarlampung", fetcher) is None
+    misses = fetchers.server.misses
+    assert misses >= 1
+
+    clock[0] += discovery.FEED_RETRY_AFTER - 1
+    assert discover("radarlampung", fetcher) is None
+    assert fetchers.server.misses == misses  # masih dalam masa tunggu: tidak ada request
+
+    clock[0] += 2
+    assert discover("radarlampung", fetcher) is None
+    assert fetchers.server.misses > misses
+
+
+def test_portal_without_feeds_returns_none(fetchers):
+    assert discover("detik", fetchers.for_portal("detik")) is None
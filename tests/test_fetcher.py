@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from fetcher import AutoFetcher
+from replay import FixtureServer, ReplayFetcherSet
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "discovery")
+PAGE = "<html><body>" + "<p>isi berita</p>" * 300 + "</body></html>"
+CHALLENGE = "<html><head><title>Just a moment...</title></head><body>" + " " * 4000 + "</body></html>"
+
+
+class FakeHttp:
+    cache = None
+
+    def __init__(self, html, status):
+        self.result = (html, status)
+
+    def fetch(self, url):
+        return self.result
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        return "<html>browser</html>"
+
+
+@pytest.mark.parametrize("html, status, via_browser", [
+    (PAGE, 200, False),
+    (PAGE, 304, False),  # dari cache
+    ("<html><div id=app></div></html>", 200, True),  # cangkang JS
+    (CHALLENGE, 200, True),  # halaman tantangan anti-bot
+    (None, 404, False),
+    (None, 410, False),
+    (None, 403, False),
+    (None, 503, True),  # percobaan habis
+    (None, 429, True),
+    (None, None, True),  # error koneksi
+])
+def test_auto_fetcher_falls_back_only_when_browser_can_help(html, status, via_browser):
+    browser = FakeBrowser()
+    result = AutoFetcher(FakeHttp(html, status), browser).get("https://lampost.co.id/berita/1")
+    assert bool(browser.urls) is via_browser
+    assert result == ("<html>browser</html>" if via_browser else html)
+
+
+def test_http_fetch_reports_status():
+    with FixtureServer(fixtures_dir=FIXTURES) as server:
+        http = ReplayFetcherSet(server.url).http
+        try:
+            html, status = http.fetch(server.url + "/rmol/rss")
+            assert status == 200 and "<rss" in html
+            assert http.fetch(server.url + "/rmol/tidak-ada") == (None, 404)
+            assert http.get(server.url + "/rmol/tidak-ada") is None
+        finally:
+            http.close()
@@ -0,0 +1,35 @@
+import scraper_all
+from jobs import Job
+
+TEKS = {
+    "https://lampost.co.id/berita/1": "Harga cabai merah di pasar Bandar Lampung naik tajam menjelang akhir tahun",
+    "https://lampost.co.id/berita/2": "Polisi menangkap pelaku begal di Jalan Soekarno Hatta setelah pengejaran dua jam",
+}
+
+
+class NoFetchers:
+    def for_portal(self, key):
+        raise AssertionError("crawl diganti di test ini")
+
+    def close(self):
+        pass
+
+
+def _fake_crawl(fetchers, **kwargs):
+    for link, isi in TEKS.items():
+        yield "lampost", {"judul": isi[:20], "link": link, "isi": isi, "tanggal": None}
+
+
+def test_pipeline_reports_stages_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper_all, "_load_model_safe", lambda *a: None)
+    monkeypatch.setattr(scraper_all, "iter_crawl", _fake_crawl)
+    job = Job(None, {})
+    scraper_all.scrape_dan_klasifikasi(progress=job.progress, collect=False, use_cache=False,
+                                       fetchers=NoFetchers(), data_dir=str(tmp_path))
+
+    events = [(e["type"], e.get("stage")) for e in job._events]
+    assert [s for t, s in events if t == "stage"] == ["crawl", "klasifikasi", "simpan", "selesai"]
+    # "klasifikasi" dilaporkan sebelum artikel pertama, "simpan" setelah yang terakhir
+    assert events.index(("stage", "klasifikasi")) < events.index(("article", None))
+    assert events[-2:] == [("stage", "simpan"), ("stage", "selesai")]
+    assert job.stage == "selesai" and job.portals == {"Lampost": 2}
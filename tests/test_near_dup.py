@@ -0,0 +1,34 @@
+from article_store import ArticleStore
+from near_dup import NearDupIndex, near_dedupe
+
+TEKS = ("Harga cabai merah di pasar Bandar Lampung naik tajam menjelang akhir tahun karena "
+        "pasokan dari petani berkurang akibat hujan deras di sentra produksi")
+
+
+def test_syndicated_copy_dropped_in_later_run(tmp_path):
+    path = str(tmp_path / "index.npz")
+    index = NearDupIndex.load(path)
+    first = list(near_dedupe([{"link": "https://lampung.antaranews.com/berita/1", "judul": "Cabai", "isi": TEKS}], index))
+    index.save(path)
+
+    dropped = []
+    index = NearDupIndex.load(path)
+    copy = {"link": "https://rmollampung.id/berita/2", "judul": "Cabai", "isi": TEKS + " ujarnya"}
+    second = list(near_dedupe([copy], index, on_drop=dropped.append))
+
+    assert len(first) == 1 and second == []
+    assert dropped == [copy] and copy["duplicate_of"] == "https://lampung.antaranews.com/berita/1"
+
+
+def test_store_hides_duplicates(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite"))
+    try:
+        base = {"judul": "Harga cabai naik", "isi": "harga cabai naik di pasar", "tanggal": None, "label": 1,
+                "cluster": 0}
+        store.upsert_many([dict(base, link="https://a.id/1", portal="A", duplicate_of=None),
+                           dict(base, link="https://b.id/2", portal="B", duplicate_of="https://a.id/1")])
+        assert [r["link"] for r in store.query()] == ["https://a.id/1"]
+        assert store.count() == 1 and store.count(duplicates=True) == 2
+        assert store.search("cabai")[0] == 1
+    finally:
+        store.close()
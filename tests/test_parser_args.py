@@ -0,0 +1,35 @@
+import importlib
+
+import pandas as pd
+import pytest
+
+PARSERS = [
+    ("parser_detik", "iter_detik_lampung", "parse_detik_lampung"),
+    ("parser_rmol", "iter_rmol_lampung", "parse_rmol_lampung"),
+    ("parsersAntara", "iter_antara", "parse_antara"),
+    ("lampost_parser", "iter_lampost", "parse_lampost"),
+    ("parser_radarlampung", "iter_radar_lampung", "parse_radar_lampung"),
+]
+
+
+class EmptyFetcher:
+    """Fetcher tanpa halaman: parser berhenti di listing pertama."""
+
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        return None
+
+
+@pytest.mark.parametrize("module, iter_name, parse_name", PARSERS)
+def test_driver_keyword_is_alias_for_fetcher(module, iter_name, parse_name):
+    mod = importlib.import_module(module)
+    for fn in (getattr(mod, iter_name), getattr(mod, parse_name)):
+        fetcher = EmptyFetcher()
+        result = fn(driver=fetcher, max_pages=1)
+        if not isinstance(result, pd.DataFrame):
+            result = list(result)
+        assert len(result) == 0
+        assert fetcher.urls, f"{fn.__name__}(driver=...) tidak memakai fetcher yang diberikan"
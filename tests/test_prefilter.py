@@ -0,0 +1,114 @@
+import types
+
+import numpy as np
+import pytest
+
+import prefilter
+from prefilter import KeywordMatcher, PrefilterCascade
+
+TEXTS = [
+    "Inflasi Lampung naik, harga cabai dan harga beras di pasar ikut terkerek.",
+    "Polisi menangkap pelaku begal setelah usaha pengejaran dua jam.",
+    "Pedagang pasar mengeluhkan harga sewa kios yang naik.",
+    "Pasar malam ramai, usaha warga laris. Bank Indonesia mendorong QRIS.",
+    "Hargai pendapat orang lain; kata 'pasaran' bukan 'pasar'.",
+    "",
+]
+
+
+class FakeModel:
+    """Model dengan predict_proba tetap per teks (urutan pemanggilan)."""
+    classes_ = np.array([0, 1])
+
+    def __init__(self, proba):
+        self.proba = proba
+        self.seen = []
+
+    def predict_proba(self, texts):
+        self.seen.extend(texts)
+        p = np.array([self.proba[t] for t in texts])
+        return np.column_stack([1 - p, p])
+
+
+def _regex_matcher(monkeypatch):
+    monkeypatch.setattr(prefilter, "ahocorasick", None)
+    return KeywordMatcher()
+
+
+class _NaiveAutomaton:
+    """Pengganti pyahocorasick (API yang dipakai prefilter) kalau paketnya tidak terpasang."""
+
+    def __init__(self):
+        self.words = {}
+
+    def add_word(self, word, value):
+        self.words[word] = value
+
+    def make_automaton(self):
+        pass
+
+    def iter(self, text):
+        # sama dengan pyahocorasick: (indeks akhir, nilai) untuk semua kemunculan, termasuk yang tumpang tindih
+        hits = []
+        for word, value in self.words.items():
+            start = text.find(word)
+            while start != -1:
+                hits.append((start + len(word) - 1, value))
+                start = text.find(word, start + 1)
+        return iter(sorted(hits))
+
+
+def _aho_matcher(monkeypatch):
+    if prefilter.ahocorasick is None:
+        monkeypatch.setattr(prefilter, "ahocorasick", types.SimpleNamespace(Automaton=_NaiveAutomaton))
+    return KeywordMatcher()
+
+
+def test_aho_corasick_and_regex_agree(monkeypatch):
+    aho = _aho_matcher(monkeypatch)
+    regex = _regex_matcher(monkeypatch)
+    assert aho._automaton is not None and regex._regex is not None
+    for text in TEXTS:
+        assert aho.matches(text) == regex.matches(text)
+        for n, n_broad in ((1, 2), (1, None), (2, 2), (3, 1)):
+            assert aho.has_at_least(text, n, n_broad) == regex.has_at_least(text, n, n_broad)
+
+
+def test_regex_fallback_matches_whole_words(monkeypatch):
+    matcher = _regex_matcher(monkeypatch)
+    assert matcher.matches(TEXTS[0]) >= {"inflasi", "harga cabai", "harga beras", "pasar"}
+    # "hargai" / "pasaran" bukan istilah
+    assert matcher.matches(TEXTS[4]) == {"pasar"}
+    assert matcher.matches("") == set()
+
+
+@pytest.mark.parametrize("text, passes", [
+    ("Polisi menangkap pelaku begal setelah usaha pengejaran.", False),  # satu istilah umum
+    ("Pedagang pasar mengeluhkan harga sewa kios.", True),  # tiga istilah umum
+    ("Harga diri tim dipertaruhkan.", False),
+    ("Pasar malam ramai dan usaha warga laris.", True),  # dua istilah umum
+    ("BPS mencatat angka baru.", True),  # satu istilah spesifik
+])
+def test_broad_terms_need_company(monkeypatch, text, passes):
+    cascade = PrefilterCascade(None, matcher=_regex_matcher(monkeypatch))
+    assert (cascade.min_terms, cascade.min_broad_terms) == (1, 2)
+    assert cascade.passes(text) is passes
+
+
+def test_score_batch_counters_and_confidence_bands(monkeypatch):
+    texts = ["Inflasi naik tajam.", "Subsidi BBM dipangkas.", "Ekspor kopi melonjak.",
+             "Polisi menangkap begal.", "Banjir di Panjang."]
+    model = FakeModel({texts[0]: 0.9, texts[1]: 0.5, texts[2]: 0.1})
+    cascade = PrefilterCascade(model, matcher=_regex_matcher(monkeypatch))
+    labels, scores = cascade.score_batch(texts)
+
+    assert model.seen == texts[:3]
+    assert list(labels) == [1, 0, 0, 0, 0]
+    assert scores == [0.9, 0.5, 0.1, None, None]
+    summary = cascade.summary()
+    assert summary["total"] == 5 and summary["skipped"] == 2 and summary["model_calls"] == 3
+    assert summary["ragu"] == 1 and summary["yakin"] == 2
+    assert summary["skipped_ratio"] == pytest.approx(0.4)
+
+    cascade.score_batch(["Cuaca cerah."])
+    assert cascade.summary()["total"] == 6 and cascade.summary()["skipped"] == 3
@@ -0,0 +1,87 @@
+# Crawl terjadwal yang menemukan lebih banyak artikel baru daripada
+# MAX_ARTICLES_PER_RUN: sisa artikelnya harus diambil run berikutnya, bukan
+# hilang karena high-water mark sudah maju (lihat crawl_state.py).
+from datetime import date, timedelta
+
+from scheduler import CrawlScheduler
+
+LISTING = "https://lampost.co.id/tag/lampung/page/{}"
+
+
+class FakeFetcher:
+    def __init__(self, pages):
+        self.pages = pages
+        self.cache = None
+
+    def get(self, url):
+        return self.pages.get(url)
+
+    def close(self):
+        pass
+
+
+class FakeFetcherSet:
+    def __init__(self, pages):
+        self.fetcher = FakeFetcher(pages)
+
+    def for_portal(self, key):
+        return self.fetcher
+
+    def close(self):
+        pass
+
+
+def lampost_pages(ids):
+    """Situs Lampost tiruan: satu halaman listing berisi `ids` (terbaru dulu), plus halaman artikelnya."""
+    pages, items = {}, []
+    for n, i in enumerate(ids):
+        link = f"https://lampost.co.id/berita/judul-{i}/"
+        tanggal = date(2026, 10, 1) + timedelta(days=len(ids) - n)
+        items.append(f'<article><h2 class="title"><a href="{link}">Judul {i}</a></h2>'
+                     f'<time datetime="{tanggal}">{tanggal}</time></article>')
+        pages[link] = (f'<html><body><time class="updated" datetime="{tanggal}T08:00:00"></time>'
+                       f'<div class="entry-content"><p>Isi berita {i}</p></div></body></html>')
+    pages[LISTING.format(1)] = "<html><body>" + "".join(items) + "</body></html>"
+    pages[LISTING.format(2)] = "<html><body></body></html>"
+    return pages
+
+
+def test_run_over_cap_is_backfilled_by_next_runs(tmp_path):
+    site = {}
+    scheduler = CrawlScheduler(portals=["lampost"], max_articles=2, data_dir=str(tmp_path),
+                               fetcher_factory=lambda: FakeFetcherSet(site))
+    try:
+        # baseline: 2 artikel lama -> high-water mark
+        site.update(lampost_pages([2, 1]))
+        assert scheduler.run_once("lampost") == 2
+        mark = scheduler.state.watermark("lampost")["url"]
+
+        # burst: 5 artikel baru, lebih banyak dari batas per run
+        site.clear()
+        site.update(lampost_pages([7, 6, 5, 4, 3, 2, 1]))
+        counts = [scheduler.run_once("lampost") for _ in range(4)]
+
+        assert counts == [2, 2, 1, 0]
+        links = {r["link"] for r in scheduler.store.query()}
+        assert links == {f"https://lampost.co.id/berita/judul-{i}/" for i in range(1, 8)}
+        # mark baru maju setelah walk sampai ke mark lama
+        assert scheduler.state.watermark("lampost")["url"] != mark
+        assert scheduler.state.watermark("lampost")["url"].endswith("judul-7")
+    finally:
+        scheduler.close()
+
+
+def test_truncated_run_keeps_mark_and_schedules_backlog_soon(tmp_path):
+    site = lampost_pages([2, 1])
+    scheduler = CrawlScheduler(portals=["lampost"], max_articles=2, data_dir=str(tmp_path),
+                               fetcher_factory=lambda: FakeFetcherSet(site))
+    try:
+        scheduler.run_once("lampost")
+        mark = scheduler.state.watermark("lampost")
+        site.update(lampost_pages([5, 4, 3, 2, 1]))
+        assert scheduler.run_once("lampost") == 2
+        assert scheduler.state.watermark("lampost")["url"] == mark["url"]
+        # batas tercapai -> run berikutnya tidak menunggu interval penuh
+        assert scheduler._delay("lampost") <= 60 * (1 + scheduler.jitter)
+    finally:
+        scheduler.close()
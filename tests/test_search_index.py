@@ -0,0 +1,100 @@
+import pytest
+
+from article_store import ArticleStore
+from search_index import match_expression, snippet, stem, terms
+
+
+@pytest.mark.parametrize("word, expected", [
+    # awalan luluh dan awalan ganda
+    ("menyapu", "sapu"),
+    ("memakai", "pakai"),
+    ("pembangunan", "bangun"),
+    ("dibangun", "bangun"),
+    ("mempermainkan", "main"),
+    ("ditanamkan", "tanam"),
+    ("berjalan", "jalan"),
+    ("perekonomian", "ekonomi"),
+    ("keberhasilan", "hasil"),
+    # konfiks ke-an
+    ("kebijakan", "bijak"),
+    # partikel dan kata ganti milik
+    ("bukunya", "buku"),
+    ("bukankah", "bukan"),
+    # kata dasar / pendek / angka tidak diubah
+    ("ekonomi", "ekonomi"),
+    ("beras", "beras"),
+    ("2026", "2026"),
+])
+def test_stem(word, expected):
+    assert stem(word) == expected
+
+
+def test_terms_drop_stopwords_and_share_stems():
+    assert terms("Pembangunan jalan yang dibangun di Lampung") == ["bangun", "jalan", "bangun", "lampung"]
+    assert terms(None) == []
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("harga cabai", '"harga" "cabai"'),
+    ('"harga cabai"', '"harga" "cabai"'),
+    ("-inflasi", '"inflasi"'),
+    ("ekspor*", '"ekspor"'),
+    ("cabai NEAR beras", '"cabai" "near" "beras"'),
+    ("harga OR AND NOT", '"harga" "or" "and" "not"'),
+    ("yang dan", '"yang" "dan"'),  # hanya stopword: tetap dicari
+    ("", None),
+    ("  -*\"() ", None),
+])
+def test_match_expression_quotes_every_term(query, expected):
+    assert match_expression(query) == expected
+
+
+def test_snippet_marks_hits_and_escapes_html():
+    html = snippet("Harga <b>cabai</b> & beras naik", {"cabai"})
+    assert html == "Harga &lt;b&gt;<mark>cabai</mark>&lt;/b&gt; &amp; beras naik"
+    long = " ".join(["kata"] * 50 + ["cabai"] + ["kata"] * 50)
+    html = snippet(long, {"cabai"}, words=5)
+    assert html.startswith("&hellip; ") and html.endswith(" &hellip;") and "<mark>cabai</mark>" in html
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.sqlite"))
+    base = {"tanggal": None, "label": 1, "portal": "Lampost", "cluster": 0, "duplicate_of": None}
+    store.upsert_many([
+        dict(base, link="https://lampost.co.id/1", judul="Pasar ramai jelang lebaran",
+             isi="Harga cabai merah naik di pasar."),
+        dict(base, link="https://lampost.co.id/2", judul="Harga cabai naik lagi",
+             isi="Pedagang mengeluhkan pasokan cabai."),
+        dict(base, link="https://lampost.co.id/3", judul="Cuaca cerah",
+             isi="Harga cabai, harga cabai, harga cabai terus naik."),
+        dict(base, link="https://lampost.co.id/4", judul="Pembangunan jalan tol",
+             isi="Jalan tol dibangun tahun depan."),
+    ])
+    yield store
+    store.close()
+
+
+def test_bm25_ranks_title_hits_first(store):
+    total, results = store.search("harga cabai")
+    assert total == 3
+    links = [r["link"] for r in results]
+    # judul berbobot 3x: artikel 2 (judul cocok) di atas artikel 3 (isi saja, meski lebih sering)
+    assert links[0] == "https://lampost.co.id/2"
+    # di antara yang cocok di isi saja, yang lebih sering disebut lebih tinggi
+    assert links.index("https://lampost.co.id/3") < links.index("https://lampost.co.id/1")
+    assert [r["rank"] for r in results] == sorted(r["rank"] for r in results)
+    assert "<mark>Harga</mark> <mark>cabai</mark>" in results[0]["judul_html"]
+
+
+def test_search_matches_across_affixes(store):
+    total, results = store.search("membangun")
+    assert total == 1 and results[0]["link"] == "https://lampost.co.id/4"
+    assert "<mark>dibangun</mark>" in results[0]["snippet"]
+
+
+@pytest.mark.parametrize("query", ['"cabai', 'cabai"', "cabai -merah", "cab*", "cabai NEAR merah",
+                                   "NEAR(cabai merah)", "cabai OR", "AND", "(", "^cabai", "judul:cabai"])
+def test_fts_syntax_in_user_query_does_not_raise(store, query):
+    total, results = store.search(query)
+    assert total == len(results)
@@ -0,0 +1,55 @@
+import pytest
+
+from url_canon import CONTENT_PARAMS, SeenSet, canonical_url, page_key
+
+
+@pytest.mark.parametrize("url, expected", [
+    # varian AMP: segmen /amp, akhiran .amp, subdomain amp.
+    ("https://www.detik.com/sumbagsel/berita/d-1/judul/amp", "https://detik.com/sumbagsel/berita/d-1/judul"),
+    ("https://lampung.antaranews.com/berita/1/judul.amp", "https://lampung.antaranews.com/berita/1/judul"),
+    ("https://amp.lampost.co.id/berita/judul", "https://lampost.co.id/berita/judul"),
+    ("https://lampost.co.id/berita/judul/?amp=1", "https://lampost.co.id/berita/judul"),
+    # parameter tracking dibuang, parameter lain dipertahankan (urut)
+    ("https://rmollampung.id/berita/1?utm_source=fb&utm_medium=social", "https://rmollampung.id/berita/1"),
+    ("https://rmollampung.id/berita/1?fbclid=abc&gclid=x", "https://rmollampung.id/berita/1"),
+    ("https://rmollampung.id/read?b=2&utm_campaign=x&a=1", "https://rmollampung.id/read?a=1&b=2"),
+    # slash penutup dan slash ganda
+    ("https://lampost.co.id/berita/judul/", "https://lampost.co.id/berita/judul"),
+    ("https://lampost.co.id//berita//judul", "https://lampost.co.id/berita/judul"),
+    ("https://lampost.co.id/", "https://lampost.co.id/"),
+    # skema, huruf besar host, alias m./www., port default
+    ("http://WWW.Detik.COM/a", "https://detik.com/a"),
+    ("https://m.detik.com:443/a", "https://detik.com/a"),
+    # fragment
+    ("https://lampost.co.id/berita/judul#komentar", "https://lampost.co.id/berita/judul"),
+    # CONTENT_PARAMS dibuang dari kunci dedupe
+    ("https://lampost.co.id/berita/judul?page=2", "https://lampost.co.id/berita/judul"),
+    ("https://lampost.co.id/berita/judul?single=1&showall=1", "https://lampost.co.id/berita/judul"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://lampung.antaranews.com/lampung-update?page=2", "https://lampung.antaranews.com/lampung-update?page=2"),
+    ("https://www.detik.com/sumbagsel/lampung?sortby=time&page=3&utm_source=x",
+     "https://detik.com/sumbagsel/lampung?page=3&sortby=time"),
+    ("https://rmollampung.id/?s=lampung&page=3#x", "https://rmollampung.id/?page=3&s=lampung"),
+    ("https://lampost.co.id/berita/judul/amp/?single=1", "https://lampost.co.id/berita/judul?single=1"),
+])
+def test_page_key_keeps_content_params(url, expected):
+    assert page_key(url) == expected
+
+
+@pytest.mark.parametrize("param", sorted(CONTENT_PARAMS))
+def test_content_params_split_between_keys(param):
+    url = f"https://rmollampung.id/berita/1?{param}=2"
+    assert canonical_url(url) == "https://rmollampung.id/berita/1"
+    assert page_key(url) == url
+
+
+def test_seen_set_matches_variants():
+    seen = SeenSet(["https://lampost.co.id/berita/judul"])
+    assert not seen.add("http://www.lampost.co.id/berita/judul/amp/?utm_source=wa#top")
+    assert seen.add("https://lampost.co.id/berita/lain")
+    assert not seen.add("https://lampost.co.id/berita/lain/")
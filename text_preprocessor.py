@@ -1,35 +1,141 @@
 # text_preprocessor.py
-# Shim minimal untuk menghindari "No module named 'text_preprocessor'" saat unpickle.
+# Normalisasi teks berita bahasa Indonesia untuk model klasifikasi.
+# Modul ini juga dirujuk model_berita_svm2.pkl (TextPreprocessor di awal
+# pipeline), jadi nama TextPreprocessor, clean_text_simple dan preprocess_text
+# harus tetap ada, dan TextPreprocessor() tanpa argumen harus menghasilkan
+# teks yang persis sama dengan saat model dilatih (huruf kecil + spasi
+# dirapikan). Normalisasi per token (slang, stopword, stemming ringan dari
+# search_index.py) opsional: tokenisasi satu kali dengan regex yang sudah
+# dikompilasi, hasil per token di-cache LRU karena kosakata berita sangat
+# berulang, dan transform bisa dipecah ke beberapa proses untuk training.
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 from sklearn.base import TransformerMixin, BaseEstimator
 
+from search_index import STOPWORDS, stem
+
+# pola token sama dengan analyzer "word" TfidfVectorizer (token >= 2 karakter)
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+NORMALIZE_CACHE_SIZE = 200000
+# dokumen per potongan kerja saat transform dipecah ke beberapa proses
+CHUNK_SIZE = 500
+# di bawah jumlah dokumen ini overhead proses lebih mahal dari hasilnya
+MIN_PARALLEL_DOCS = 2000
+
+# singkatan/ejaan tidak baku yang sering muncul di berita daring -> bentuk baku
+SLANG = {
+    "yg": "yang", "dgn": "dengan", "dg": "dengan", "utk": "untuk", "untk": "untuk", "tdk": "tidak",
+    "tak": "tidak", "gak": "tidak", "nggak": "tidak", "krn": "karena", "karna": "karena", "sdh": "sudah",
+    "udah": "sudah", "blm": "belum", "bgmn": "bagaimana", "sbg": "sebagai", "spt": "seperti",
+    "tsb": "tersebut", "dlm": "dalam", "pd": "pada", "jd": "jadi", "jg": "juga", "lg": "lagi",
+    "org": "orang", "thn": "tahun", "th": "tahun", "bln": "bulan", "rb": "ribu", "jt": "juta",
+    "rp": "rupiah", "pemprov": "pemerintah provinsi", "pemkot": "pemerintah kota",
+    "pemkab": "pemerintah kabupaten",
+}
+
+
 def clean_text_simple(s):
+    """Huruf kecil + semua whitespace dirapikan jadi satu spasi (perilaku saat model dilatih)."""
     if s is None:
         return ""
-    s = str(s)
-    s = s.lower()
-    s = re.sub(r"\s+", " ", s)
-    s = s.strip()
-    return s
+    # str.split() tanpa argumen memakai definisi whitespace yang sama dengan \s di re
+    return " ".join(str(s).lower().split())
+
+
+def normalize_token(token, slang=True, stopwords=True, stemming=True):
+    """Bentuk normal satu token (huruf kecil); "" kalau token dibuang sebagai stopword."""
+    if slang:
+        token = SLANG.get(token, token)
+    if stopwords and token in STOPWORDS:
+        return ""
+    if stemming and " " not in token:
+        token = stem(token)
+    return token
+
+
+@lru_cache(maxsize=8)
+def token_normalizer(slang=True, stopwords=True, stemming=True):
+    """normalize_token dengan opsi tetap dan cache LRU sendiri (satu argumen -> lookup murah)."""
+    @lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+    def normalize(token):
+        return normalize_token(token, slang, stopwords, stemming)
+    return normalize
+
+
+def tokenize(text):
+    """Token huruf kecil dalam satu kali lewat regex."""
+    if text is None:
+        return []
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def normalize_text(text, slang=True, stopwords=True, stemming=True):
+    """Tokenisasi + normalisasi per token (ter-cache), digabung kembali dengan spasi."""
+    return " ".join(filter(None, map(token_normalizer(slang, stopwords, stemming), tokenize(text))))
+
+
+def _transform_chunk(args):
+    options, chunk = args
+    if options is None:
+        return [clean_text_simple(x) for x in chunk]
+    return [normalize_text(x, *options) for x in chunk]
+
 
 class TextPreprocessor(BaseEstimator, TransformerMixin):
     """
-    Minimal implementation supaya unpickling model yang
-    mengacu pada modul text_preprocessor tidak gagal.
-    Jika model asli memakai metode/atribut lain, tambahkan di sini.
+    Preprocessor teks untuk pipeline sklearn. Default-nya identik dengan versi
+    yang dipakai saat model_berita_svm2.pkl dilatih (clean_text_simple).
+    slang / stopwords / stemming mengaktifkan normalisasi per token untuk model
+    baru; n_jobs > 1 memecah transform dokumen dalam jumlah besar ke beberapa
+    proses (-1 = semua CPU).
     """
-    def __init__(self):
-        pass
+    # default di level kelas: objek hasil unpickle model lama tidak punya atribut ini
+    slang = False
+    stopwords = False
+    stemming = False
+    n_jobs = 1
+
+    def __init__(self, slang=False, stopwords=False, stemming=False, n_jobs=1):
+        self.slang = slang
+        self.stopwords = stopwords
+        self.stemming = stemming
+        self.n_jobs = n_jobs
 
     def fit(self, X, y=None):
         return self
 
+    def _options(self):
+        if not (self.slang or self.stopwords or self.stemming):
+            return None
+        return (bool(self.slang), bool(self.stopwords), bool(self.stemming))
+
+    def _workers(self, n_docs):
+        n_jobs = self.n_jobs or 1
+        if n_jobs < 0:
+            n_jobs = os.cpu_count() or 1
+        return n_jobs if n_docs >= MIN_PARALLEL_DOCS else 1
+
     def transform(self, X):
-        return [clean_text_simple(x) for x in X]
+        options = self._options()
+        if not isinstance(X, (list, tuple)):
+            X = list(X)
+        workers = self._workers(len(X))
+        if workers <= 1:
+            return _transform_chunk((options, X))
+        chunks = [(options, X[i:i + CHUNK_SIZE]) for i in range(0, len(X), CHUNK_SIZE)]
+        out = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for part in pool.map(_transform_chunk, chunks):
+                out.extend(part)
+        return out
 
     def fit_transform(self, X, y=None):
         return self.fit(X, y).transform(X)
 
+
 # alias nama fungsi jika model mengharapkan fungsi bernama preprocess_text
 def preprocess_text(s):
     return clean_text_simple(s)
@@ -1,4 +1,6 @@
 # train_model.py
+import os
+
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.svm import LinearSVC
@@ -7,6 +9,7 @@ from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report
 import joblib
+from fast_model import distil, fast_model_path
 
 def train_and_save(csv_path, text_col="isi", label_col="label", out_path="model_berita_svm2.pkl"):
     df = pd.read_csv(csv_path)
@@ -23,6 +26,17 @@ def train_and_save(csv_path, text_col="isi", label_col="label", out_path="model_
     print(classification_report(y_test, preds))
     joblib.dump(pipeline, out_path)
     print(f"Model saved to {out_path}")
+    # versi ringkas untuk inferensi (opt-in lewat USE_FAST_MODEL=1, lihat model_registry.py);
+    # hanya diekspor kalau cukup cocok dengan pipeline di data test yang tidak dipakai menyetel ambang
+    fast_path = fast_model_path(out_path)
+    try:
+        fast = distil(pipeline, fast_path, X_train, holdout_texts=X_test)
+        print(f"Fast model saved to {fast_path} (held-out: {fast.validation['agreement']:.2%} label sama, "
+              f"selisih probabilitas maks {fast.validation['max_proba_diff']:.3f})")
+    except ValueError as e:
+        print(f"Fast model tidak dibuat, .pkl tetap dipakai: {e}")
+        if os.path.exists(fast_path):
+            os.remove(fast_path)
 
 if __name__ == "__main__":
     import sys
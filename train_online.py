@@ -0,0 +1,228 @@
+# train_online.py
+# Training out-of-core untuk arsip berlabel yang lebih besar dari RAM: CSV /
+# Parquet dibaca per chunk, fitur dibuat dengan HashingVectorizer (tanpa
+# vocabulary di memori), model linear dilatih lewat partial_fit. Pencarian
+# hyperparameter (n-gram, min_df, C) berjalan paralel dengan joblib dan
+# hasilnya di-cache di disk; model yang sudah ada bisa dilatih lanjut dengan
+# artikel berlabel baru tanpa training ulang dari nol.
+#
+#   python train_online.py search data.csv
+#   python train_online.py train data.csv [model_out.pkl]
+#   python train_online.py update model.pkl label_baru.csv
+import itertools
+import os
+import sys
+import zlib
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import normalize
+
+CHUNK_SIZE = 5000
+N_FEATURES = 2 ** 20
+N_EPOCHS = 3
+# 1 dari VALIDATION_MOD baris (berdasarkan hash teks, stabil antar-run) dipakai untuk validasi
+VALIDATION_MOD = 5
+SEARCH_GRID = {
+    "ngram_range": [(1, 1), (1, 2)],
+    "min_df": [1, 3, 5],
+    "C": [0.1, 1.0, 10.0],
+}
+TRAIN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".train_cache")
+DEFAULT_ONLINE_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_berita_sgd.pkl")
+CLASSES = np.array([0, 1])
+
+
+def iter_chunks(path, text_col="isi", label_col="label", chunksize=CHUNK_SIZE):
+    """(texts, labels) per chunk dari CSV, Parquet atau Excel (Excel dibaca sekaligus)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        frames = (b.to_pandas() for b in pq.ParquetFile(path).iter_batches(batch_size=chunksize,
+                                                                             columns=[text_col, label_col]))
+    elif ext in (".xlsx", ".xls"):
+        frames = [pd.read_excel(path, usecols=[text_col, label_col])]
+    else:
+        frames = pd.read_csv(path, usecols=[text_col, label_col], chunksize=chunksize)
+    for df in frames:
+        df = df.dropna(subset=[text_col, label_col])
+        df = df[df[label_col].isin(CLASSES)]
+        if len(df):
+            yield df[text_col].astype(str).tolist(), df[label_col].astype(int).to_numpy()
+
+
+def _is_validation(texts):
+    return np.fromiter((zlib.crc32(t.encode("utf-8", "replace")) % VALIDATION_MOD == 0 for t in texts),
+                       dtype=bool, count=len(texts))
+
+
+def _split(texts, labels, part):
+    if part is None:
+        return texts, labels
+    mask = _is_validation(texts)
+    if part == "train":
+        mask = ~mask
+    return [t for t, m in zip(texts, mask) if m], labels[mask]
+
+
+class DocFreqMask(BaseEstimator, TransformerMixin):
+    """
+    Pengganti min_df untuk fitur hash: kolom yang muncul di kurang dari
+    `min_df` dokumen (dihitung streaming lewat partial_fit) dinolkan, lalu
+    baris dinormalisasi ulang.
+    """
+
+    def __init__(self, min_df=1, n_features=N_FEATURES):
+        self.min_df = min_df
+        self.n_features = n_features
+
+    def partial_fit(self, X, y=None):
+        if not hasattr(self, "doc_freq_"):
+            self.doc_freq_ = np.zeros(self.n_features, dtype=np.int64)
+        # HashingVectorizer menghasilkan CSR dengan indeks unik per baris
+        self.doc_freq_ += np.bincount(X.indices, minlength=self.n_features)
+        return self
+
+    def fit(self, X, y=None):
+        if hasattr(self, "doc_freq_"):
+            del self.doc_freq_
+        return self.partial_fit(X, y)
+
+    def transform(self, X):
+        if self.min_df <= 1 or not hasattr(self, "doc_freq_"):
+            return X
+        X = X.copy()
+        X.data *= (self.doc_freq_ >= self.min_df)[X.indices]
+        X.eliminate_zeros()
+        return normalize(X)
+
+
+def make_pipeline(ngram_range=(1, 2), min_df=1, C=1.0, n_samples=100000, n_features=N_FEATURES):
+    """HashingVectorizer -> DocFreqMask -> SGDClassifier (hinge = SVM linear; alpha = 1 / (C * n))."""
+    return Pipeline([
+        ("hash", HashingVectorizer(ngram_range=tuple(ngram_range), n_features=n_features, alternate_sign=False)),
+        ("mask", DocFreqMask(min_df=min_df, n_features=n_features)),
+        ("clf", SGDClassifier(loss="hinge", alpha=1.0 / (C * max(n_samples, 1)), random_state=42)),
+    ])
+
+
+def _count_rows(path, text_col, label_col, part=None):
+    return sum(len(_split(t, y, part)[1]) for t, y in iter_chunks(path, text_col, label_col))
+
+
+def fit_streaming(pipeline, path, text_col="isi", label_col="label", part=None, epochs=N_EPOCHS):
+    """Latih `pipeline` (dari make_pipeline) per chunk tanpa memuat seluruh file."""
+    hasher, mask, clf = (step for _, step in pipeline.steps)
+    if mask.min_df > 1:
+        for texts, labels in iter_chunks(path, text_col, label_col):
+            texts, _ = _split(texts, labels, part)
+            if texts:
+                mask.partial_fit(hasher.transform(texts))
+    for _ in range(epochs):
+        for texts, labels in iter_chunks(path, text_col, label_col):
+            texts, labels = _split(texts, labels, part)
+            if texts:
+                clf.partial_fit(mask.transform(hasher.transform(texts)), labels, classes=CLASSES)
+    return pipeline
+
+
+def evaluate(pipeline, path, text_col="isi", label_col="label", part="validation"):
+    """Precision/recall/F1 kelas 1 dihitung streaming."""
+    tp = fp = fn = n = 0
+    for texts, labels in iter_chunks(path, text_col, label_col):
+        texts, labels = _split(texts, labels, part)
+        if not texts:
+            continue
+        pred = pipeline.predict(texts)
+        tp += int(np.sum((pred == 1) & (labels == 1)))
+        fp += int(np.sum((pred == 1) & (labels != 1)))
+        fn += int(np.sum((pred != 1) & (labels == 1)))
+        n += len(labels)
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"n": n, "precision": precision, "recall": recall, "f1": f1}
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_mtime, st.st_size
+
+
+def _trial(signature, text_col, label_col, ngram_range, min_df, C, n_train):
+    # `signature` (path, mtime, size) menjadi bagian kunci cache: file berubah -> dihitung ulang
+    path = signature[0]
+    pipeline = make_pipeline(ngram_range, min_df, C, n_train)
+    fit_streaming(pipeline, path, text_col, label_col, part="train")
+    return evaluate(pipeline, path, text_col, label_col, part="validation")
+
+
+def search(path, text_col="isi", label_col="label", grid=None, n_jobs=-1, cache_dir=TRAIN_CACHE_DIR):
+    """
+    Coba semua kombinasi `grid` secara paralel (tiap job membaca file sendiri
+    per chunk, memori tetap kecil). Hasil tiap kombinasi di-cache di
+    `cache_dir` sehingga pencarian ulang hanya menghitung kombinasi baru.
+    Mengembalikan daftar hasil terurut F1 tertinggi.
+    """
+    grid = grid or SEARCH_GRID
+    trial = joblib.Memory(cache_dir, verbose=0).cache(_trial)
+    signature = _file_signature(path)
+    n_train = _count_rows(path, text_col, label_col, part="train")
+    combos = list(itertools.product(grid["ngram_range"], grid["min_df"], grid["C"]))
+    scores = joblib.Parallel(n_jobs=n_jobs)(
+        joblib.delayed(trial)(signature, text_col, label_col, tuple(ng), md, c, n_train) for ng, md, c in combos)
+    results = [dict(ngram_range=tuple(ng), min_df=md, C=c, **s) for (ng, md, c), s in zip(combos, scores)]
+    return sorted(results, key=lambda r: r["f1"], reverse=True)
+
+
+def train_and_save(path, out_path=DEFAULT_ONLINE_MODEL_PATH, text_col="isi", label_col="label", params=None):
+    """Cari hyperparameter (kalau `params` tidak diberikan), lalu latih ulang di seluruh data dan simpan."""
+    if params is None:
+        results = search(path, text_col, label_col)
+        for r in results[:5]:
+            print(f"  ngram={r['ngram_range']} min_df={r['min_df']} C={r['C']}: "
+                  f"P={r['precision']:.3f} R={r['recall']:.3f} F1={r['f1']:.3f}")
+        params = {k: results[0][k] for k in ("ngram_range", "min_df", "C")}
+    print(f"Parameter terpilih: {params}")
+    pipeline = make_pipeline(n_samples=_count_rows(path, text_col, label_col), **params)
+    fit_streaming(pipeline, path, text_col, label_col)
+    joblib.dump(pipeline, out_path)
+    print(f"Model saved to {out_path}")
+    return pipeline
+
+
+def update_model(model_path, path, text_col="isi", label_col="label", epochs=N_EPOCHS, out_path=None):
+    """
+    Latih lanjut model hasil train_and_save dengan data berlabel baru (misal
+    artikel hasil scraping yang labelnya sudah dikoreksi): doc_freq min_df
+    diperbarui dan SGD di-partial_fit, tanpa mengulang dari nol.
+    """
+    pipeline = joblib.load(model_path)
+    hasher, mask, clf = (step for _, step in pipeline.steps)
+    for texts, _ in iter_chunks(path, text_col, label_col):
+        mask.partial_fit(hasher.transform(texts))
+    for _ in range(epochs):
+        for texts, labels in iter_chunks(path, text_col, label_col):
+            clf.partial_fit(mask.transform(hasher.transform(texts)), labels, classes=CLASSES)
+    out_path = out_path or model_path
+    joblib.dump(pipeline, out_path)
+    print(f"Model diperbarui: {out_path}")
+    return pipeline
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == "search":
+        for r in search(args[1]):
+            print(r)
+    elif len(args) >= 2 and args[0] == "train":
+        train_and_save(args[1], *(args[2:3] or [DEFAULT_ONLINE_MODEL_PATH]))
+    elif len(args) >= 3 and args[0] == "update":
+        update_model(args[1], args[2])
+    else:
+        print("Usage: python train_online.py search data.csv | train data.csv [out.pkl] | update model.pkl baru.csv")
@@ -0,0 +1,104 @@
+# url_canon.py
+# Kanonikalisasi URL artikel yang dipakai bersama oleh parser, crawler, cache
+# dan crawl state: varian AMP, parameter tracking, ?page=, fragment dan alias
+# skema/host dipetakan ke satu URL supaya duplikat ketahuan sebelum di-fetch.
+# Cache halaman memakai page_key(), yang tetap membedakan ?page=N.
+import re
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# parameter query yang tidak mengubah isi artikel
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "source", "src", "from", "_ga", "_gl", "tag_from", "utm",
+    "amp", "amp_js_v", "usqp", "outputtype",
+}
+# artikel multi-halaman / tampilan satu halaman -> artikel yang sama untuk dedupe,
+# tetapi HTML-nya berbeda (halaman listing ?page=N), jadi tetap dibedakan page_key()
+CONTENT_PARAMS = {"page", "single", "showall"}
+TRACKING_PREFIXES = ("utm_", "_hs", "pk_", "mtm_")
+# subdomain yang hanya alias dari host utama
+HOST_ALIAS_PREFIXES = ("www.", "m.", "amp.", "mobile.")
+# alias host eksplisit (host -> host kanonik)
+HOST_ALIASES = {}
+
+_AMP_PATH_RE = re.compile(r"(^|/)amp(/|$)")
+_AMP_SUFFIX_RE = re.compile(r"\.amp$")
+
+
+def _canonical_host(netloc):
+    host = netloc.lower().rsplit("@", 1)[-1]
+    if host.endswith(":80") or host.endswith(":443"):
+        host = host.rsplit(":", 1)[0]
+    for prefix in HOST_ALIAS_PREFIXES:
+        if host.startswith(prefix) and host.count(".") >= 2:
+            host = host[len(prefix):]
+            break
+    return HOST_ALIASES.get(host, host)
+
+
+def _canonical_path(path):
+    path = _AMP_PATH_RE.sub(r"\1", path or "/")
+    path = _AMP_SUFFIX_RE.sub("", path)
+    path = re.sub(r"/{2,}", "/", path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return path or "/"
+
+
+def _keep_param(name, keep_content=False):
+    name = name.lower()
+    if name in CONTENT_PARAMS:
+        return keep_content
+    return name not in TRACKING_PARAMS and not name.startswith(TRACKING_PREFIXES)
+
+
+def _canonical(url, keep_content):
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme in ("http", "https", ""):
+        scheme = "https"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if _keep_param(k, keep_content))
+    return urlunsplit((scheme, _canonical_host(parts.netloc), _canonical_path(parts.path), urlencode(query), ""))
+
+
+def canonical_url(url):
+    """
+    URL kanonik untuk deduplikasi artikel: https, host tanpa www./m./amp., path
+    tanpa segmen /amp dan slash penutup, tanpa fragment, parameter tracking dan
+    ?page=/single/showall, sisa parameter query diurutkan.
+    """
+    return _canonical(url, keep_content=False)
+
+
+def page_key(url):
+    """
+    Seperti canonical_url() tetapi ?page=/single/showall dipertahankan: kunci
+    cache HTML (article_cache.py), karena halaman listing ke-N berbeda isinya.
+    """
+    return _canonical(url, keep_content=True)
+
+
+class SeenSet:
+    """Himpunan URL kanonik yang sudah dijadwalkan; aman dipakai dari banyak thread."""
+
+    def __init__(self, urls=()):
+        self._lock = threading.Lock()
+        self._seen = {canonical_url(u) for u in urls}
+
+    def add(self, url):
+        """True kalau URL belum pernah dilihat (dan sekarang dicatat), False kalau duplikat."""
+        key = canonical_url(url)
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+
+    def __contains__(self, url):
+        with self._lock:
+            return canonical_url(url) in self._seen
+
+    def __len__(self):
+        return len(self._seen)